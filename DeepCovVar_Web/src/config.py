@@ -14,6 +14,13 @@ class Config:
     
     # Job settings
     JOB_RETENTION_DAYS = 7  # Keep job files for 7 days
+    DATABASE_PATH = os.path.join(BASE_DIR, 'src', 'database', 'app.db')  # also holds the job queue
+    JOB_MAX_RUNNING = int(os.environ.get('JOB_MAX_RUNNING', 2))  # running jobs across all workers
+    JOB_MAX_ATTEMPTS = 3  # leases per job before a crashing job is marked failed
+    JOB_LEASE_SECONDS = 60  # a worker that misses heartbeats this long loses its job
+    # A job still running after this long is marked failed and its worker replaced
+    JOB_TIMEOUT_SECONDS = int(os.environ.get('JOB_TIMEOUT_SECONDS', 3600))
+    JOB_POLL_SECONDS = 1.0
     
     # Email settings (configure these if email notifications are needed)
     MAIL_SERVER = 'smtp.gmail.com'
@@ -26,7 +33,20 @@ class Config:
     # DeepCovVar settings
     DEEPCOVVAR_MODELS_PATH = os.environ.get('DEEPCOVVAR_MODELS_PATH', '')
     DEEPCOVVAR_BATCH_SIZE = 32
-    
+    # Persistent prediction cache shared by all jobs (empty string disables it)
+    DEEPCOVVAR_CACHE_PATH = os.environ.get('DEEPCOVVAR_CACHE_PATH', os.path.join(BASE_DIR, 'cache', 'predictions.sqlite'))
+    # Directory added to sys.path in worker processes when deepcovvar is not installed
+    # (default: the repository checkout this web app lives in)
+    DEEPCOVVAR_PATH = os.environ.get('DEEPCOVVAR_PATH', os.path.dirname(BASE_DIR))
+
+    # Warm worker pool: each worker process keeps a COVIDClassifier with all models loaded
+    DEEPCOVVAR_WORKERS = int(os.environ.get('DEEPCOVVAR_WORKERS', 2))
+    DEEPCOVVAR_WORKER_THREADS = int(os.environ.get('DEEPCOVVAR_WORKER_THREADS', 2))  # TF/torch threads per worker
+    # Start the pool inside the web process; set to 0 under multi-process servers and
+    # run `python -m src.utils.worker_pool` once instead
+    DEEPCOVVAR_START_WORKERS = os.environ.get('DEEPCOVVAR_START_WORKERS', '1') == '1'
+
     # Ensure directories exist
     os.makedirs(UPLOAD_FOLDER, exist_ok=True)
     os.makedirs(JOBS_FOLDER, exist_ok=True)
+    os.makedirs(os.path.dirname(DATABASE_PATH), exist_ok=True)
@@ -1,5 +1,6 @@
 import os
 import sys
+import multiprocessing
 # DON'T CHANGE THIS !!!
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
@@ -9,6 +10,7 @@ from src.models.user import db
 from src.routes.user import user_bp
 from src.routes.prediction import prediction_bp
 from src.config import Config
+from src.utils.worker_pool import get_worker_pool
 
 app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-key-change-in-production')
@@ -21,13 +23,16 @@ app.register_blueprint(user_bp, url_prefix='/api')
 app.register_blueprint(prediction_bp, url_prefix='/api')
 
 # uncomment if you need to use database
-db_path = os.path.abspath(os.path.join(os.path.dirname(__file__), 'database', 'app.db'))
-app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{db_path}"
+app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{Config.DATABASE_PATH}"
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 db.init_app(app)
 with app.app_context():
     db.create_all()
 
+# Start warm workers once per server (not again in the spawned workers themselves)
+if Config.DEEPCOVVAR_START_WORKERS and multiprocessing.parent_process() is None:
+    get_worker_pool()
+
 @app.route('/', defaults={'path': ''})
 @app.route('/<path:path>')
 def serve(path):
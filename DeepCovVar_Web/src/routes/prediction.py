@@ -6,6 +6,7 @@ from flask import Blueprint, request, jsonify, send_file
 from werkzeug.utils import secure_filename
 from src.config import Config
 from src.utils.deepcovvar_wrapper import run_deepcovvar_job
+from src.utils.job_queue import get_job_queue
 from src.utils.sequence_fetcher import fetch_sequence, validate_fasta
 from src.utils.result_processor import (
     consolidate_results, 
@@ -124,15 +125,11 @@ def submit_prediction():
 @prediction_bp.route('/status/<job_id>', methods=['GET'])
 def get_job_status(job_id):
     try:
-        job_dir = os.path.join(Config.JOBS_FOLDER, job_id)
-        status_file = os.path.join(job_dir, 'status.json')
+        status = get_job_queue().get(job_id)
         
-        if not os.path.exists(status_file):
+        if status is None:
             return jsonify({'error': 'Job not found'}), 404
         
-        with open(status_file, 'r') as f:
-            status = json.load(f)
-        
         return jsonify(status), 200
         
     except Exception as e:
@@ -148,11 +145,9 @@ def get_job_results(job_id):
             return jsonify({'error': 'Job not found'}), 404
         
         # Check if job is completed
-        status_file = os.path.join(job_dir, 'status.json')
-        with open(status_file, 'r') as f:
-            status = json.load(f)
+        status = get_job_queue().get(job_id)
         
-        if status['status'] != 'completed':
+        if status is None or status['status'] != 'completed':
             return jsonify({'error': 'Job not completed yet'}), 400
         
         # Consolidate results
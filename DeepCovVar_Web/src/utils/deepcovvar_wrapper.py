@@ -1,121 +1,101 @@
 import os
-import sys
 import json
-import subprocess
-import threading
 from datetime import datetime
 from src.config import Config
+from src.utils.job_queue import get_job_queue
+from src.utils.worker_pool import get_worker_pool
 
 
 class DeepCovVarWrapper:
 
     
-    def __init__(self, job_id, input_file, phases, options, output_dir):
+    def __init__(self, job_id, input_file, phases, options, output_dir, queue=None, lease_owner=None):
 
         self.job_id = job_id
         self.input_file = input_file
         self.phases = phases
         self.options = options
         self.output_dir = output_dir
-        self.status_file = os.path.join(output_dir, 'status.json')
+        # Job queue row this run reports to, held under the worker's lease
+        self.queue = queue or get_job_queue()
+        self.lease_owner = lease_owner
         
     def update_status(self, status, progress=0, message='', error=None):
-        status_data = {
-            'job_id': self.job_id,
-            'status': status,
-            'progress': progress,
-            'message': message,
-            'timestamp': datetime.now().isoformat(),
-            'error': error
-        }
-        with open(self.status_file, 'w') as f:
-            json.dump(status_data, f, indent=2)
+        if status == 'completed':
+            self.queue.complete(self.job_id, self.lease_owner, message)
+        elif status == 'failed':
+            self.queue.fail(self.job_id, self.lease_owner, message, error)
+        else:
+            self.queue.update_progress(self.job_id, self.lease_owner, progress, message)
     
-    def run_prediction(self):
-        thread = threading.Thread(target=self._execute_prediction)
-        thread.daemon = True
-        thread.start()
+    def _phase_thresholds(self, classifier, phase):
+        # Custom [CLASS1_PERCENT, CLASS2_PERCENT] when given, 50/50 otherwise
+        from deepcovvar.server import thresholds_for_phase
         
-    def _execute_prediction(self):
+        thresholds = (self.options.get('thresholds') or {}).get(phase) or [50, 50]
+        return thresholds_for_phase(classifier.models_config[phase], thresholds)
+        
+    def _execute_prediction(self, classifier):
+        # Runs inside a worker process that already holds a loaded COVIDClassifier
         try:
             self.update_status('running', 10, 'Starting prediction...')
             
-            # Build command with proper PYTHONPATH and non-interactive mode
-            deepcovvar_path = '/home/ai-lab2/DeepCovVar'
-            cmd = [
-                'env', 
-                f'PYTHONPATH={deepcovvar_path}',
-                sys.executable, '-m', 'deepcovvar', 
-                '-f', self.input_file, 
-                '-o', self.output_dir
-            ]
-            
-            # Add verbose flag if requested
-            if self.options.get('verbose', False):
-                cmd.append('--verbose')
-            
             # Determine which phases to run
             if self.phases == 'all' or len(self.phases) == 5:
-                # Run all phases in one command
-                cmd.append('--all-phases')
-                # Add default thresholds for all phases
-                cmd.extend(['--thresholds', '50', '50'])
+                # Run all phases in one pass, sharing features across phases
+                thresholds = {
+                    phase: self._phase_thresholds(classifier, phase)
+                    for phase, config in classifier.models_config.items()
+                    if len(config['classes']) == 2
+                }
                 
-                self.update_status('running', 30, f'Running DeepCovVar with all phases: {" ".join(cmd)}')
+                self.update_status('running', 30, 'Running DeepCovVar with all phases...')
                 
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    timeout=3600  # 1 hour timeout
+                classifier.run_all_phases(
+                    self.input_file,
+                    output_dir=self.output_dir,
+                    base_filename=os.path.splitext(os.path.basename(self.input_file))[0],
+                    thresholds=thresholds
                 )
-                
-                if result.returncode == 0:
-                    self.update_status('running', 80, 'Processing results...')
-                    self._process_results()
-                    self.update_status('completed', 100, 'Prediction completed successfully')
-                else:
-                    error_msg = result.stderr if result.stderr else 'Unknown error occurred'
-                    self.update_status('failed', 0, 'Prediction failed', error_msg)
             else:
-                # Run each selected phase individually
+                from Bio import SeqIO
+                import pandas as pd
+                from deepcovvar.utils.deepcovvar_utils import phase_result_rows, format_percentages
+                
+                # Read and convert the input once for all selected phases
+                records = [(record.id, str(record.seq)) for record in SeqIO.parse(self.input_file, 'fasta')]
+                _, sequences, seq_ids = classifier._prepare_chunk(records, auto_convert=True)
+                feature_cache = {}
+                
                 phases_to_run = sorted(self.phases)
                 total_phases = len(phases_to_run)
                 
                 for i, phase in enumerate(phases_to_run):
-                    phase_cmd = cmd + ['-p', str(phase)]
-                    
-                    # Add thresholds for this specific phase
-                    if self.options.get('thresholds') and phase in self.options['thresholds']:
-                        custom_thresholds = self.options['thresholds'][phase]
-                        phase_cmd.extend(['--thresholds', str(custom_thresholds[0]), str(custom_thresholds[1])])
-                    else:
-                        # Use default thresholds
-                        phase_cmd.extend(['--thresholds', '50', '50'])
-                    
                     progress = 30 + (i * 50 // total_phases)
                     
                     self.update_status('running', progress, f'Running DeepCovVar phase {phase}...')
                     
-                    result = subprocess.run(
-                        phase_cmd,
-                        capture_output=True,
-                        text=True,
-                        timeout=1800  # 30 minutes per phase
-                    )
-                    
-                    if result.returncode != 0:
-                        error_msg = result.stderr if result.stderr else f'Phase {phase} failed'
-                        self.update_status('failed', 0, f'Phase {phase} failed', error_msg)
+                    try:
+                        prediction_result = classifier.predict(
+                            phase, None,
+                            custom_thresholds=self._phase_thresholds(classifier, phase),
+                            sequences=sequences, seq_ids=seq_ids,
+                            feature_cache=feature_cache, prompt_thresholds=False
+                        )
+                    except Exception as e:
+                        self.update_status('failed', 0, f'Phase {phase} failed', str(e))
                         return
+                    
+                    rows = phase_result_rows(records, prediction_result, phase)
+                    format_percentages(pd.DataFrame(rows)).to_csv(
+                        os.path.join(self.output_dir, f'phase_{phase}_results.csv'), index=False
+                    )
+            
+            # All phases completed successfully
+            self.update_status('running', 80, 'Processing results...')
+            self._process_results()
+            self.update_status('completed', 100, 'Prediction completed successfully')
                 
-                # All phases completed successfully
-                self.update_status('running', 80, 'Processing results...')
-                self._process_results()
-                self.update_status('completed', 100, 'Prediction completed successfully')
-                
-        except subprocess.TimeoutExpired:
-            self.update_status('failed', 0, 'Prediction timed out', 'Job exceeded maximum execution time')
         except Exception as e:
             self.update_status('failed', 0, 'Prediction failed', str(e))
     
@@ -158,9 +138,9 @@ def run_deepcovvar_job(job_id, input_file, phases, options):
     job_dir = os.path.join(Config.JOBS_FOLDER, job_id)
     os.makedirs(job_dir, exist_ok=True)
     
-    # Initialize wrapper and run prediction
-    wrapper = DeepCovVarWrapper(job_id, input_file, phases, options, job_dir)
-    wrapper.update_status('pending', 0, 'Job queued')
-    wrapper.run_prediction()
+    # Persist the job; a warm worker leases it from the queue
+    get_job_queue().enqueue(job_id, input_file, phases, options, job_dir)
+    if Config.DEEPCOVVAR_START_WORKERS:
+        get_worker_pool()
     
     return job_dir
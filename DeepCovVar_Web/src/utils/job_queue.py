@@ -0,0 +1,213 @@
+import os
+import json
+import socket
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from src.config import Config
+
+
+# Job states; 'pending' and 'running' are the only non-terminal ones
+PENDING = 'pending'
+RUNNING = 'running'
+COMPLETED = 'completed'
+FAILED = 'failed'
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def worker_id():
+    return f'{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}'
+
+
+def _iso(ts):
+    return datetime.fromtimestamp(ts).isoformat() if ts else None
+
+
+class JobQueue:
+    """Durable job queue stored in the web app's SQLite database (WAL mode).
+
+    A worker leases a pending job for lease_seconds and keeps it alive with
+    heartbeat(); a job whose lease expires (worker crash, restart) is put back
+    to pending until it has used max_attempts leases.
+    """
+
+    def __init__(self, path=None, lease_seconds=None, max_attempts=None, max_running=None):
+
+        self.path = path or Config.DATABASE_PATH
+        self.lease_seconds = lease_seconds or Config.JOB_LEASE_SECONDS
+        self.max_attempts = max_attempts or Config.JOB_MAX_ATTEMPTS
+        self.max_running = max_running or Config.JOB_MAX_RUNNING
+
+        self._lock = threading.Lock()
+        # Autocommit mode so transactions are explicit (BEGIN IMMEDIATE in lease)
+        self.conn = sqlite3.connect(self.path, timeout=30, isolation_level=None,
+                                    check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                input_file TEXT NOT NULL,
+                phases TEXT NOT NULL,
+                options TEXT NOT NULL,
+                output_dir TEXT NOT NULL,
+                progress INTEGER NOT NULL DEFAULT 0,
+                message TEXT,
+                error TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL,
+                lease_owner TEXT,
+                lease_expires REAL
+            );
+            CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created_at);
+        ''')
+
+    def enqueue(self, job_id, input_file, phases, options, output_dir):
+        now = time.time()
+        with self._lock:
+            self.conn.execute(
+                'INSERT INTO jobs (job_id, status, input_file, phases, options, output_dir, '
+                'message, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (job_id, PENDING, input_file, json.dumps(phases), json.dumps(options),
+                 output_dir, 'Job queued', now, now)
+            )
+
+    def _requeue_expired(self, now):
+        # Leases past their expiry belong to workers that died; retry or give up
+        self.conn.execute(
+            'UPDATE jobs SET status = ?, error = ?, message = ?, finished_at = ?, '
+            'lease_owner = NULL, lease_expires = NULL, updated_at = ? '
+            'WHERE status = ? AND lease_expires < ? AND attempts >= ?',
+            (FAILED, 'Worker stopped responding', 'Prediction failed', now, now,
+             RUNNING, now, self.max_attempts)
+        )
+        return self.conn.execute(
+            'UPDATE jobs SET status = ?, progress = 0, message = ?, '
+            'lease_owner = NULL, lease_expires = NULL, updated_at = ? '
+            'WHERE status = ? AND lease_expires < ?',
+            (PENDING, 'Job requeued after worker failure', now, RUNNING, now)
+        ).rowcount
+
+    def recover(self):
+        """Requeue jobs whose worker lease has expired; call on startup."""
+        now = time.time()
+        with self._lock:
+            self.conn.execute('BEGIN IMMEDIATE')
+            try:
+                requeued = self._requeue_expired(now)
+                self.conn.execute('COMMIT')
+            except Exception:
+                self.conn.execute('ROLLBACK')
+                raise
+        return requeued
+
+    def lease(self, owner):
+        """Claim the oldest pending job, or return None when none is runnable."""
+        now = time.time()
+        with self._lock:
+            # BEGIN IMMEDIATE takes the write lock, so the running-count check and
+            # the claim are atomic across processes
+            self.conn.execute('BEGIN IMMEDIATE')
+            try:
+                self._requeue_expired(now)
+                running = self.conn.execute(
+                    'SELECT COUNT(*) FROM jobs WHERE status = ?', (RUNNING,)
+                ).fetchone()[0]
+                row = None
+                if running < self.max_running:
+                    row = self.conn.execute(
+                        'SELECT * FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1', (PENDING,)
+                    ).fetchone()
+                if row is not None:
+                    self.conn.execute(
+                        'UPDATE jobs SET status = ?, attempts = attempts + 1, lease_owner = ?, '
+                        'lease_expires = ?, started_at = ?, message = ?, error = NULL, '
+                        'updated_at = ? WHERE job_id = ?',
+                        (RUNNING, owner, now + self.lease_seconds, now, 'Job started', now,
+                         row['job_id'])
+                    )
+                self.conn.execute('COMMIT')
+            except Exception:
+                self.conn.execute('ROLLBACK')
+                raise
+        if row is None:
+            return None
+        job = dict(row)
+        job['phases'] = json.loads(job['phases'])
+        job['options'] = json.loads(job['options'])
+        # JSON turns the integer phase keys of per-phase thresholds into strings
+        job['options']['thresholds'] = {
+            int(phase): values for phase, values in job['options'].get('thresholds', {}).items()
+        }
+        return job
+
+    def _update_leased(self, job_id, owner, assignments, params):
+        now = time.time()
+        with self._lock:
+            cursor = self.conn.execute(
+                f'UPDATE jobs SET {assignments}, updated_at = ? '
+                'WHERE job_id = ? AND lease_owner = ? AND status = ?',
+                tuple(params) + (now, job_id, owner, RUNNING)
+            )
+        # False means the lease was lost (expired and handed to another worker)
+        return cursor.rowcount == 1
+
+    def heartbeat(self, job_id, owner):
+        return self._update_leased(job_id, owner, 'lease_expires = ?',
+                                   [time.time() + self.lease_seconds])
+
+    def update_progress(self, job_id, owner, progress, message=''):
+        return self._update_leased(job_id, owner, 'progress = ?, message = ?', [progress, message])
+
+    def complete(self, job_id, owner, message=''):
+        return self._update_leased(
+            job_id, owner,
+            'status = ?, progress = 100, message = ?, finished_at = ?, lease_owner = NULL, lease_expires = NULL',
+            [COMPLETED, message, time.time()]
+        )
+
+    def fail(self, job_id, owner, message, error=None):
+        return self._update_leased(
+            job_id, owner,
+            'status = ?, progress = 0, message = ?, error = ?, finished_at = ?, '
+            'lease_owner = NULL, lease_expires = NULL',
+            [FAILED, message, error, time.time()]
+        )
+
+    def get(self, job_id):
+        with self._lock:
+            row = self.conn.execute('SELECT * FROM jobs WHERE job_id = ?', (job_id,)).fetchone()
+        if row is None:
+            return None
+        return {
+            'job_id': row['job_id'],
+            'status': row['status'],
+            'progress': row['progress'],
+            'message': row['message'],
+            'timestamp': _iso(row['updated_at']),
+            'error': row['error'],
+            'attempts': row['attempts'],
+            'created_at': _iso(row['created_at']),
+            'started_at': _iso(row['started_at']),
+            'finished_at': _iso(row['finished_at'])
+        }
+
+    def close(self):
+        self.conn.close()
+
+
+def get_job_queue():
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = JobQueue()
+        return _queue
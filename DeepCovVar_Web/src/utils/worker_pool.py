@@ -0,0 +1,189 @@
+import os
+import sys
+import time
+import atexit
+import threading
+import multiprocessing
+from src.config import Config
+from src.utils.job_queue import JobQueue, worker_id
+
+
+# Classifier owned by the current worker process (set by _init_worker)
+_classifier = None
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _init_worker(deepcovvar_path, models_path, cache_path, batch_size, threads):
+    global _classifier
+
+    # Thread pools are sized when TF/torch are first imported, so set them before importing
+    for var in ('OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'TF_NUM_INTRAOP_THREADS'):
+        os.environ[var] = str(threads)
+    os.environ['TF_NUM_INTEROP_THREADS'] = '1'
+
+    if deepcovvar_path and deepcovvar_path not in sys.path:
+        sys.path.insert(0, deepcovvar_path)
+
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass  # torch is only needed by phase 5; the preload below reports it missing
+
+    from deepcovvar.covid_classifier import COVIDClassifier
+    _classifier = COVIDClassifier(
+        model_dir=models_path or None,
+        batch_size=batch_size,
+        cache_path=cache_path or None
+    )
+
+    # Load every model up front; a phase that fails here is retried when a job needs it
+    for phase in _classifier.models_config:
+        try:
+            _classifier.load_model(phase)
+        except Exception as e:
+            print(f"Worker {os.getpid()}: could not preload phase {phase}: {e}")
+
+
+def _terminate_worker():
+    # The prediction cannot be interrupted in-process; exit and let the pool start a new worker
+    os._exit(1)
+
+
+def _run_leased_job(queue, job, owner, timeout=None, on_timeout=_terminate_worker):
+    from src.utils.deepcovvar_wrapper import DeepCovVarWrapper
+
+    wrapper = DeepCovVarWrapper(job['job_id'], job['input_file'], job['phases'], job['options'],
+                                job['output_dir'], queue=queue, lease_owner=owner)
+
+    # Keep the lease alive while the job runs; a dead worker stops renewing it
+    stop = threading.Event()
+    deadline = time.time() + (timeout or Config.JOB_TIMEOUT_SECONDS)
+
+    def renew_lease():
+        while not stop.wait(max(0, min(queue.lease_seconds / 3, deadline - time.time()))):
+            if time.time() >= deadline:
+                # Past the deadline: stop renewing and fail the job, unless it just finished
+                if queue.fail(job['job_id'], owner, 'Prediction timed out',
+                              'Job exceeded maximum execution time'):
+                    on_timeout()
+                return
+            queue.heartbeat(job['job_id'], owner)
+
+    heartbeat = threading.Thread(target=renew_lease, daemon=True)
+    heartbeat.start()
+    try:
+        wrapper._execute_prediction(_classifier)
+    finally:
+        stop.set()
+        heartbeat.join()
+
+
+def _worker_main(deepcovvar_path, models_path, cache_path, batch_size, threads):
+    _init_worker(deepcovvar_path, models_path, cache_path, batch_size, threads)
+
+    queue = JobQueue()
+    owner = worker_id()
+    while True:
+        job = queue.lease(owner)
+        if job is None:
+            time.sleep(Config.JOB_POLL_SECONDS)
+            continue
+        _run_leased_job(queue, job, owner)
+
+
+class WorkerPool:
+
+    def __init__(self, workers=None, threads=None):
+
+        self.workers = workers or Config.DEEPCOVVAR_WORKERS
+        self.threads = threads or Config.DEEPCOVVAR_WORKER_THREADS
+        # Spawn rather than fork: TF and torch do not survive fork with their thread pools running
+        self.context = multiprocessing.get_context('spawn')
+        self.processes = []
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._supervisor = None
+
+    def _start_process(self):
+        process = self.context.Process(
+            target=_worker_main,
+            args=(
+                Config.DEEPCOVVAR_PATH,
+                Config.DEEPCOVVAR_MODELS_PATH,
+                Config.DEEPCOVVAR_CACHE_PATH,
+                Config.DEEPCOVVAR_BATCH_SIZE,
+                self.threads
+            ),
+            name='deepcovvar-worker'
+        )
+        process.start()
+        return process
+
+    def ensure_running(self):
+        # Replace workers that died (e.g. out of memory or past a job deadline); their jobs
+        # come back when the lease expires
+        with self._lock:
+            if self._stopping.is_set():
+                return
+            self.processes = [p for p in self.processes if p.is_alive()]
+            while len(self.processes) < self.workers:
+                self.processes.append(self._start_process())
+
+    def _supervise(self, interval):
+        while not self._stopping.wait(interval):
+            self.ensure_running()
+
+    def start_supervisor(self, interval=None):
+        # Workers exit on their own after a job deadline, so replace them without
+        # waiting for the next request to call get_worker_pool()
+        if self._supervisor is None:
+            self._supervisor = threading.Thread(
+                target=self._supervise, args=(interval or Config.JOB_LEASE_SECONDS,),
+                name='deepcovvar-worker-supervisor', daemon=True
+            )
+            self._supervisor.start()
+
+    def shutdown(self):
+        self._stopping.set()
+        if self._supervisor is not None:
+            self._supervisor.join()
+        with self._lock:
+            for process in self.processes:
+                process.terminate()
+            for process in self.processes:
+                process.join()
+            self.processes = []
+
+
+def get_worker_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            JobQueue().recover()
+            _pool = WorkerPool()
+            _pool.ensure_running()
+            _pool.start_supervisor()
+            # Registered after the first start so it runs before multiprocessing's own
+            # exit hook, which would otherwise wait forever on the (non-daemon) workers
+            atexit.register(_pool.shutdown)
+        _pool.ensure_running()
+        return _pool
+
+
+def main():
+    # Standalone workers for multi-process web servers (set DEEPCOVVAR_START_WORKERS=0 there)
+    pool = get_worker_pool()
+    print(f"Started {pool.workers} DeepCovVar workers")
+    try:
+        # The pool's supervisor thread replaces workers that exit
+        while True:
+            time.sleep(Config.JOB_LEASE_SECONDS)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Tests for the durable SQLite job queue and the worker-side job deadline.
+
+Every test runs against a queue in a temporary database; the deadline test
+runs a job through the worker loop with a stub classifier that never finishes
+on its own.
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Add the web app and the repository root to the path
+WEB_ROOT = Path(__file__).parent.parent.absolute()
+sys.path.insert(0, str(WEB_ROOT.parent))
+sys.path.insert(0, str(WEB_ROOT))
+
+from src.utils.job_queue import JobQueue, PENDING, RUNNING, FAILED
+from src.utils.worker_pool import WorkerPool, _run_leased_job
+
+
+def make_queue(tmp, **kwargs):
+    return JobQueue(path=os.path.join(tmp, 'jobs.db'), **kwargs)
+
+
+def enqueue(queue, job_id, tmp):
+    queue.enqueue(job_id, os.path.join(tmp, f'{job_id}.fasta'), 'all', {}, tmp)
+    time.sleep(0.01)  # distinct created_at, so leases follow submission order
+
+
+def expire_leases(queue):
+    queue.conn.execute('UPDATE jobs SET lease_expires = ? WHERE status = ?',
+                       (time.time() - 1, RUNNING))
+
+
+def test_max_running_blocks_lease():
+    """No job is leased while max_running jobs are running."""
+    with tempfile.TemporaryDirectory() as tmp:
+        queue = make_queue(tmp, max_running=1)
+        enqueue(queue, 'job1', tmp)
+        enqueue(queue, 'job2', tmp)
+
+        job = queue.lease('worker-a')
+        assert job['job_id'] == 'job1' and job['options'] == {'thresholds': {}}
+        assert queue.lease('worker-b') is None
+        assert queue.get('job2')['status'] == PENDING
+
+        assert queue.complete('job1', 'worker-a')
+        assert queue.lease('worker-b')['job_id'] == 'job2'
+        queue.close()
+    return True
+
+
+def test_expired_lease_is_requeued():
+    """A job whose lease expired goes back to pending and is leased again."""
+    with tempfile.TemporaryDirectory() as tmp:
+        queue = make_queue(tmp)
+        enqueue(queue, 'job1', tmp)
+        queue.lease('worker-a')
+
+        expire_leases(queue)
+        assert queue.recover() == 1
+        status = queue.get('job1')
+        assert status['status'] == PENDING and status['attempts'] == 1
+
+        job = queue.lease('worker-b')
+        assert job['job_id'] == 'job1' and queue.get('job1')['attempts'] == 2
+        queue.close()
+    return True
+
+
+def test_stale_owner_update_fails():
+    """A worker that lost its lease can no longer update or finish the job."""
+    with tempfile.TemporaryDirectory() as tmp:
+        queue = make_queue(tmp)
+        enqueue(queue, 'job1', tmp)
+        queue.lease('worker-a')
+        expire_leases(queue)
+        queue.lease('worker-b')
+
+        assert not queue.update_progress('job1', 'worker-a', 50, 'stale')
+        assert not queue.heartbeat('job1', 'worker-a')
+        assert not queue.complete('job1', 'worker-a')
+        assert queue.update_progress('job1', 'worker-b', 50, 'current')
+        assert queue.get('job1')['message'] == 'current'
+        queue.close()
+    return True
+
+
+def test_failed_after_max_attempts():
+    """A job whose lease keeps expiring is marked failed after max_attempts leases."""
+    with tempfile.TemporaryDirectory() as tmp:
+        queue = make_queue(tmp, max_attempts=2)
+        enqueue(queue, 'job1', tmp)
+
+        for attempt in range(2):
+            assert queue.lease(f'worker-{attempt}')['job_id'] == 'job1'
+            expire_leases(queue)
+        assert queue.lease('worker-2') is None
+
+        status = queue.get('job1')
+        assert status['status'] == FAILED and status['attempts'] == 2
+        assert status['error'] == 'Worker stopped responding'
+        queue.close()
+    return True
+
+
+class BlockingClassifier:
+    """Stands in for COVIDClassifier; run_all_phases blocks until released."""
+
+    models_config = {phase: {'classes': ['A', 'B', 'C']} for phase in range(1, 6)}
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def run_all_phases(self, *args, **kwargs):
+        self.release.wait(10)
+
+
+def test_job_deadline():
+    """A job past its deadline stops renewing its lease and is marked failed."""
+    import src.utils.worker_pool as worker_pool
+
+    with tempfile.TemporaryDirectory() as tmp:
+        queue = make_queue(tmp, lease_seconds=1)
+        enqueue(queue, 'job1', tmp)
+        job = queue.lease('worker-a')
+
+        classifier = BlockingClassifier()
+        timed_out = []
+
+        def on_timeout():
+            timed_out.append(time.time())
+            classifier.release.set()
+
+        worker_pool._classifier = classifier
+        try:
+            _run_leased_job(queue, job, 'worker-a', timeout=0.5, on_timeout=on_timeout)
+        finally:
+            worker_pool._classifier = None
+
+        status = queue.get('job1')
+        assert len(timed_out) == 1
+        assert status['status'] == FAILED and status['message'] == 'Prediction timed out'
+        assert not queue.heartbeat('job1', 'worker-a')
+        queue.close()
+    return True
+
+
+class FakeProcess:
+    """Stands in for a worker process; exit() simulates the os._exit after a deadline."""
+
+    def __init__(self):
+        self.alive = True
+
+    def is_alive(self):
+        return self.alive
+
+    def exit(self):
+        self.alive = False
+
+    terminate = exit
+
+    def join(self):
+        pass
+
+
+def test_supervisor_replaces_exited_workers():
+    """The supervisor thread restarts workers that exit, without another get_worker_pool() call."""
+    pool = WorkerPool(workers=2, threads=1)
+    pool._start_process = FakeProcess
+    pool.ensure_running()
+    pool.start_supervisor(interval=0.05)
+    try:
+        for process in list(pool.processes):
+            process.exit()
+        deadline = time.time() + 5
+        while time.time() < deadline and not all(p.is_alive() for p in pool.processes):
+            time.sleep(0.01)
+        assert len(pool.processes) == 2 and all(p.is_alive() for p in pool.processes)
+    finally:
+        pool.shutdown()
+    assert pool.processes == [] and not pool._supervisor.is_alive()
+    pool.ensure_running()
+    assert pool.processes == []
+    return True
+
+
+def main():
+    """Main test function."""
+    print("Job Queue Tests")
+    print("=" * 50)
+
+    tests = [
+        ("Max running blocks lease", test_max_running_blocks_lease),
+        ("Expired lease is requeued", test_expired_lease_is_requeued),
+        ("Stale owner update fails", test_stale_owner_update_fails),
+        ("Failed after max attempts", test_failed_after_max_attempts),
+        ("Job deadline", test_job_deadline),
+        ("Supervisor replaces exited workers", test_supervisor_replaces_exited_workers),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+            print(f"{test_name}: PASSED")
+        except AssertionError as e:
+            print(f"{test_name}: FAILED {e}")
+
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -25,9 +25,6 @@ License: MIT
 Version: 1.0.0
 """
 
-from .covid_classifier import COVIDClassifier
-from .utils import FEATURE
-
 __version__ = "1.0.0"
 __author__ = "DeepCovVar Team"
 
@@ -35,3 +32,14 @@ __all__ = [
     'COVIDClassifier',
     'FEATURE'
 ]
+
+
+def __getattr__(name):
+    # Resolved on first access so `import deepcovvar` and the CLI start quickly
+    if name == 'COVIDClassifier':
+        from .covid_classifier import COVIDClassifier
+        return COVIDClassifier
+    if name == 'FEATURE':
+        from .utils import FEATURE
+        return FEATURE
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
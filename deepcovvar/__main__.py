@@ -70,39 +70,25 @@ logging.getLogger('tensorflow_hub').setLevel(logging.ERROR)
 logging.getLogger('h5py').setLevel(logging.ERROR)
 logging.getLogger('numexpr').setLevel(logging.ERROR)
 
-# Third-party imports
+# Third-party imports (TensorFlow is imported by configure_tensorflow, only when needed)
 import pandas as pd
-import tensorflow as tf
-
-# Configure TensorFlow to use CPU only - must be done before any TF operations
-tf.config.set_visible_devices([], 'GPU')  # Hide all GPUs
-tf.config.threading.set_inter_op_parallelism_threads(1)  # Limit to single thread
-tf.config.threading.set_intra_op_parallelism_threads(1)  # Limit to single thread
-
-# Additional TensorFlow warning suppression
-tf.compat.v1.logging.set_verbosity(tf.compat.v1.logging.ERROR)
-tf.get_logger().setLevel('ERROR')
-tf.autograph.set_verbosity(0)
-tf.get_logger().addHandler(logging.NullHandler())
 
 # Configure Numpy
 import numpy as np
 np.seterr(all='ignore')  # Suppress numpy warnings
 
-# Disable TensorFlow debugging and performance logs
-import tensorflow.python.util.deprecation as deprecation
-deprecation._PRINT_DEPRECATION_WARNINGS = False
-
 # Local imports
 from deepcovvar import (
     covid_classifier,
     utils,
     __version__
 )
-from deepcovvar.covid_classifier import COVIDClassifier
-
-# Additional TensorFlow CPU configuration
-tf.keras.backend.set_floatx('float32')  # Use float32 for better CPU performance
+from deepcovvar.covid_classifier import COVIDClassifier, BACKENDS
+from deepcovvar.utils.onnx_backend import OPTIMIZATION_LEVELS
+from deepcovvar.utils.sequence_converter import CONVERTERS
+from deepcovvar.utils.deepcovvar_utils import phase_result_rows, format_percentages
+from deepcovvar.server import (create_server, create_token, daemon_info, option_mismatches,
+                               send_request, DEFAULT_SOCKET, DEFAULT_TOKEN_FILE)
 
 def setup_logging(log_level: str = "INFO") -> None:
     """Set up logging configuration."""
@@ -143,8 +129,360 @@ def validate_output_dir(output_dir: str) -> bool:
             return False
     return True
 
+def resolve_thresholds(classifier: COVIDClassifier, phase: int,
+                       thresholds: Optional[list] = None) -> Optional[Dict[str, float]]:
+    """Resolve binary-classification thresholds once, from the CLI or interactively."""
+    return resolve_phase_thresholds(phase, classifier.models_config[phase], thresholds)
+
+def resolve_phase_thresholds(phase: int, config: Dict,
+                             thresholds: Optional[list] = None) -> Optional[Dict[str, float]]:
+    """resolve_thresholds for a phase config, e.g. one reported by a daemon."""
+    if len(config['classes']) != 2:
+        return None
+    
+    if thresholds:
+        # Use command-line thresholds
+        try:
+            threshold1 = float(thresholds[0]) / 100.0
+            threshold2 = float(thresholds[1]) / 100.0
+            if 0.0 <= threshold1 <= 1.0 and 0.0 <= threshold2 <= 1.0:
+                print(f"Using command-line thresholds: {config['classes'][0]}={threshold1:.1%}, {config['classes'][1]}={threshold2:.1%}")
+                return {
+                    config['classes'][0]: threshold1,
+                    config['classes'][1]: threshold2
+                }
+            print("Warning: Thresholds must be between 0 and 100. Using interactive mode.")
+        except ValueError:
+            print("Warning: Invalid threshold values. Using interactive mode.")
+    
+    # Use interactive mode
+    return COVIDClassifier._get_binary_thresholds(phase, config)
+
+def print_cache_stats(classifier: COVIDClassifier) -> None:
+    """Print prediction cache counters when a cache is configured."""
+    if classifier.prediction_cache is None:
+        return
+    stats = classifier.prediction_cache.stats()
+    lookups = stats['hits'] + stats['misses']
+    hit_rate = stats['hits'] / lookups if lookups else 0.0
+    print(f"Prediction cache: {stats['hits']} hits, {stats['misses']} misses "
+          f"({hit_rate:.1%} hit rate), {stats['entries']} entries")
+
+def configure_tensorflow(intra_op_threads: int = 1, inter_op_threads: int = 1) -> None:
+    """
+    Import TensorFlow and set it up for CPU-only inference.
+    
+    Only runs that use a Keras phase call this, so phase 5 runs and daemon clients
+    never pay for importing TensorFlow. Thread counts come from the resource plan.
+    """
+    import tensorflow as tf
+    
+    # Configure TensorFlow to use CPU only - must be done before any TF operations
+    try:
+        tf.config.set_visible_devices([], 'GPU')  # Hide all GPUs
+        tf.config.threading.set_inter_op_parallelism_threads(max(1, inter_op_threads))
+        tf.config.threading.set_intra_op_parallelism_threads(max(1, intra_op_threads))
+    except RuntimeError:
+        # TF already initialized its runtime; keep the existing settings
+        pass
+    
+    # Additional TensorFlow warning suppression
+    tf.compat.v1.logging.set_verbosity(tf.compat.v1.logging.ERROR)
+    tf.get_logger().setLevel('ERROR')
+    tf.autograph.set_verbosity(0)
+    tf.get_logger().addHandler(logging.NullHandler())
+    
+    # Disable TensorFlow debugging and performance logs
+    import tensorflow.python.util.deprecation as deprecation
+    deprecation._PRINT_DEPRECATION_WARNINGS = False
+    
+    # Additional TensorFlow CPU configuration
+    tf.keras.backend.set_floatx('float32')  # Use float32 for better CPU performance
+
+def uses_keras(classifier: COVIDClassifier, phases) -> bool:
+    """Whether any of the given phases runs a Keras model (never with the ONNX backend)."""
+    return classifier.backend == 'native' and \
+        any(classifier.models_config[phase]['type'] == 'keras' for phase in phases)
+
+def add_resource_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the core-allocation options shared by the main CLI and `serve`."""
+    parser.add_argument('--cores', type=int,
+                        help='Core budget to plan with (default: CPU affinity, capped by the '
+                             'cgroup CPU quota)')
+    parser.add_argument('--workers', type=int,
+                        help='Processes used for CKSAAP featurization; large inputs are sharded '
+                             'across them (default: planned from the available cores)')
+    parser.add_argument('--tf-threads', type=int,
+                        help='TensorFlow intra-op threads (default: planned)')
+    parser.add_argument('--tf-inter-threads', type=int,
+                        help='TensorFlow inter-op threads (default: planned)')
+    parser.add_argument('--torch-threads', type=int,
+                        help='torch threads for phase 5 (default: planned)')
+    parser.add_argument('--prodigal-workers', type=int,
+                        help='Concurrent Prodigal processes for nucleotide input; large inputs are '
+                             'sharded across them, and in single mode each trains on its own shard, '
+                             'so gene calls can differ from a single run (default: 1)')
+
+def plan_resources(classifier: COVIDClassifier, args: argparse.Namespace, phases,
+                   overlap: bool = False):
+    """Plan and apply the core allocation for `phases` from the CLI arguments."""
+    plan = classifier.plan_resources(phases, overlap=overlap, cores=args.cores,
+                                     workers=args.workers, tf_threads=args.tf_threads,
+                                     tf_inter_threads=args.tf_inter_threads,
+                                     torch_threads=args.torch_threads,
+                                     onnx_threads=args.onnx_threads,
+                                     prodigal_workers=args.prodigal_workers)
+    logging.getLogger(__name__).info(f"Resource plan: {plan.describe()}")
+    if uses_keras(classifier, phases):
+        configure_tensorflow(plan.tf_intra_threads, plan.tf_inter_threads)
+    return plan
+
+def add_backend_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the inference backend options shared by the main CLI and `serve`."""
+    parser.add_argument('--backend', choices=BACKENDS, default='native',
+                        help='Run the TensorFlow/torch models (native) or their ONNX exports on '
+                             'onnxruntime (onnx; create them with `deepcovvar export-onnx`) '
+                             '(default: native)')
+    parser.add_argument('--onnx-threads', type=int,
+                        help='onnxruntime intra-op threads (default: planned from the available cores)')
+    parser.add_argument('--onnx-inter-threads', type=int, default=1,
+                        help='onnxruntime inter-op threads (default: 1)')
+    parser.add_argument('--onnx-optimization', choices=OPTIMIZATION_LEVELS, default='all',
+                        help='onnxruntime graph optimization level (default: all)')
+
+def resolve_model_dir(model_dir_arg: str) -> Path:
+    """Resolve --model-dir relative to the package directory."""
+    model_dir = Path(model_dir_arg)
+    if not model_dir.is_absolute():
+        model_dir = Path(__file__).parent / model_dir_arg
+    return model_dir
+
+def write_rows(args: argparse.Namespace, rows: list, output_file: Path, mode: str = 'w',
+               header: bool = True) -> None:
+    """Write phase_result_rows to CSV, with percentages unless --numeric-probabilities."""
+    df = pd.DataFrame(rows)
+    if not args.numeric_probabilities:
+        df = format_percentages(df)
+    df.to_csv(output_file, mode=mode, header=header, index=False)
+
+def daemon_options(args: argparse.Namespace) -> Dict:
+    """
+    Options that decide which models a run uses and what it computes.
+    
+    A daemon reports the options it was started with; the CLI only forwards a run
+    whose options match, and sends them along so the daemon can reject a mismatch.
+    """
+    return {
+        'model_dir': str(resolve_model_dir(args.model_dir).resolve()),
+        'backend': args.backend,
+        'fused': args.fused,
+        'fast_esm': args.fast_esm,
+        'cache': str(Path(args.cache).resolve()) if args.cache else None,
+        'converter': args.converter,
+        'max_tokens': args.max_tokens,
+        'workers': args.workers,
+    }
+
+def run_via_daemon(args: argparse.Namespace, logger: logging.Logger, info: Dict) -> None:
+    """
+    Forward a CLI run to a running `deepcovvar serve` daemon.
+    
+    Binary thresholds are resolved here, from --thresholds or interactively, exactly
+    as a local run resolves them; info is the daemon's ping response.
+    """
+    target = {'socket_path': args.socket, 'port': args.daemon_port}
+    phase_configs = {int(phase): config for phase, config in info['phases'].items()}
+    phases = sorted(phase_configs) if args.all_phases else [args.phase]
+    phase_thresholds = {
+        str(phase): resolve_phase_thresholds(phase, phase_configs[phase], args.thresholds)
+        for phase in phases if len(phase_configs[phase]['classes']) == 2
+    }
+    start_time = time.time()
+    
+    if args.all_phases:
+        response = send_request({
+            'command': 'run_all_phases',
+            'input_file': str(Path(args.fasta).resolve()),
+            'output_dir': str(Path(args.output).resolve()),
+            'base_filename': Path(args.fasta).stem,
+            'cascade': args.cascade,
+            'phase_thresholds': phase_thresholds,
+            'percentages': not args.numeric_probabilities,
+            'options': daemon_options(args)
+        }, **target)
+        print(f"\nDeepCovVar Complete Pipeline Finished (daemon)!")
+        print(f"Processed: {args.fasta}")
+        print(f"Completed phases: {', '.join(str(p) for p in response['completed_phases'])}")
+        print(f"Results saved to: {args.output}")
+    else:
+        # Read the input once here and send the sequences inline
+        from Bio import SeqIO
+        records = [(record.id, str(record.seq)) for record in SeqIO.parse(args.fasta, "fasta")]
+        response = send_request({
+            'command': 'predict',
+            'phase': args.phase,
+            'ids': [seq_id for seq_id, _ in records],
+            'sequences': [seq for _, seq in records],
+            'phase_thresholds': phase_thresholds,
+            'options': daemon_options(args)
+        }, **target)
+        # Predict results are fractions; write_rows applies --numeric-probabilities
+        output_file = Path(args.output) / f"phase_{args.phase}_results.csv"
+        prediction_result = pd.DataFrame(response['results'])
+        write_rows(args, phase_result_rows(records, prediction_result, args.phase), output_file)
+        print(f"\nDeepCovVar Phase {args.phase} Classification Complete (daemon)!")
+        print(f"Processed {len(records)} sequences")
+        print(f"Results saved to: {output_file}")
+    
+    elapsed_time = time.time() - start_time
+    logger.info(f"Daemon request completed in {elapsed_time:.2f} seconds")
+    print(f"Total time: {elapsed_time:.2f} seconds")
+
+def serve_main(argv: list) -> None:
+    """Entry point for `deepcovvar serve`: keep models loaded and answer requests."""
+    parser = argparse.ArgumentParser(
+        prog='deepcovvar serve',
+        description='Run a warm DeepCovVar inference daemon over a Unix socket or localhost port'
+    )
+    parser.add_argument('--socket', default=DEFAULT_SOCKET,
+                        help=f'Unix socket to listen on (default: {DEFAULT_SOCKET})')
+    parser.add_argument('--host', default='127.0.0.1',
+                        help='Host to bind when using --port (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int,
+                        help='Listen on a localhost TCP port instead of a Unix socket')
+    parser.add_argument('--token-file', default=DEFAULT_TOKEN_FILE,
+                        help='File the TCP shared secret is written to, readable by its owner only '
+                             f'(default: {DEFAULT_TOKEN_FILE}; $DEEPCOVVAR_TOKEN overrides it)')
+    parser.add_argument('--model-dir', default='models',
+                        help='Directory containing model files (default: models)')
+    parser.add_argument('--preload', type=int, nargs='*', choices=[1, 2, 3, 4, 5],
+                        default=[1, 2, 3, 4, 5],
+                        help='Phases whose models are loaded at startup (default: all)')
+    parser.add_argument('--max-tokens', type=int,
+                        help='Padded-token budget per phase 5 (ESM-2) batch')
+    parser.add_argument('--converter', choices=CONVERTERS, default='auto',
+                        help='Nucleotide-to-protein converter (default: Prodigal when installed, '
+                             'else the built-in ORF translator)')
+    add_resource_arguments(parser)
+    parser.add_argument('--fused', action='store_true',
+                        help='Score phases 1-4 with one fused Keras model in --all-phases runs')
+    parser.add_argument('--fast-esm', action='store_true',
+                        help='Phase 5 with int8 dynamic quantization, SDPA attention and inference mode')
+    add_backend_arguments(parser)
+    parser.add_argument('--cache', metavar='PATH',
+                        help='SQLite file for the persistent prediction cache')
+    parser.add_argument('--cache-max-entries', type=int, default=1_000_000,
+                        help='Maximum cached predictions before eviction (default: 1000000)')
+    parser.add_argument('--verbose', '-v', action='store_true', help='Enable verbose logging')
+    args = parser.parse_args(argv)
+    
+    setup_logging("DEBUG" if args.verbose else "INFO")
+    logger = logging.getLogger(__name__)
+    
+    model_dir = resolve_model_dir(args.model_dir)
+    logger.info(f"Using model directory: {model_dir}")
+    classifier = COVIDClassifier(model_dir=str(model_dir), max_tokens=args.max_tokens,
+                                 cache_path=args.cache,
+                                 cache_max_entries=args.cache_max_entries,
+                                 fused=args.fused, fast_esm=args.fast_esm, backend=args.backend,
+                                 onnx_inter_threads=args.onnx_inter_threads,
+                                 onnx_optimization=args.onnx_optimization,
+                                 converter=args.converter)
+    # Clients may ask for any phase, so the daemon plans for (and sets TensorFlow up for) all
+    plan_resources(classifier, args, sorted(classifier.models_config))
+    for phase in args.preload:
+        logger.info(f"Preloading model for phase {phase}")
+        classifier.load_model(phase)
+    if args.fused and args.backend == 'native':
+        classifier.load_fused_model()
+    
+    token = create_token(args.token_file) if args.port is not None else None
+    server = create_server(classifier, socket_path=args.socket, host=args.host, port=args.port,
+                           options=daemon_options(args), token=token)
+    address = f"{args.host}:{args.port}" if args.port is not None else args.socket
+    print(f"DeepCovVar {__version__} daemon listening on {address}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down DeepCovVar daemon")
+    finally:
+        server.server_close()
+        if args.port is None and os.path.exists(args.socket):
+            os.unlink(args.socket)
+
+def export_main(argv: list) -> None:
+    """Entry point for `deepcovvar export-model`: save the merged phase 5 model for offline use."""
+    parser = argparse.ArgumentParser(
+        prog='deepcovvar export-model',
+        description='Write the phase 5 ESM-2 model with its trained weights merged in, plus its '
+                    'tokenizer, as safetensors; later runs load it offline and memory-mapped'
+    )
+    parser.add_argument('--model-dir', default='models',
+                        help='Directory containing model files (default: models)')
+    parser.add_argument('--output',
+                        help='Export directory (default: <model-dir>/esm2_phase5)')
+    parser.add_argument('--verbose', '-v', action='store_true', help='Enable verbose logging')
+    args = parser.parse_args(argv)
+    
+    setup_logging("DEBUG" if args.verbose else "INFO")
+    logger = logging.getLogger(__name__)
+    
+    model_dir = resolve_model_dir(args.model_dir)
+    logger.info(f"Using model directory: {model_dir}")
+    try:
+        classifier = COVIDClassifier(model_dir=str(model_dir))
+        export_dir = classifier.export_transformer_model(args.output)
+    except Exception as e:
+        logger.error(f"Export failed: {e}")
+        print(f"Error: {e}")
+        sys.exit(1)
+    print(f"Phase 5 model exported to: {export_dir}")
+
+def export_onnx_main(argv: list) -> None:
+    """Entry point for `deepcovvar export-onnx`: convert the models for the ONNX backend."""
+    parser = argparse.ArgumentParser(
+        prog='deepcovvar export-onnx',
+        description='Convert the phase models to ONNX so that --backend onnx can run them on '
+                    'onnxruntime without TensorFlow or torch'
+    )
+    parser.add_argument('--model-dir', default='models',
+                        help='Directory containing model files (default: models)')
+    parser.add_argument('--output',
+                        help='Export directory (default: <model-dir>/onnx)')
+    parser.add_argument('--phases', type=int, nargs='+', choices=[1, 2, 3, 4, 5],
+                        default=[1, 2, 3, 4, 5], help='Phases to export (default: all)')
+    parser.add_argument('--verbose', '-v', action='store_true', help='Enable verbose logging')
+    args = parser.parse_args(argv)
+    
+    setup_logging("DEBUG" if args.verbose else "INFO")
+    logger = logging.getLogger(__name__)
+    
+    model_dir = resolve_model_dir(args.model_dir)
+    logger.info(f"Using model directory: {model_dir}")
+    try:
+        classifier = COVIDClassifier(model_dir=str(model_dir))
+        if uses_keras(classifier, args.phases):
+            configure_tensorflow()
+        exported = classifier.export_onnx_models(args.output, phases=args.phases)
+    except Exception as e:
+        logger.error(f"ONNX export failed: {e}")
+        print(f"Error: {e}")
+        sys.exit(1)
+    for phase, path in exported.items():
+        print(f"Phase {phase} exported to: {path}")
+
 def main():
     """Main entry point for DeepCovVar."""
+    if len(sys.argv) > 1 and sys.argv[1] == 'serve':
+        serve_main(sys.argv[2:])
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == 'export-model':
+        export_main(sys.argv[2:])
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == 'export-onnx':
+        export_onnx_main(sys.argv[2:])
+        return
+    
     parser = argparse.ArgumentParser(
         description='DeepCovVar: COVID-19 Variant Classification Tool',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -156,11 +494,28 @@ Examples:
   # Run all phases (recommended)
   python -m deepcovvar -f input.fasta -o output_dir --all-phases
   
+  # Hierarchical cascade: only forward positives to the next phase
+  python -m deepcovvar -f input.fasta -o output_dir --cascade --thresholds 50 50
+  
+  # Keep models loaded in a daemon; later runs forward to it automatically
+  python -m deepcovvar serve &
+  python -m deepcovvar -f input.fasta -o output_dir -p 4
+  
+  # Save the merged phase 5 model once so later runs load it offline
+  python -m deepcovvar export-model
+  
+  # Convert the models to ONNX once, then run without TensorFlow or torch
+  python -m deepcovvar export-onnx
+  python -m deepcovvar -f input.fasta -o output_dir --all-phases --backend onnx
+  
   # Use default output directory (current directory)
   python -m deepcovvar -f input.fasta --all-phases
   
   # Run binary classification with custom thresholds
   python -m deepcovvar -f input.fasta -o output_dir -p 1 --thresholds 40 60
+  
+  # Stream a large file through one phase, writing rows as batches finish
+  python -m deepcovvar -f input.fasta -o output_dir -p 1 --thresholds 50 50 --stream
         """
     )
     
@@ -189,12 +544,27 @@ Examples:
         help='Run all phases from 1 to 5 (recommended)'
     )
     
+    parser.add_argument(
+        '--cascade',
+        action='store_true',
+        help='Run all phases hierarchically: each phase only receives sequences the previous phase '
+             'assigned to its forwarded class (implies --all-phases)'
+    )
+    
     parser.add_argument(
         '--model-dir',
         default='models',
         help='Directory containing model files (default: models)'
     )
     
+    parser.add_argument(
+        '--converter',
+        choices=CONVERTERS,
+        default='auto',
+        help='Nucleotide-to-protein converter: prodigal, the built-in six-frame ORF translator '
+             '(orf), or auto (default: Prodigal when installed, else orf)'
+    )
+    
     parser.add_argument(
         '--thresholds',
         nargs=2,
@@ -202,6 +572,85 @@ Examples:
         help='Custom thresholds for binary classification (e.g., --thresholds 40 60 for 40%% and 60%%)'
     )
     
+    parser.add_argument(
+        '--max-tokens',
+        type=int,
+        help='Padded-token budget per phase 5 (ESM-2) batch; sequences are length-sorted '
+             'into batches under this budget (default: 32 x 512)'
+    )
+    
+    add_resource_arguments(parser)
+    
+    parser.add_argument(
+        '--fused',
+        action='store_true',
+        help='With --all-phases, combine the phase 1-4 Keras models into one graph with a shared '
+             'CKSAAP input and score them in a single forward pass'
+    )
+    
+    parser.add_argument(
+        '--fast-esm',
+        action='store_true',
+        help='Run phase 5 (ESM-2) with int8 dynamic quantization of Linear layers, SDPA attention '
+             'and torch.inference_mode; faster on CPU with slightly different probabilities'
+    )
+    
+    add_backend_arguments(parser)
+    
+    parser.add_argument(
+        '--numeric-probabilities',
+        action='store_true',
+        help='Write confidences and class probabilities as fractions between 0 and 1 '
+             'instead of percentages'
+    )
+    
+    parser.add_argument(
+        '--cache',
+        metavar='PATH',
+        help='SQLite file for the persistent prediction cache; sequences already scored by the '
+             'same model file are served from it'
+    )
+    
+    parser.add_argument(
+        '--cache-max-entries',
+        type=int,
+        default=1_000_000,
+        help='Maximum cached predictions before least-recently-used eviction (default: 1000000)'
+    )
+    
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Score the file in batches and append rows to the CSVs as each batch finishes; '
+             'memory stays bounded by --chunk-size (works with --phase and --all-phases)'
+    )
+    
+    parser.add_argument(
+        '--chunk-size',
+        type=int,
+        default=1000,
+        help='Number of sequences per batch in --stream mode (default: 1000)'
+    )
+    
+    parser.add_argument(
+        '--socket',
+        default=DEFAULT_SOCKET,
+        help=f'Socket of a running `deepcovvar serve` daemon to forward to (default: {DEFAULT_SOCKET})'
+    )
+    
+    parser.add_argument(
+        '--daemon-port',
+        type=int,
+        help='Forward to a daemon listening on this localhost TCP port instead of a socket '
+             '(authenticated with the token the daemon wrote, or $DEEPCOVVAR_TOKEN)'
+    )
+    
+    parser.add_argument(
+        '--no-daemon',
+        action='store_true',
+        help='Always run locally, even when a daemon is running'
+    )
+    
     parser.add_argument(
         '--verbose', '-v',
         action='store_true',
@@ -217,6 +666,11 @@ Examples:
     args = parser.parse_args()
     
     # Validate arguments
+    if args.cascade:
+        if args.phase:
+            parser.error("Cannot specify both --phase and --cascade")
+        args.all_phases = True
+    
     if args.phase and args.all_phases:
         parser.error("Cannot specify both --phase and --all-phases")
     
@@ -237,14 +691,44 @@ Examples:
     if not validate_output_dir(args.output):
         sys.exit(1)
     
+    # Forward to a warm daemon when one is running with the same options
+    # (streaming always runs locally)
+    info = None
+    if not args.no_daemon and not args.stream:
+        info = daemon_info(args.socket, port=args.daemon_port)
+    if info is not None:
+        mismatches = option_mismatches(daemon_options(args), info.get('options'))
+        if mismatches:
+            logger.warning("Running locally: the DeepCovVar daemon was started with different "
+                           f"options: {', '.join(mismatches)}")
+            info = None
+    if info is not None:
+        logger.info("Forwarding request to running DeepCovVar daemon")
+        try:
+            run_via_daemon(args, logger, info)
+            return
+        except Exception as e:
+            logger.error(f"Fatal error: {e}")
+            print(f"Error: {e}")
+            sys.exit(1)
+    
     try:
         # Initialize classifier
-        model_dir = Path(args.model_dir)
-        if not model_dir.is_absolute():
-            model_dir = Path(__file__).parent / args.model_dir
+        model_dir = resolve_model_dir(args.model_dir)
         
         logger.info(f"Using model directory: {model_dir}")
-        classifier = COVIDClassifier(model_dir=str(model_dir))
+        classifier = COVIDClassifier(model_dir=str(model_dir), max_tokens=args.max_tokens,
+                                     cache_path=args.cache,
+                                     cache_max_entries=args.cache_max_entries,
+                                     fused=args.fused, fast_esm=args.fast_esm,
+                                     backend=args.backend,
+                                     onnx_inter_threads=args.onnx_inter_threads,
+                                     onnx_optimization=args.onnx_optimization,
+                                     percentages=not args.numeric_probabilities,
+                                     converter=args.converter)
+        phases = sorted(classifier.models_config) if args.all_phases else [args.phase]
+        # Streaming featurizes the next chunk while the current one is scored
+        plan = plan_resources(classifier, args, phases, overlap=args.stream)
         
         if args.all_phases:
             # Run complete pipeline
@@ -254,11 +738,23 @@ Examples:
             # Get base filename for output
             base_filename = Path(args.fasta).stem
             
+            # Apply command-line thresholds to every binary phase
+            thresholds = None
+            if args.thresholds:
+                thresholds = {
+                    phase: resolve_thresholds(classifier, phase, args.thresholds)
+                    for phase, config in classifier.models_config.items()
+                    if len(config['classes']) == 2
+                }
+            
             # Run all phases
             all_results = classifier.run_all_phases(
                 input_file=args.fasta,
                 output_dir=args.output,
-                base_filename=base_filename
+                base_filename=base_filename,
+                cascade=args.cascade,
+                thresholds=thresholds,
+                chunk_size=args.chunk_size if args.stream else None
             )
             
             elapsed_time = time.time() - start_time
@@ -269,93 +765,56 @@ Examples:
             print(f"Processed: {args.fasta}")
             print(f"Results saved to: {args.output}")
             print(f"Total time: {elapsed_time:.2f} seconds")
+            print(f"Resources: {plan.describe()}")
+            print_cache_stats(classifier)
             
         else:
             # Run specific phase
             logger.info(f"Loading model for phase {args.phase}")
             classifier.load_model(args.phase)
+            custom_thresholds = resolve_thresholds(classifier, args.phase, args.thresholds)
             
             # Process sequences
             logger.info(f"Processing sequences from {args.fasta}")
             start_time = time.time()
+            output_file = Path(args.output) / f"phase_{args.phase}_results.csv"
             
-            # Read sequences
-            from Bio import SeqIO
-            sequences = list(SeqIO.parse(args.fasta, "fasta"))
-            logger.info(f"Loaded {len(sequences)} sequences")
-            
-            # Process each sequence
-            results = []
-            for i, seq_record in enumerate(sequences):
-                logger.info(f"Processing sequence {i+1}/{len(sequences)}: {seq_record.id}")
+            if args.stream:
+                # Append rows to the CSV as each batch finishes
+                processed = 0
+                write_header = True
+                for records, prediction_result in classifier.predict_stream(
+                        args.phase, args.fasta, chunk_size=args.chunk_size,
+                        custom_thresholds=custom_thresholds):
+                    write_rows(args, phase_result_rows(records, prediction_result, args.phase),
+                               output_file, mode='w' if write_header else 'a', header=write_header)
+                    write_header = False
+                    processed += len(records)
+                    logger.info(f"Wrote {processed} sequences to {output_file}")
+                sequence_count = processed
+            else:
+                # One batched prediction over the whole file, parsed and converted once
+                records, sequences, seq_ids = classifier.ingest_sequences(args.fasta)
+                logger.info(f"Loaded {len(records)} sequences")
                 
-                # Extract features and predict
                 try:
-                    # Use the correct predict method
-                    # For binary classification phases, handle thresholds
-                    config = classifier.models_config[args.phase]
-                    custom_thresholds = None
-                    if len(config['classes']) == 2:
-                        if args.thresholds:
-                            # Use command-line thresholds
-                            try:
-                                threshold1 = float(args.thresholds[0]) / 100.0
-                                threshold2 = float(args.thresholds[1]) / 100.0
-                                if 0.0 <= threshold1 <= 1.0 and 0.0 <= threshold2 <= 1.0:
-                                    custom_thresholds = {
-                                        config['classes'][0]: threshold1,
-                                        config['classes'][1]: threshold2
-                                    }
-                                    print(f"Using command-line thresholds: {config['classes'][0]}={threshold1:.1%}, {config['classes'][1]}={threshold2:.1%}")
-                                else:
-                                    print("Warning: Thresholds must be between 0 and 100. Using interactive mode.")
-                                    custom_thresholds = classifier._get_binary_thresholds(args.phase, config)
-                            except ValueError:
-                                print("Warning: Invalid threshold values. Using interactive mode.")
-                                custom_thresholds = classifier._get_binary_thresholds(args.phase, config)
-                        else:
-                            # Use interactive mode
-                            custom_thresholds = classifier._get_binary_thresholds(args.phase, config)
-                    
-                    prediction_result = classifier.predict(args.phase, args.fasta, custom_thresholds=custom_thresholds)
-                    
-                    # Extract prediction for this specific sequence
-                    seq_prediction = prediction_result[prediction_result['Sequence_ID'] == seq_record.id]
-                    if not seq_prediction.empty:
-                        prediction = seq_prediction.iloc[0]['Predicted_Class']
-                        confidence = seq_prediction.iloc[0]['Confidence']
-                        # Convert percentage string back to float for logging
-                        try:
-                            confidence_float = float(confidence.strip('%')) / 100.0
-                        except:
-                            confidence_float = 0.0
-                    else:
-                        prediction = 'Unknown'
-                        confidence = '0.00%'
-                        confidence_float = 0.0
-                    
-                    results.append({
-                        'sequence_id': seq_record.id,
-                        'sequence': str(seq_record.seq),
-                        'phase': args.phase,
-                        'prediction': prediction,
-                        'confidence': confidence
-                    })
-                    logger.info(f"Prediction for {seq_record.id}: {prediction} (confidence: {confidence})")
+                    prediction_result = classifier.predict(
+                        args.phase, args.fasta, custom_thresholds=custom_thresholds,
+                        prompt_thresholds=False, sequences=sequences, seq_ids=seq_ids
+                    )
+                    results = phase_result_rows(records, prediction_result, args.phase)
                 except Exception as e:
-                    logger.error(f"Error processing sequence {seq_record.id}: {e}")
-                    results.append({
-                        'sequence_id': seq_record.id,
-                        'sequence': str(seq_record.seq),
+                    logger.error(f"Error processing sequences: {e}")
+                    results = [{
+                        'sequence_id': seq_id,
+                        'sequence': seq,
                         'phase': args.phase,
                         'prediction': 'ERROR',
                         'error': str(e)
-                    })
-            
-            # Save results
-            output_file = Path(args.output) / f"phase_{args.phase}_results.csv"
-            df = pd.DataFrame(results)
-            df.to_csv(output_file, index=False)
+                    } for seq_id, seq in records]
+                
+                write_rows(args, results, output_file)
+                sequence_count = len(records)
             
             elapsed_time = time.time() - start_time
             logger.info(f"Processing completed in {elapsed_time:.2f} seconds")
@@ -363,9 +822,11 @@ Examples:
             
             # Print summary
             print(f"\nDeepCovVar Phase {args.phase} Classification Complete!")
-            print(f"Processed {len(sequences)} sequences")
+            print(f"Processed {sequence_count} sequences")
             print(f"Results saved to: {output_file}")
             print(f"Total time: {elapsed_time:.2f} seconds")
+            print(f"Resources: {plan.describe()}")
+            print_cache_stats(classifier)
         
     except Exception as e:
         logger.error(f"Fatal error: {e}")
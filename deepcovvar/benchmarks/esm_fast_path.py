@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark and accuracy-parity report for the phase 5 fast path (--fast-esm).
+
+Scores the same sequences with the default ESM-2 path (full precision,
+no_grad) and with the fast path (int8 dynamic quantization of Linear layers,
+SDPA attention, inference_mode), then reports load and inference time and how
+closely the fast path reproduces the default probabilities and predictions.
+
+Usage:
+    python deepcovvar/benchmarks/esm_fast_path.py
+    python deepcovvar/benchmarks/esm_fast_path.py --fasta my.fasta --repeats 5
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).parent.parent.parent.absolute()
+sys.path.insert(0, str(REPO_ROOT))
+
+from deepcovvar.covid_classifier import COVIDClassifier
+
+DEFAULT_FASTA = REPO_ROOT / 'deepcovvar' / 'tests' / 'p5_test.fasta'
+PHASE = 5
+
+
+def measure(classifier, sequences, repeats):
+    """Model load time, median inference time and the outputs of the last run."""
+    start = time.perf_counter()
+    classifier.load_model(PHASE)
+    load_time = time.perf_counter() - start
+
+    # One warm-up batch so one-off kernel setup is not counted
+    classifier.predict_probabilities(PHASE, sequences[:1])
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        outputs = classifier.predict_probabilities(PHASE, sequences)
+        times.append(time.perf_counter() - start)
+    return load_time, statistics.median(times), outputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare the default and --fast-esm phase 5 paths')
+    parser.add_argument('--fasta', default=str(DEFAULT_FASTA),
+                        help='Protein FASTA to score (default: tests/p5_test.fasta)')
+    parser.add_argument('--model-dir', default=str(REPO_ROOT / 'deepcovvar' / 'models'),
+                        help='Directory containing model files (default: deepcovvar/models)')
+    parser.add_argument('--repeats', type=int, default=3,
+                        help='Timed inference runs per path; the median is reported (default: 3)')
+    parser.add_argument('--max-tokens', type=int,
+                        help='Padded-token budget per batch (default: classifier default)')
+    args = parser.parse_args()
+
+    # Import the backends first so the load times compare model loading only
+    import torch
+    import transformers
+
+    results = {}
+    for label, fast_esm in [('default', False), ('fast-esm', True)]:
+        classifier = COVIDClassifier(model_dir=args.model_dir, max_tokens=args.max_tokens,
+                                     fast_esm=fast_esm)
+        sequences, _ = classifier.read_sequences(args.fasta, auto_convert=False)
+        results[label] = measure(classifier, sequences, args.repeats)
+    classes = classifier.models_config[PHASE]['classes']
+
+    print(f"\nPhase 5 fast path on {Path(args.fasta).name} ({len(sequences)} sequences, "
+          f"median of {args.repeats})")
+    print("=" * 64)
+    print(f"{'Path':<12}{'load (s)':>12}{'inference (s)':>16}{'seq/s':>10}")
+    for label, (load_time, inference_time, _) in results.items():
+        print(f"{label:<12}{load_time:12.2f}{inference_time:16.3f}{len(sequences) / inference_time:10.1f}")
+    print(f"Inference speedup: {results['default'][1] / results['fast-esm'][1]:.2f}x")
+
+    default, fast = results['default'][2], results['fast-esm'][2]
+    difference = np.abs(default - fast)
+    agree = np.argmax(default, axis=1) == np.argmax(fast, axis=1)
+    print("\nAccuracy parity (fast-esm vs default)")
+    print("-" * 64)
+    print(f"Top-1 agreement:         {agree.sum()}/{len(agree)} ({agree.mean():.1%})")
+    print(f"Max |probability diff|:  {difference.max():.4f}")
+    print(f"Mean |probability diff|: {difference.mean():.4f}")
+    for label, outputs in [('default', default), ('fast-esm', fast)]:
+        predicted = np.argmax(outputs, axis=1)
+        counts = {classes[k]: int((predicted == k).sum()) for k in range(len(classes)) if (predicted == k).any()}
+        print(f"Predicted classes ({label}): {counts}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for DeepCovVar.
+
+Each measurement runs in a fresh interpreter and reports, per phase, the time to
+import the package, construct a COVIDClassifier, import the phase's backend
+(TensorFlow for phases 1-4, torch + transformers for phase 5) and load its model.
+It also lists which heavy backends were already imported before the phase ran,
+which should be none now that they are imported lazily.
+
+Usage:
+    python deepcovvar/benchmarks/import_time.py
+    python deepcovvar/benchmarks/import_time.py --phases 1 5 --repeats 5 --no-load
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).parent.parent.parent.absolute()
+HEAVY_MODULES = ['tensorflow', 'torch', 'transformers']
+
+# Runs in the child interpreter; prints one JSON line of timings in seconds
+CHILD = r'''
+import json, sys, time
+heavy = %(heavy)r
+phase, load = int(sys.argv[1]), sys.argv[2] == '1'
+timings = {}
+
+start = time.perf_counter()
+import deepcovvar.covid_classifier
+timings['import'] = time.perf_counter() - start
+timings['preloaded'] = [name for name in heavy if name in sys.modules]
+
+start = time.perf_counter()
+try:
+    classifier = deepcovvar.covid_classifier.COVIDClassifier()
+except Exception as e:
+    classifier = None
+    timings['error'] = f'init: {e}'
+timings['init'] = time.perf_counter() - start
+
+start = time.perf_counter()
+if classifier is None or classifier.models_config[phase]['type'] == 'keras':
+    import tensorflow
+else:
+    import torch, transformers
+timings['backend'] = time.perf_counter() - start
+
+if load and classifier is not None:
+    start = time.perf_counter()
+    try:
+        classifier.load_model(phase)
+        timings['load'] = time.perf_counter() - start
+    except Exception as e:
+        timings['error'] = f'load: {e}'
+print(json.dumps(timings))
+''' % {'heavy': HEAVY_MODULES}
+
+
+def _child_env():
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [str(REPO_ROOT), env.get('PYTHONPATH')]))
+    env.setdefault('TF_CPP_MIN_LOG_LEVEL', '3')
+    return env
+
+
+def time_command(args):
+    """Wall-clock seconds of one fresh interpreter running `args`."""
+    start = time.perf_counter()
+    subprocess.run([sys.executable] + args, env=_child_env(), capture_output=True, check=False)
+    return time.perf_counter() - start
+
+
+def time_phase(phase, load):
+    """Timings of one cold start for `phase` from a fresh interpreter."""
+    result = subprocess.run([sys.executable, '-c', CHILD, str(phase), '1' if load else '0'],
+                            env=_child_env(), capture_output=True, text=True, check=False)
+    lines = [line for line in result.stdout.splitlines() if line.startswith('{')]
+    if not lines:
+        return {'error': result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'no output'}
+    return json.loads(lines[-1])
+
+
+def _median(runs, key):
+    values = [run[key] for run in runs if key in run]
+    return f"{statistics.median(values):8.3f}" if values else f"{'n/a':>8}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure DeepCovVar cold-start time per phase')
+    parser.add_argument('--phases', type=int, nargs='+', default=[1, 2, 3, 4, 5],
+                        choices=[1, 2, 3, 4, 5], help='Phases to measure (default: all)')
+    parser.add_argument('--repeats', type=int, default=3,
+                        help='Fresh interpreters per measurement; the median is reported (default: 3)')
+    parser.add_argument('--no-load', action='store_true',
+                        help='Skip loading model files (imports only)')
+    args = parser.parse_args()
+
+    print(f"DeepCovVar cold start (median of {args.repeats}, seconds)")
+    print("=" * 72)
+    for label, command in [('python -c "import deepcovvar"', ['-c', 'import deepcovvar']),
+                           ('python -m deepcovvar --version', ['-m', 'deepcovvar', '--version'])]:
+        wall = statistics.median(time_command(command) for _ in range(args.repeats))
+        print(f"{label:<40}{wall:8.3f}")
+
+    print()
+    print(f"{'Phase':<7}{'import':>8}{'init':>8}{'backend':>9}{'load':>8}  preloaded backends")
+    for phase in args.phases:
+        runs = [time_phase(phase, not args.no_load) for _ in range(args.repeats)]
+        preloaded = ', '.join(runs[-1].get('preloaded', [])) or 'none'
+        print(f"{phase:<7}{_median(runs, 'import')}{_median(runs, 'init')} "
+              f"{_median(runs, 'backend')}{_median(runs, 'load')}  {preloaded}")
+        errors = {run['error'] for run in runs if 'error' in run}
+        for error in errors:
+            print(f"        note: {error}")
+
+
+if __name__ == '__main__':
+    main()
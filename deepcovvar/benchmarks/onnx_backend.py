@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Startup, throughput and parity report for the ONNX Runtime backend (--backend onnx).
+
+For each phase, a fresh interpreter per backend imports DeepCovVar, loads the
+phase model (native TensorFlow/torch, or its `export-onnx` file on onnxruntime)
+and scores the same sequences; the report compares startup (import + load),
+median inference time and the largest probability difference between backends.
+Run `python -m deepcovvar export-onnx` first.
+
+Usage:
+    python deepcovvar/benchmarks/onnx_backend.py
+    python deepcovvar/benchmarks/onnx_backend.py --phases 1 5 --fasta my.fasta --repeats 5
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).parent.parent.parent.absolute()
+DEFAULT_FASTA = REPO_ROOT / 'deepcovvar' / 'tests' / 'p5_test.fasta'
+BACKENDS = ['native', 'onnx']
+
+# Runs in the child interpreter; saves the outputs and prints one JSON line of timings
+CHILD = r'''
+import json, statistics, sys, time
+import numpy as np
+backend, phase, fasta, model_dir, repeats, output = sys.argv[1:7]
+phase, repeats = int(phase), int(repeats)
+timings = {}
+
+start = time.perf_counter()
+from deepcovvar.covid_classifier import COVIDClassifier
+classifier = COVIDClassifier(model_dir=model_dir, backend=backend)
+classifier.load_model(phase)
+timings['startup'] = time.perf_counter() - start
+
+sequences, _ = classifier.read_sequences(fasta, auto_convert=False)
+# One warm-up batch so one-off kernel setup is not counted
+classifier.predict_probabilities(phase, sequences[:1])
+times = []
+for _ in range(repeats):
+    start = time.perf_counter()
+    outputs = classifier.predict_probabilities(phase, sequences)
+    times.append(time.perf_counter() - start)
+timings['inference'] = statistics.median(times)
+timings['sequences'] = len(sequences)
+np.save(output, outputs)
+print(json.dumps(timings))
+'''
+
+
+def run_phase(backend, phase, args, output):
+    """Timings of one fresh interpreter scoring `phase` with `backend`."""
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [str(REPO_ROOT), env.get('PYTHONPATH')]))
+    env.setdefault('TF_CPP_MIN_LOG_LEVEL', '3')
+    result = subprocess.run([sys.executable, '-c', CHILD, backend, str(phase), args.fasta,
+                             args.model_dir, str(args.repeats), str(output)],
+                            env=env, capture_output=True, text=True, check=False)
+    lines = [line for line in result.stdout.splitlines() if line.startswith('{')]
+    if not lines:
+        return {'error': result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'no output'}
+    return json.loads(lines[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare the native and ONNX Runtime backends per phase')
+    parser.add_argument('--phases', type=int, nargs='+', default=[1, 2, 3, 4, 5],
+                        choices=[1, 2, 3, 4, 5], help='Phases to measure (default: all)')
+    parser.add_argument('--fasta', default=str(DEFAULT_FASTA),
+                        help='Protein FASTA to score (default: tests/p5_test.fasta)')
+    parser.add_argument('--model-dir', default=str(REPO_ROOT / 'deepcovvar' / 'models'),
+                        help='Directory containing model files and onnx/ (default: deepcovvar/models)')
+    parser.add_argument('--repeats', type=int, default=3,
+                        help='Timed inference runs per backend; the median is reported (default: 3)')
+    args = parser.parse_args()
+
+    print(f"Native vs ONNX Runtime on {Path(args.fasta).name} (median of {args.repeats}, seconds)")
+    print("=" * 72)
+    print(f"{'Phase':<7}{'Backend':<9}{'startup':>10}{'inference':>12}{'seq/s':>10}{'max |diff|':>14}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for phase in args.phases:
+            outputs = {}
+            for backend in BACKENDS:
+                output = Path(tmp) / f"phase_{phase}_{backend}.npy"
+                run = run_phase(backend, phase, args, output)
+                if 'error' in run:
+                    print(f"{phase:<7}{backend:<9}  error: {run['error']}")
+                    continue
+                outputs[backend] = np.load(output)
+                difference = ''
+                if len(outputs) == len(BACKENDS):
+                    difference = f"{np.abs(outputs['native'] - outputs['onnx']).max():14.2e}"
+                print(f"{phase:<7}{backend:<9}{run['startup']:10.2f}{run['inference']:12.3f}"
+                      f"{run['sequences'] / run['inference']:10.1f}{difference}")
+
+
+if __name__ == '__main__':
+    main()
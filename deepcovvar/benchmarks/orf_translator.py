@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Agreement and speed report for the built-in ORF translator (--converter orf).
+
+The translator's gene calls on a nucleotide FASTA are compared with Prodigal's
+calls for the same genomes, read from a Prodigal protein FASTA (the -a output,
+whose headers carry coordinates). A gene counts as found when the translator
+calls an ORF ending at the same stop on the same strand, and as exact when the
+protein is identical too (same start codon). When Prodigal is installed it is
+also timed on the same input.
+
+Usage:
+    python deepcovvar/benchmarks/orf_translator.py
+    python deepcovvar/benchmarks/orf_translator.py --fasta genomes.fasta --reference genomes.faa
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).parent.parent.parent.absolute()
+TESTS_DIR = REPO_ROOT / 'deepcovvar' / 'tests'
+sys.path.insert(0, str(REPO_ROOT))
+
+from Bio import SeqIO
+
+from deepcovvar.utils.sequence_converter import OrfTranslator, ProdigalConverter
+
+
+def read_prodigal_calls(path):
+    """{genome id: {(strand, stop coordinate): protein}} from a Prodigal protein FASTA."""
+    calls = {}
+    for record in SeqIO.parse(path, 'fasta'):
+        _, left, right, strand = record.description.split(' # ')[:4]
+        strand = int(strand)
+        stop = int(right) if strand == 1 else int(left)
+        calls.setdefault(record.id.rsplit('_', 1)[0], {})[(strand, stop)] = str(record.seq)
+    return calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare the built-in ORF translator with Prodigal')
+    parser.add_argument('--fasta', default=str(TESTS_DIR / 'test_50_sequences.fasta'),
+                        help='Nucleotide FASTA to translate (default: tests/test_50_sequences.fasta)')
+    parser.add_argument('--reference', default=str(TESTS_DIR / 'test_sarscov2_convert_prodigal.fasta'),
+                        help='Prodigal protein FASTA covering the same genomes '
+                             '(default: tests/test_sarscov2_convert_prodigal.fasta)')
+    parser.add_argument('--min-length', type=int, default=30,
+                        help='Shortest ORF kept, in codons (default: 30)')
+    args = parser.parse_args()
+
+    genomes = [(record.id, str(record.seq)) for record in SeqIO.parse(args.fasta, 'fasta')]
+    reference = read_prodigal_calls(args.reference)
+    genomes = [(seq_id, seq) for seq_id, seq in genomes if seq_id in reference]
+    if not genomes:
+        sys.exit(f"No genome of {args.fasta} appears in {args.reference}")
+
+    translator = OrfTranslator(min_length=args.min_length)
+    start = time.perf_counter()
+    calls = {seq_id: translator.find_orfs(seq) for seq_id, seq in genomes}
+    elapsed = time.perf_counter() - start
+
+    expected = sum(len(reference[seq_id]) for seq_id, _ in genomes)
+    predicted = found = exact = 0
+    for seq_id, _ in genomes:
+        genes = reference[seq_id]
+        for left, right, strand, protein, _ in calls[seq_id]:
+            predicted += 1
+            key = (strand, right if strand == 1 else left)
+            if key in genes:
+                found += 1
+                exact += genes[key] == protein
+
+    print(f"ORF translator vs Prodigal on {len(genomes)} genomes of {Path(args.fasta).name}")
+    print("=" * 72)
+    print(f"Prodigal genes:            {expected}")
+    print(f"Translator ORFs:           {predicted}")
+    print(f"Prodigal genes found:      {found} ({found / expected:.1%})")
+    print(f"Identical proteins:        {exact} ({exact / expected:.1%})")
+    print(f"ORFs Prodigal did not call: {predicted - found}")
+    print(f"Translator time:           {elapsed:.3f} s ({elapsed / len(genomes) * 1000:.1f} ms per genome)")
+
+    try:
+        prodigal = ProdigalConverter()
+    except RuntimeError:
+        print("Prodigal time:             not installed")
+        return
+    start = time.perf_counter()
+    prodigal.convert_sequences_in_memory([seq for _, seq in genomes], [seq_id for seq_id, _ in genomes])
+    print(f"Prodigal time:             {time.perf_counter() - start:.3f} s "
+          f"({prodigal.workers} processes)")
+
+
+if __name__ == '__main__':
+    main()
@@ -9,55 +9,143 @@ def fix_numpy_compatibility():
 fix_numpy_compatibility()
 
 import argparse
+import hashlib
+import multiprocessing
 import os
+import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from importlib import resources
 import numpy as np
 from pathlib import Path
-import tensorflow as tf
-import torch
-import torch.nn as nn
 from Bio import SeqIO
 import pandas as pd
 import json
-import pkg_resources
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
 
 from .utils import FEATURE
 from .utils import SequenceProcessor
+from .utils.sequence_converter import CONVERTERS, ProdigalConverter
+from .utils.deepcovvar_utils import (plan_token_batches, deduplicate_sequences, staged_pipeline,
+                                     format_percentages)
+from .utils.onnx_backend import (OnnxModel, create_session, export_keras_model,
+                                 export_transformer_model, softmax)
+from .utils.prediction_cache import PredictionCache, file_digest
+from .utils.sequence_batch import SequenceBatch
+from .utils.resources import plan_resources
 
-class TransformerModel(nn.Module):
-    def __init__(self, vocab_size, d_model=512, nhead=8, num_layers=6, num_classes=3):
-        super(TransformerModel, self).__init__()    
-        self.embedding = nn.Embedding(vocab_size, d_model)
-        self.transformer = nn.TransformerEncoder(
-            nn.TransformerEncoderLayer(d_model=d_model, nhead=nhead, batch_first=True),
-            num_layers=num_layers
-        )
-        self.pooler = nn.AdaptiveAvgPool1d(1)
-        self.classifier = nn.Linear(d_model, num_classes)
-        
-    def forward(self, input_ids):
-        embedded = self.embedding(input_ids)
-        transformer_output = self.transformer(embedded)
-        
-        pooled = self.pooler(transformer_output.transpose(1, 2)).squeeze(-1)  
-        logits = self.classifier(pooled)  
-        return logits
+# Smallest number of sequences per worker worth shipping to the featurization pool
+MIN_FEATURE_SHARD = 256
+# Chunks allowed to wait between two stages of the streaming pipeline
+PIPELINE_QUEUE_SIZE = 2
+# Rows of each phase's results printed to the console; the CSV always has every row
+RESULTS_PREVIEW_ROWS = 10
+# Subdirectory of the model directory holding the merged phase 5 model written by export-model
+EXPORTED_TRANSFORMER_DIR = 'esm2_phase5'
+# Subdirectory of the model directory holding the ONNX models written by export-onnx
+ONNX_MODEL_DIR = 'onnx'
+# Inference backends: TensorFlow/torch models, or their ONNX exports on onnxruntime
+BACKENDS = ('native', 'onnx')
+# Bytes the ESM tokenizer splits text on (whitespace, the '<' of <special> tokens);
+# batches containing them are tokenized by the tokenizer instead of the lookup table
+TOKENIZER_SPLIT_BYTES = np.array([chr(byte).isspace() or chr(byte) == '<' for byte in range(256)])
+
+# TensorFlow, torch and transformers are imported inside the methods that use them,
+# so each backend is only loaded once a phase of that type runs
+
+
+def package_model_path(name=None):
+    """Path of `name` in the models directory shipped with the package (the directory itself if None)."""
+    try:
+        models = resources.files('deepcovvar') / 'models'
+    except AttributeError:
+        # importlib.resources.files needs Python 3.9
+        models = Path(__file__).parent / 'models'
+    return Path(str(models / name if name else models))
+
+
+def _transformer_model_class():
+    import torch.nn as nn
+    
+    class TransformerModel(nn.Module):
+        def __init__(self, vocab_size, d_model=512, nhead=8, num_layers=6, num_classes=3):
+            super(TransformerModel, self).__init__()    
+            self.embedding = nn.Embedding(vocab_size, d_model)
+            self.transformer = nn.TransformerEncoder(
+                nn.TransformerEncoderLayer(d_model=d_model, nhead=nhead, batch_first=True),
+                num_layers=num_layers
+            )
+            self.pooler = nn.AdaptiveAvgPool1d(1)
+            self.classifier = nn.Linear(d_model, num_classes)
+            
+        def forward(self, input_ids):
+            embedded = self.embedding(input_ids)
+            transformer_output = self.transformer(embedded)
+            
+            pooled = self.pooler(transformer_output.transpose(1, 2)).squeeze(-1)  
+            logits = self.classifier(pooled)  
+            return logits
+    
+    # Pickle finds the class through the module-level __getattr__ below
+    TransformerModel.__qualname__ = 'TransformerModel'
+    return TransformerModel
+
+
+def __getattr__(name):
+    # TransformerModel subclasses torch.nn.Module, so it is built on first access
+    if name == 'TransformerModel':
+        globals()[name] = _transformer_model_class()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 class COVIDClassifier:
-    def __init__(self, model_dir=None, prodigal_path=None, batch_size=32):
-        # Use pkg_resources to get model directory from installed package
+    # Marker used in cascade results for phases a sequence never reached
+    NOT_EVALUATED = 'Not evaluated'
+    
+    def __init__(self, model_dir=None, prodigal_path=None, batch_size=32, max_tokens=None,
+                 cache_path=None, cache_max_entries=1_000_000, workers=1, fused=False,
+                 fast_esm=False, backend='native', onnx_threads=0, onnx_inter_threads=1,
+                 onnx_optimization='all', torch_threads=None, percentages=True, converter='auto'):
+        # Use importlib.resources to get model directory from installed package
         if model_dir is None:
             try:
-                self.model_dir = Path(pkg_resources.resource_filename('deepcovvar', 'models'))
+                self.model_dir = package_model_path()
             except Exception:
                 # Fallback for development when package is not installed
                 self.model_dir = Path(__file__).parent / "models"
         else:
             self.model_dir = Path(model_dir)
         self.feature_extractor = FEATURE()
-        self.sequence_processor = SequenceProcessor(prodigal_path)
+        # Prodigal, or the built-in ORF translator when Prodigal is not installed
+        self.sequence_processor = SequenceProcessor(prodigal_path, converter)
         self.batch_size = batch_size  # Configurable batch size for memory management
+        # Padded-token budget per ESM-2 batch; defaults to batch_size full-length sequences
+        self.max_tokens = max_tokens or batch_size * 512
+        self.last_padding_ratio = None
+        # Optional on-disk store of raw model outputs keyed by sequence hash
+        self.prediction_cache = PredictionCache(cache_path, cache_max_entries) if cache_path else None
+        self._model_digests = {}
+        # Featurization processes; CKSAAP is sharded across them for large inputs
+        self.workers = max(1, workers or 1)
+        self._feature_pool = None
+        # Score the Keras phases with one multi-output graph in run_all_phases
+        self.fused = fused
+        self.fused_model = None
+        self.fused_phases = []
+        # Phase 5 on CPU with int8 dynamic quantization, SDPA attention and inference mode
+        self.fast_esm = fast_esm
+        # 'onnx' runs every phase on onnxruntime; fused and fast_esm only apply to 'native'
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend: {backend} (expected one of {', '.join(BACKENDS)})")
+        self.backend = backend
+        self.onnx_threads = onnx_threads
+        # torch.set_num_threads for phase 5; None keeps torch's own default
+        self.torch_threads = torch_threads
+        # Set by plan_resources and reported in the run statistics
+        self.resource_plan = None
+        # Write confidences and probabilities to CSVs as '97.25%' rather than 0.9725
+        self.percentages = percentages
+        self.onnx_inter_threads = onnx_inter_threads
+        self.onnx_optimization = onnx_optimization
         
         self.models_config = {
             1: {
@@ -65,28 +153,32 @@ class COVIDClassifier:
         'description': 'Virus sequences vs Others',
                 'classes': ['Virus', 'Non-virus'],
                 'feature_size': 2400,  # CKSAAP with gap=5: (5+1)*400 = 2400
-                'type': 'keras'
+                'type': 'keras',
+                'cascade_class': 'Virus'  # forwarded to the next phase in cascade mode
             },
             2: {
                         'file': 'p2_final_model_quantized.keras',
         'description': '(+)ssRNA (Class IV) vs Others',
                 'classes': ['Others', '(+)ssRNA'],
                 'feature_size': 2400,
-                'type': 'keras'
+                'type': 'keras',
+                'cascade_class': '(+)ssRNA'  # forwarded to the next phase in cascade mode
             },
             3: {
                         'file': 'p3_final_model_quantized.keras',
         'description': 'Further classification of group IV ssRNA(+)',
                 'classes': ['Other ssRNA(+)', 'Coronavirus'],
                 'feature_size': 2400,
-                'type': 'keras'
+                'type': 'keras',
+                'cascade_class': 'Coronavirus'  # forwarded to the next phase in cascade mode
             },
             4: {
                         'file': 'p4_final_model_quantized.keras',
         'description': 'SARS-CoV-2, MERS, SARS multi-classification',
                 'classes': ['SARS-CoV-2', 'MERS', 'SARS', 'Others'],
                 'feature_size': 2400,
-                'type': 'keras'
+                'type': 'keras',
+                'cascade_class': 'SARS-CoV-2'  # forwarded to the next phase in cascade mode
             },
             5: {
                         'file': 'p5_final_model_quantized.pt',
@@ -100,39 +192,47 @@ class COVIDClassifier:
         self.loaded_models = {}
         self.tokenizer = None
         
-        # Get model paths using pkg_resources
+        # Get model paths using importlib.resources
         self._update_model_paths()
     
     def _update_model_paths(self):
-        """Update model file paths using pkg_resources for installed package."""
+        """Update model file paths using importlib.resources for installed package."""
         try:
             for phase, config in self.models_config.items():
                 if config['type'] == 'keras':
-                    # For Keras models, use pkg_resources
+                    # For Keras models, use importlib.resources
                     try:
-                        config['_full_path'] = pkg_resources.resource_filename('deepcovvar', f"models/{config['file']}")
+                        config['_full_path'] = str(package_model_path(config['file']))
                     except Exception:
                         # Fallback to relative path for development
                         config['_full_path'] = str(self.model_dir / config['file'])
                 elif config['type'] == 'pytorch_transformer':
-                    # For PyTorch models, also use pkg_resources
+                    # For PyTorch models, also use importlib.resources
                     try:
-                        config['_full_path'] = pkg_resources.resource_filename('deepcovvar', f"models/{config['file']}")
+                        config['_full_path'] = str(package_model_path(config['file']))
                     except Exception:
                         # Fallback to relative path for development
                         config['_full_path'] = str(self.model_dir / config['file'])
         except Exception as e:
-            print(f"Warning: Could not update model paths with pkg_resources: {e}")
+            print(f"Warning: Could not update model paths with importlib.resources: {e}")
             # Fallback: use relative paths
             for phase, config in self.models_config.items():
                 config['_full_path'] = str(self.model_dir / config['file'])
     
-    def load_transformer_model(self, model_path):
+    def load_transformer_model(self, model_path, use_export=True):
+        import torch
+        from transformers import AutoTokenizer, AutoModelForSequenceClassification
+        
         model_dir = Path(model_path)
         
-        # Try to get config file path using pkg_resources first
+        # A merged model from `deepcovvar export-model` loads offline and memory-mapped
+        export_dir = model_dir / EXPORTED_TRANSFORMER_DIR
+        if use_export and (export_dir / 'config.json').exists():
+            return self.load_exported_transformer_model(export_dir)
+        
+        # Try to get config file path using importlib.resources first
         try:
-            config_path = Path(pkg_resources.resource_filename('deepcovvar', 'models/config.pt'))
+            config_path = package_model_path('config.pt')
         except Exception:
             config_path = model_dir / "config.pt"
         
@@ -159,7 +259,8 @@ class COVIDClassifier:
         try:
             
             print("Loading base ESM-2 model...")
-            model = AutoModelForSequenceClassification.from_pretrained(
+            model = self._from_pretrained(
+                AutoModelForSequenceClassification,
                 base_model_name,
                 num_labels=num_classes,
                 ignore_mismatched_sizes=True
@@ -167,13 +268,13 @@ class COVIDClassifier:
             
             # Try to load state dict first, fall back to original if not found
             try:
-                state_dict_path = Path(pkg_resources.resource_filename('deepcovvar', 'models/model_state_dict_quantized.pt'))
+                state_dict_path = package_model_path('model_state_dict_quantized.pt')
             except Exception:
                 state_dict_path = model_dir / "model_state_dict_quantized.pt"
                 
             if not state_dict_path.exists():
                 try:
-                    state_dict_path = Path(pkg_resources.resource_filename('deepcovvar', 'models/model_state_dict.pt'))
+                    state_dict_path = package_model_path('model_state_dict.pt')
                 except Exception:
                     state_dict_path = model_dir / "model_state_dict.pt"
                 print("Model not found, using original model")
@@ -201,24 +302,161 @@ class COVIDClassifier:
             print(f"Error loading ESM-2 model: {e}")
             raise
     
-    def tokenize_sequences(self, sequences, max_length=512):
+    def load_exported_transformer_model(self, export_dir):
+        """
+        Load the merged phase 5 model and tokenizer written by export_transformer_model.
+        
+        Only local files are read. The safetensors weights are memory-mapped rather
+        than copied, so startup skips materializing the base model and worker
+        processes share the weight pages.
+        """
+        from transformers import AutoTokenizer, AutoModelForSequenceClassification
+        
+        print(f"Loading exported ESM-2 model from {export_dir}")
+        self.tokenizer = AutoTokenizer.from_pretrained(str(export_dir), local_files_only=True)
+        model = self._from_pretrained(
+            AutoModelForSequenceClassification,
+            str(export_dir),
+            local_files_only=True,
+            low_cpu_mem_usage=True
+        )
+        model.eval()
+        print("ESM-2 model loaded successfully")
+        return model
+    
+    def _from_pretrained(self, model_class, name_or_path, **kwargs):
+        """model_class.from_pretrained, with PyTorch SDPA attention in fast ESM mode when supported."""
+        if self.fast_esm:
+            try:
+                return model_class.from_pretrained(name_or_path, attn_implementation='sdpa', **kwargs)
+            except (TypeError, ValueError) as e:
+                # Older transformers releases have no SDPA path for ESM
+                print(f"SDPA attention unavailable, using the default attention: {e}")
+        return model_class.from_pretrained(name_or_path, **kwargs)
+    
+    def accelerate_transformer_model(self, model):
+        """
+        Quantize the Linear layers of the phase 5 model to int8 for CPU inference.
+        
+        Weights are stored as int8 and activations are quantized on the fly, which
+        speeds up the matrix multiplications that dominate ESM-2 on CPU at a small
+        cost in accuracy (see deepcovvar/benchmarks/esm_fast_path.py).
+        """
+        import torch
+        try:
+            from torch.ao.quantization import quantize_dynamic
+        except ImportError:
+            from torch.quantization import quantize_dynamic
+        
+        print("Applying dynamic int8 quantization to ESM-2 Linear layers")
+        model = quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        model.eval()
+        return model
+    
+    def export_transformer_model(self, output_dir=None):
+        """
+        Write the phase 5 model, with the trained weights merged in, and its tokenizer.
+        
+        Builds the model the slow way once (base model from the Hugging Face hub plus
+        the trained state dict) and saves the result as safetensors, which
+        load_transformer_model then uses instead.
+        
+        Args:
+            output_dir: Destination directory (default: models/esm2_phase5)
+            
+        Returns:
+            Path of the export directory
+        """
+        output_dir = Path(output_dir) if output_dir else self.model_dir / EXPORTED_TRANSFORMER_DIR
+        model = self.load_transformer_model(self.model_dir, use_export=False)
+        if self.tokenizer is None:
+            raise RuntimeError("Tokenizer could not be loaded; nothing to export")
+        
+        output_dir.mkdir(parents=True, exist_ok=True)
+        model.save_pretrained(str(output_dir), safe_serialization=True)
+        self.tokenizer.save_pretrained(str(output_dir))
+        print(f"Exported phase 5 model and tokenizer to {output_dir}")
+        return output_dir
+    
+    def tokenize_sequences(self, sequences, max_length=512, return_tensors='pt'):
+        """
+        ESM-2 input IDs and attention mask for a batch of sequences.
+        
+        With the ESM tokenizer every residue is a single-character token, so the
+        bytes of a SequenceBatch are mapped to token IDs through a lookup table,
+        giving the same IDs as the tokenizer without building per-residue strings.
+        Batches with characters the tokenizer splits on (whitespace, '<') and other
+        tokenizers go through the tokenizer itself.
+        """
         if self.tokenizer is None:
             raise ValueError("Tokenizer not initialized. Load model first.")
         
+        token_table = self._residue_token_table()
+        if token_table is not None:
+            batch = SequenceBatch.from_strings(sequences)
+            if not TOKENIZER_SPLIT_BYTES[batch.data].any():
+                input_ids, attention_mask = self._map_token_ids(batch, token_table, max_length)
+                if return_tensors == 'pt':
+                    import torch
+                    return torch.from_numpy(input_ids), torch.from_numpy(attention_mask)
+                return input_ids, attention_mask
+        if isinstance(sequences, SequenceBatch):
+            sequences = list(sequences)
+        
         encoded = self.tokenizer(
             sequences,
             padding=True,
             truncation=True,
             max_length=max_length,
-            return_tensors='pt'
+            return_tensors=return_tensors
         )
         
         return encoded['input_ids'], encoded['attention_mask']
     
+    def _residue_token_table(self):
+        """256-entry byte -> token ID table of the loaded ESM tokenizer, or None for other tokenizers."""
+        if getattr(self, '_token_table_owner', None) is not self.tokenizer:
+            self._token_table_owner = self.tokenizer
+            self._token_table = None
+            try:
+                from transformers import EsmTokenizer
+            except ImportError:
+                return None
+            if isinstance(self.tokenizer, EsmTokenizer):
+                table = np.full(256, self.tokenizer.unk_token_id, dtype=np.int64)
+                for token, token_id in self.tokenizer.get_vocab().items():
+                    if len(token) == 1 and ord(token) < 256:
+                        table[ord(token)] = token_id
+                self._token_table = table
+        return self._token_table
+    
+    def _map_token_ids(self, batch, token_table, max_length):
+        """Padded (input_ids, attention_mask) int64 arrays, as the ESM tokenizer builds them."""
+        unk_token_id = self.tokenizer.unk_token_id
+        # The tokenizer turns each run of unknown characters into a single <unk>
+        unknown = token_table[batch.data] == unk_token_id
+        keep = np.ones(len(batch.data), dtype=bool)
+        keep[1:] = ~(unknown[1:] & unknown[:-1])
+        keep[batch.offsets[:-1][batch.lengths > 0]] = True
+        if not keep.all():
+            batch = batch.compress(keep)
+        return batch.padded(token_table, max_length, prefix=self.tokenizer.cls_token_id,
+                            suffix=self.tokenizer.eos_token_id, pad=self.tokenizer.pad_token_id)
+    
     def load_model(self, phase):
         if phase in self.loaded_models:
             return self.loaded_models[phase]
         
+        if self.backend == 'onnx':
+            model = self.load_onnx_model(phase)
+        else:
+            model = self._load_native_model(phase)
+        
+        self.loaded_models[phase] = model
+        return model
+    
+    def _load_native_model(self, phase):
+        """Load a phase's Keras or PyTorch model from the model directory."""
         config = self.models_config[phase]
         
         if config['type'] == 'pytorch_transformer':
@@ -230,9 +468,12 @@ class COVIDClassifier:
                 raise FileNotFoundError(f"Model directory not found: {model_path}")
             
             print(f"Loading transformer model for Phase {phase}: {config['description']}")
+            self._set_torch_threads()
             model = self.load_transformer_model(model_path)
+            if self.fast_esm:
+                model = self.accelerate_transformer_model(model)
         else:
-            # Use the full path from pkg_resources if available
+            # Use the full path from importlib.resources if available
             if '_full_path' in config:
                 model_path = Path(config['_full_path'])
             else:
@@ -242,10 +483,9 @@ class COVIDClassifier:
             if not model_path.exists():
                 original_file = config['file'].replace('_quantized.keras', '.keras')
                 if '_full_path' in config:
-                    # Try to get original file path from pkg_resources
+                    # Try to get original file path from importlib.resources
                     try:
-                        original_path = pkg_resources.resource_filename('deepcovvar', f"models/{original_file}")
-                        model_path = Path(original_path)
+                        model_path = package_model_path(original_file)
                     except Exception:
                         # Fallback to relative path
                         model_path = self.model_dir / original_file
@@ -263,14 +503,189 @@ class COVIDClassifier:
             print(f"Loading model for Phase {phase}: {config['description']}")
                 
             if config['type'] == 'keras':
+                import tensorflow as tf
                 model = tf.keras.models.load_model(str(model_path))
             elif config['type'] == 'pytorch':
+                import torch
+                self._set_torch_threads()
                 model = torch.load(str(model_path), map_location='cpu')
                 model.eval()
         
-        self.loaded_models[phase] = model
         return model
     
+    def _set_torch_threads(self):
+        if self.torch_threads:
+            import torch
+            torch.set_num_threads(self.torch_threads)
+    
+    def plan_resources(self, phases=None, overlap=False, cores=None, **overrides):
+        """
+        Size the featurization pool and backend thread pools for a run of the given phases.
+        
+        The featurization worker count and torch/onnxruntime thread counts are applied to
+        this classifier; TensorFlow's pools must be set by the caller before TensorFlow
+        runs anything (see `configure_tensorflow` in __main__).
+        
+        Args:
+            phases: Phases that will run (default: all)
+            overlap: Featurization runs alongside inference (streaming runs)
+            cores: Core budget (default: detected from CPU affinity and cgroup quota)
+            **overrides: workers, tf_threads, tf_inter_threads, torch_threads, onnx_threads
+                or prodigal_workers
+            
+        Returns:
+            ResourcePlan
+        """
+        phases = sorted(self.models_config) if phases is None else list(phases)
+        plan = plan_resources([self.models_config[phase]['type'] for phase in phases],
+                              cores=cores, overlap=overlap,
+                              fused=self.fused and self.backend == 'native',
+                              backend=self.backend, **overrides)
+        if self._feature_pool is not None and plan.feature_workers != self.workers:
+            self._feature_pool.shutdown()
+            self._feature_pool = None
+        self.workers = plan.feature_workers
+        self.torch_threads = plan.torch_threads
+        self.onnx_threads = plan.onnx_threads
+        if isinstance(self.sequence_processor.converter, ProdigalConverter):
+            self.sequence_processor.converter.workers = plan.prodigal_workers
+        self.resource_plan = plan
+        return plan
+    
+    def onnx_model_path(self, phase):
+        """ONNX file of a phase, as written by export_onnx_models."""
+        return self.model_dir / ONNX_MODEL_DIR / f"phase_{phase}.onnx"
+    
+    def load_onnx_model(self, phase):
+        """
+        Open the ONNX export of a phase in an onnxruntime session.
+        
+        For phase 5 the tokenizer saved next to the ONNX file is loaded as well.
+        """
+        path = self.onnx_model_path(phase)
+        if not path.exists():
+            raise FileNotFoundError(f"ONNX model not found: {path} "
+                                    f"(create it with `deepcovvar export-onnx`)")
+        
+        print(f"Loading ONNX model for Phase {phase}: {self.models_config[phase]['description']}")
+        session = create_session(path, intra_op_threads=self.onnx_threads,
+                                 inter_op_threads=self.onnx_inter_threads,
+                                 optimization=self.onnx_optimization)
+        if self.models_config[phase]['type'] == 'pytorch_transformer':
+            from transformers import AutoTokenizer
+            self.tokenizer = AutoTokenizer.from_pretrained(str(path.parent), local_files_only=True)
+        return OnnxModel(session)
+    
+    def export_onnx_models(self, output_dir=None, phases=None):
+        """
+        Convert the native models of the given phases to ONNX.
+        
+        Args:
+            output_dir: Destination directory (default: models/onnx)
+            phases: Phases to export (default: all)
+            
+        Returns:
+            Dict mapping each exported phase to its ONNX file
+        """
+        output_dir = Path(output_dir) if output_dir else self.model_dir / ONNX_MODEL_DIR
+        output_dir.mkdir(parents=True, exist_ok=True)
+        
+        exported = {}
+        for phase in phases or sorted(self.models_config):
+            config = self.models_config[phase]
+            path = output_dir / f"phase_{phase}.onnx"
+            if config['type'] == 'pytorch_transformer':
+                # Always the full-precision model; --fast-esm quantization is torch-only
+                model = self.load_transformer_model(self.model_dir)
+            else:
+                model = self._load_native_model(phase)
+            print(f"Exporting Phase {phase} to ONNX: {path}")
+            if config['type'] == 'keras':
+                export_keras_model(model, path)
+            elif config['type'] == 'pytorch_transformer':
+                export_transformer_model(model, self.tokenizer, path)
+                self.tokenizer.save_pretrained(str(output_dir))
+            else:
+                raise ValueError(f"ONNX export is not supported for model type: {config['type']}")
+            exported[phase] = path
+        return exported
+    
+    def load_fused_model(self):
+        """
+        Combine the Keras phases into one model with a shared CKSAAP input.
+        
+        The Keras phases all consume the same feature matrix, so a single graph
+        with one output head per phase scores all of them in one forward pass.
+        
+        Returns:
+            The fused tf.keras.Model; its outputs follow the order of self.fused_phases
+        """
+        if self.fused_model is not None:
+            return self.fused_model
+        
+        import tensorflow as tf
+        
+        keras_phases = [phase for phase, config in sorted(self.models_config.items())
+                        if config['type'] == 'keras']
+        feature_size = self.models_config[keras_phases[0]]['feature_size']
+        phases = [phase for phase in keras_phases
+                  if self.models_config[phase]['feature_size'] == feature_size]
+        
+        print(f"Building fused Keras model for phases {', '.join(map(str, phases))}")
+        inputs = tf.keras.Input(shape=(feature_size,), name='cksaap')
+        outputs = []
+        for phase in phases:
+            model = self.load_model(phase)
+            # Saved models often share a default name, which one graph does not allow
+            try:
+                model.name = f'phase_{phase}'
+            except AttributeError:
+                model._name = f'phase_{phase}'
+            head_input = inputs
+            if len(model.input_shape) == 4:
+                head_input = tf.keras.layers.Reshape((1, feature_size, 1))(inputs)
+            outputs.append(model(head_input))
+        
+        self.fused_model = tf.keras.Model(inputs, outputs, name='deepcovvar_fused')
+        self.fused_phases = phases
+        return self.fused_model
+    
+    def fused_probabilities(self, sequences, feature_cache=None):
+        """
+        Raw outputs of every fused Keras phase from one forward pass.
+        
+        Each distinct sequence is scored once, as in _predict_unique.
+        
+        Args:
+            sequences: List of protein sequences
+            feature_cache: Optional dict used to share CKSAAP features between phases
+            
+        Returns:
+            Dict mapping each phase in self.fused_phases to a float32 array with one
+            row of raw model outputs per sequence
+        """
+        model = self.load_fused_model()
+        feature_size = self.models_config[self.fused_phases[0]]['feature_size']
+        
+        unique_sequences, first_index, inverse = deduplicate_sequences(sequences)
+        if len(unique_sequences) == len(sequences):
+            features = self.get_features(sequences, feature_size, feature_cache)
+        else:
+            unique_cache = {}
+            if feature_cache is not None and feature_size in feature_cache:
+                unique_cache[feature_size] = feature_cache[feature_size][first_index]
+            features = self.get_features(unique_sequences, feature_size, unique_cache)
+            if feature_cache is not None:
+                feature_cache.setdefault(feature_size, features[inverse])
+        
+        print(f"Making predictions for phases {', '.join(map(str, self.fused_phases))} "
+              f"with the fused Keras model...")
+        outputs = model.predict(features, verbose=0)
+        if not isinstance(outputs, (list, tuple)):
+            outputs = [outputs]
+        return {phase: np.asarray(output, dtype=np.float32)[inverse]
+                for phase, output in zip(self.fused_phases, outputs)}
+    
     def read_sequences(self, input_file, auto_convert=True):
         """
         Read sequences from FASTA file with automatic nucleotide detection and conversion.
@@ -282,45 +697,63 @@ class COVIDClassifier:
         Returns:
             Tuple of (sequences, sequence_ids)
         """
-        sequences = []
-        seq_ids = []
+        _, sequences, seq_ids = self.ingest_sequences(input_file, auto_convert)
+        return sequences, seq_ids
+    
+    def ingest_sequences(self, input_file, auto_convert=True, force_conversion=False):
+        """
+        Parse, type-check and (if needed) convert an input file, once per run.
         
-        try:
-            for record in SeqIO.parse(input_file, "fasta"):
-                sequences.append(str(record.seq).upper())
-                seq_ids.append(record.id)
+        The file is parsed a single time; nucleotide detection and Prodigal conversion
+        run on the in-memory records, and the result is handed to every phase.
+        
+        Args:
+            input_file: Path to input FASTA file
+            auto_convert: Whether to automatically convert nucleotide sequences to protein
+            force_conversion: Convert even if the sequences appear to be protein
             
-            if not sequences:
+        Returns:
+            Tuple of (records, sequences, sequence_ids) where records holds the raw
+            (id, sequence) pairs as read and sequences/sequence_ids are ready for prediction
+        """
+        try:
+            records = [(record.id, str(record.seq)) for record in SeqIO.parse(input_file, "fasta")]
+            if not records:
                 raise ValueError("No sequences found in the input file")
-            
-            print(f"Successfully read {len(sequences)} sequences from {input_file}")
-            
-            # Check if conversion is needed
-            if auto_convert:
-                try:
-                    converted_sequences, converted_seq_ids, was_converted = \
-                        self.sequence_processor.process_sequences_in_memory(sequences, seq_ids)
-                    
-                    if was_converted:
-                        print(f"Converted {len(converted_sequences)} nucleotide sequences to protein sequences")
-                        return converted_sequences, converted_seq_ids
-                    else:
-                        print("All sequences are already protein. No conversion needed.")
-                        return sequences, seq_ids
-                        
-                except Exception as e:
-                    print(f"Warning: Sequence conversion failed: {e}")
-                    print("Proceeding with original sequences...")
-                    return sequences, seq_ids
-            
-            return sequences, seq_ids
-            
         except Exception as e:
             raise ValueError(f"Error reading sequences from {input_file}: {str(e)}")
+        
+        print(f"Successfully read {len(records)} sequences from {input_file}")
+        return self._prepare_chunk(records, auto_convert, force_conversion)
     
-    def extract_features(self, sequences, feature_size=2400):
+    def extract_features(self, sequences, feature_size=2400, vectorized=True):
+        """
+        Extract gap=5 CKSAAP features for a list of protein sequences.
+        
+        Args:
+            sequences: SequenceBatch or list of protein sequences
+            feature_size: Number of columns expected by the model
+            vectorized: Use the batched NumPy engine (FEATURE.CKSAAP_batch) instead
+                of the per-sequence reference implementation
+            
+        Returns:
+            float32 array of shape (len(sequences), feature_size)
+        """
         print("Extracting CKSAAP features...")
         
+        if vectorized:
+            # Only as many workers as there are full shards; small inputs stay in-process
+            shard_workers = min(self.workers, len(sequences) // MIN_FEATURE_SHARD)
+            if shard_workers > 1:
+                features = self.feature_extractor.CKSAAP_parallel(
+                    sequences, self._get_feature_pool(), n_shards=shard_workers * 4, gap=5, clean=True
+                )
+            else:
+                features = self.feature_extractor.CKSAAP_batch(sequences, gap=5, clean=True)
+            if features.shape[1] < feature_size:
+                features = np.pad(features, ((0, 0), (0, feature_size - features.shape[1])))
+            return features[:, :feature_size]
+        
         features = []
         for i, seq in enumerate(sequences):
             try:
@@ -346,6 +779,15 @@ class COVIDClassifier:
         
         return np.array(features, dtype=np.float32)
     
+    def _get_feature_pool(self):
+        """Featurization pool, started on first use and reused for every later call."""
+        if self._feature_pool is None:
+            # Spawn rather than fork: the parent may already be running TF/torch threads
+            self._feature_pool = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context('spawn')
+            )
+        return self._feature_pool
+    
     def process_input_sequences(self, input_file, output_file=None, force_conversion=False):
         """
         Process input sequences: detect type and convert if necessary.
@@ -366,24 +808,277 @@ class COVIDClassifier:
             print(f"Error processing sequences: {e}")
             raise
     
-    def predict(self, phase, input_file, output_file=None, custom_thresholds=None):
-        model = self.load_model(phase)
+    def get_features(self, sequences, feature_size, feature_cache=None):
+        """
+        Return CKSAAP features, reusing a matrix already computed for this input.
+        
+        Args:
+            sequences: List of protein sequences
+            feature_size: Number of feature columns expected by the model
+            feature_cache: Optional dict shared across phases, keyed by feature size
+            
+        Returns:
+            float32 feature matrix
+        """
+        if feature_cache is not None and feature_size in feature_cache:
+            print(f"Reusing cached CKSAAP features ({feature_size} columns)")
+            return feature_cache[feature_size]
+        
+        features = self.extract_features(sequences, feature_size)
+        if feature_cache is not None:
+            feature_cache[feature_size] = features
+        return features
+    
+    def iter_sequence_chunks(self, input_file, chunk_size=1000, auto_convert=True):
+        """
+        Read a FASTA file in chunks, converting nucleotide chunks to protein.
+        
+        Args:
+            input_file: Path to input FASTA file
+            chunk_size: Number of records per chunk
+            auto_convert: Whether to convert nucleotide sequences to protein
+            
+        Yields:
+            Tuples of (records, sequences, sequence_ids) where records holds the raw
+            (id, sequence) pairs of the chunk and sequences/sequence_ids are ready
+            for prediction. Nucleotide chunks are handed out one Prodigal shard at
+            a time, as soon as each shard is translated.
+        """
+        for records in self.iter_record_chunks(input_file, chunk_size):
+            yield from self._iter_prepared(records, auto_convert)
+    
+    def iter_record_chunks(self, input_file, chunk_size=1000):
+        """Yield lists of raw (id, sequence) pairs of up to chunk_size records."""
+        records = []
+        for record in SeqIO.parse(input_file, "fasta"):
+            records.append((record.id, str(record.seq)))
+            if len(records) >= chunk_size:
+                yield records
+                records = []
+        if records:
+            yield records
+    
+    def _iter_prepared(self, records, auto_convert):
+        seq_ids = [seq_id for seq_id, _ in records]
+        sequences = SequenceBatch.from_strings([seq.upper() for _, seq in records], seq_ids)
+        if not auto_convert:
+            yield records, sequences, seq_ids
+            return
+        done = 0
+        try:
+            for (start, stop), shard_sequences, shard_seq_ids, _ in \
+                    self.sequence_processor.iter_process_sequences(sequences, seq_ids):
+                done = stop
+                # A shard in which Prodigal found no genes has nothing to score
+                if shard_sequences:
+                    shard_sequences = SequenceBatch.from_strings(shard_sequences, shard_seq_ids)
+                    yield records[start:stop], shard_sequences, shard_seq_ids
+        except Exception as e:
+            print(f"Warning: Sequence conversion failed: {e}")
+            print("Proceeding with original sequences...")
+            if done < len(records):
+                yield records[done:], sequences[done:], seq_ids[done:]
+    
+    def _prepare_chunk(self, records, auto_convert, force_conversion=False):
+        seq_ids = [seq_id for seq_id, _ in records]
+        sequences = SequenceBatch.from_strings([seq.upper() for _, seq in records], seq_ids)
+        if auto_convert or force_conversion:
+            try:
+                sequences, seq_ids, _ = \
+                    self.sequence_processor.process_sequences_in_memory(
+                        sequences, seq_ids, force_conversion=force_conversion)
+            except Exception as e:
+                print(f"Warning: Sequence conversion failed: {e}")
+                print("Proceeding with original sequences...")
+        return records, SequenceBatch.from_strings(sequences, seq_ids), seq_ids
+    
+    def predict_stream(self, phase, input_file, chunk_size=1000, custom_thresholds=None,
+                       output_file=None):
+        """
+        Run one phase over a FASTA file chunk by chunk.
+        
+        Args:
+            phase: Phase number (1-5)
+            input_file: Input FASTA file
+            chunk_size: Number of records scored per batch
+            custom_thresholds: Thresholds for binary classification phases
+            output_file: Optional CSV file; rows are appended as each chunk finishes
+            
+        Yields:
+            Tuples of (records, results_df) for every chunk, where records holds the
+            raw (id, sequence) pairs read from input_file.
+        """
+        def featurize(chunk):
+            records, sequences, seq_ids = chunk
+            return records, sequences, seq_ids, self._prefetch_features(sequences, [phase])
+        
+        def infer(chunk):
+            records, sequences, seq_ids, feature_cache = chunk
+            return records, self.predict(phase, input_file, custom_thresholds=custom_thresholds,
+                                         sequences=sequences, seq_ids=seq_ids,
+                                         feature_cache=feature_cache, prompt_thresholds=False)
+        
+        # Parsing, conversion, featurization and inference overlap across chunks;
+        # the caller consumes (and writes) one chunk while the next is being scored
+        write_header = True
+        for records, results_df in staged_pipeline(
+                self.iter_sequence_chunks(input_file, chunk_size),
+                [featurize, infer],
+                maxsize=PIPELINE_QUEUE_SIZE):
+            if output_file:
+                self.write_results(results_df, output_file, mode='w' if write_header else 'a',
+                                   header=write_header)
+                write_header = False
+            yield records, results_df
+    
+    def _prefetch_features(self, sequences, phases):
+        """
+        Compute the CKSAAP matrices the given phases need ahead of inference.
+        
+        Skipped when a prediction cache is configured, since cached sequences
+        never need features.
+        
+        Returns:
+            feature_cache dict keyed by feature size (empty when nothing was computed)
+        """
+        feature_cache = {}
+        if self.prediction_cache is not None:
+            return feature_cache
+        for phase in phases:
+            config = self.models_config[phase]
+            if config['type'] == 'keras' and config['feature_size'] not in feature_cache:
+                feature_cache[config['feature_size']] = self.extract_features(sequences, config['feature_size'])
+        return feature_cache
+    
+    def predict_probabilities(self, phase, sequences, feature_cache=None):
+        """
+        Raw model outputs for a list of protein sequences.
+        
+        When a prediction cache is configured, sequences already scored by the
+        current model file are served from it and only the misses are featurized
+        and run through the model.
+        
+        Args:
+            phase: Phase number (1-5)
+            sequences: List of protein sequences
+            feature_cache: Optional dict used to share CKSAAP features between phases
+            
+        Returns:
+            float32 array with one row of raw model outputs per sequence; rows of
+            failed batches are NaN
+        """
+        if self.prediction_cache is None:
+            return self._run_model(phase, sequences, feature_cache)
+        
+        sequences = SequenceBatch.from_strings(sequences)
         config = self.models_config[phase]
+        digest = self.model_digest(phase)
+        variant = self.model_variant(phase)
+        keys = [self._sequence_key(seq, config) for seq in sequences]
+        cached = self.prediction_cache.get_many(phase, digest, keys, variant=variant)
+        missing = [i for i, key in enumerate(keys) if key not in cached]
+        print(f"Prediction cache: {len(sequences) - len(missing)} hits, {len(missing)} misses")
         
-        # Handle custom thresholds for binary classification
-        if custom_thresholds is None and len(config['classes']) == 2:
-            custom_thresholds = self._get_binary_thresholds(phase, config)
+        computed = {}
+        if missing:
+            if len(missing) == len(sequences):
+                miss_cache = feature_cache
+            elif feature_cache and config['feature_size'] in feature_cache:
+                miss_cache = {config['feature_size']: feature_cache[config['feature_size']][missing]}
+            else:
+                miss_cache = None
+            outputs = self._run_model(phase, sequences.take(missing), miss_cache)
+            computed = {keys[i]: row for i, row in zip(missing, outputs)}
+            self.prediction_cache.put_many(
+                phase, digest, {key: row for key, row in computed.items() if not np.isnan(row).any()},
+                variant=variant
+            )
         
-        sequences, seq_ids = self.read_sequences(input_file)
-
+        return np.stack([cached[key] if key in cached else computed[key] for key in keys]).astype(np.float32)
+    
+    def _predict_unique(self, phase, sequences, feature_cache=None):
+        """
+        Score each distinct sequence once and fan the outputs back out.
+        
+        feature_cache keeps the layout of `sequences` (one row per input), so it
+        can be shared with phases that see the same list or row subsets of it.
+        """
+        unique_sequences, first_index, inverse = deduplicate_sequences(sequences)
+        if len(unique_sequences) == len(sequences):
+            return self.predict_probabilities(phase, sequences, feature_cache)
+        
+        print(f"Deduplicated {len(sequences)} sequences to {len(unique_sequences)} unique "
+              f"({1 - len(unique_sequences) / len(sequences):.1%} duplicates)")
+        unique_cache = None
+        if feature_cache is not None:
+            unique_cache = {size: features[first_index] for size, features in feature_cache.items()}
+        predictions = self.predict_probabilities(phase, unique_sequences, unique_cache)
+        if feature_cache is not None:
+            for size, features in unique_cache.items():
+                feature_cache.setdefault(size, features[inverse])
+        return predictions[inverse]
+    
+    def _sequence_key(self, sequence, config):
+        # Keras phases only see the 20 standard residues, so key on the cleaned sequence
+        if config['type'] != 'pytorch_transformer':
+            sequence = re.sub('[^ARNDCQEGHILKMFPSTWYV]', '', sequence)
+        return hashlib.sha256(sequence.encode()).hexdigest()
+    
+    def model_files(self, phase):
+        """Files whose contents determine the predictions of a phase."""
+        config = self.models_config[phase]
+        if self.backend == 'onnx':
+            return [path for path in [self.onnx_model_path(phase)] if path.exists()]
+        export_dir = self.model_dir / EXPORTED_TRANSFORMER_DIR
+        if config['type'] == 'pytorch_transformer' and (export_dir / 'config.json').exists():
+            # load_transformer_model prefers the exported model when there is one
+            return sorted(export_dir.glob('*.safetensors'))
         if config['type'] == 'pytorch_transformer':
-            features = None 
+            candidates = [self.model_dir / 'config.pt',
+                          self.model_dir / 'model_state_dict_quantized.pt',
+                          self.model_dir / 'model_state_dict.pt']
         else:
-            features = self.extract_features(sequences, config['feature_size'])
+            primary = Path(config.get('_full_path', self.model_dir / config['file']))
+            candidates = [primary] if primary.exists() else \
+                [primary.with_name(config['file'].replace('_quantized.keras', '.keras'))]
+        return [path for path in candidates if path.exists()]
+    
+    def model_variant(self, phase):
+        """Name of the model variant a phase runs, '' for the model files as stored."""
+        if self.fast_esm and self.backend == 'native' and \
+                self.models_config[phase]['type'] == 'pytorch_transformer':
+            return 'int8-dynamic'
+        return ''
+    
+    def model_digest(self, phase):
+        """
+        SHA-256 over the model files and variant of a phase, memoized on size and mtime.
         
-        print(f"Making predictions using Phase {phase} model...")
+        With a prediction cache the per-file digests are stored in it, so a new
+        process does not rehash unchanged model files.
+        """
+        files = self.model_files(phase)
+        signature = tuple((str(path), path.stat().st_size, path.stat().st_mtime_ns) for path in files)
+        if self._model_digests.get(phase, (None,))[0] != signature:
+            if self.prediction_cache is not None:
+                digest = self.prediction_cache.files_digest(files)
+            else:
+                digest = file_digest(files)
+            self._model_digests[phase] = (signature, digest)
+        digest = self._model_digests[phase][1]
+        variant = self.model_variant(phase)
+        if variant:
+            # The quantized model gives slightly different outputs; cache them separately
+            digest = hashlib.sha256(f"{digest}:{variant}".encode()).hexdigest()
+        return digest
+    
+    def _run_model(self, phase, sequences, feature_cache=None):
+        """Featurize sequences and run the phase model, returning raw outputs."""
+        model = self.load_model(phase)
+        config = self.models_config[phase]
         
         if config['type'] == 'keras':
+            features = self.get_features(sequences, config['feature_size'], feature_cache)
             # Check if model expects 4D input (e.g., (None, 1, 2400, 1))
             expected_shape = None
             try:
@@ -393,148 +1088,205 @@ class COVIDClassifier:
             if expected_shape and len(expected_shape) == 4:
                 # Reshape features to (batch, 1, 2400, 1)
                 features = features.reshape((features.shape[0], 1, features.shape[1], 1))
-            predictions = model.predict(features, verbose=0)
-            
-            # Convert probabilities to class predictions
-            if predictions.shape[1] > 1:
-                predicted_classes = np.argmax(predictions, axis=1)
-                confidence_scores = np.max(predictions, axis=1)
-            else:
-                # Binary classification with custom thresholds
-                if custom_thresholds:
-                    # Use custom threshold for first class (index 0)
-                    threshold = custom_thresholds[config['classes'][0]]
-                    predicted_classes = (predictions >= threshold).astype(int).flatten()
-                    confidence_scores = np.where(predicted_classes == 1, 
-                                               predictions.flatten(), 
-                                               1 - predictions.flatten())
-                else:
-                    # Default 50% threshold
-                    predicted_classes = (predictions > 0.5).astype(int).flatten()
-                    confidence_scores = np.where(predicted_classes == 1, 
-                                               predictions.flatten(), 
-                                               1 - predictions.flatten())
+            return np.asarray(model.predict(features, verbose=0), dtype=np.float32)
                 
         elif config['type'] == 'pytorch':
+            import torch
+            features = self.get_features(sequences, config['feature_size'], feature_cache)
             with torch.no_grad():
                 features_tensor = torch.FloatTensor(features)
                 outputs = model(features_tensor)
-                
-                if hasattr(torch, 'softmax'):
-                    predictions = torch.softmax(outputs, dim=1).numpy()
-                else:
-                    predictions = torch.nn.functional.softmax(outputs, dim=1).numpy()
-                
-                predicted_classes = np.argmax(predictions, axis=1)
-                confidence_scores = np.max(predictions, axis=1)
+                return torch.softmax(outputs, dim=1).numpy()
                 
         elif config['type'] == 'pytorch_transformer':
+            if self.backend == 'onnx':
+                def score_batch(batch_sequences):
+                    input_ids, attention_mask = self.tokenize_sequences(batch_sequences, return_tensors='np')
+                    return softmax(model.logits(input_ids, attention_mask))
+            else:
+                import torch
+                # inference_mode also skips autograd's version counting, unlike no_grad
+                grad_mode = torch.inference_mode if self.fast_esm else torch.no_grad
+                
+                def score_batch(batch_sequences):
+                    input_ids, attention_mask = self.tokenize_sequences(batch_sequences)
+                    with grad_mode():
+                        outputs = model(input_ids=input_ids, attention_mask=attention_mask)
+                        logits = outputs.logits if hasattr(outputs, 'logits') else outputs
+                        probabilities = torch.softmax(logits, dim=1).numpy()
+                    # Clear GPU memory if available
+                    if torch.cuda.is_available():
+                        torch.cuda.empty_cache()
+                    return probabilities
+            
             # For ESM-2 transformer model, we need to tokenize sequences instead of using CKSAAP features
             print("Tokenizing sequences for ESM-2 transformer model...")
             
-            # Process in batches to avoid memory issues
-            batch_size = self.batch_size  # Use configurable batch size
-            predicted_classes = []
-            confidence_scores = []
-            all_predictions = []  # Store all predictions for probability display
+            # Length-sorted batches under a padded-token budget; results are
+            # scattered back so output rows keep the input order
+            sequences = SequenceBatch.from_strings(sequences)
+            batches, padding_ratio = plan_token_batches(sequences.lengths, self.max_tokens)
+            all_predictions = np.zeros((len(sequences), len(config['classes'])), dtype=np.float32)
             
-            print(f"Processing {len(sequences)} sequences in batches of {batch_size}")
+            print(f"Processing {len(sequences)} sequences in {len(batches)} batches "
+                  f"of at most {self.max_tokens} tokens (padding ratio: {padding_ratio:.1%})")
             
-            for i in range(0, len(sequences), batch_size):
-                batch_end = min(i + batch_size, len(sequences))
-                batch_sequences = sequences[i:batch_end]
-                batch_seq_ids = seq_ids[i:batch_end]
+            for batch_number, batch_index in enumerate(batches, 1):
+                batch_sequences = sequences.take(batch_index)
                 
-                print(f"Processing batch {i//batch_size + 1}/{(len(sequences) + batch_size - 1)//batch_size} "
-                      f"(sequences {i+1}-{batch_end})")
+                print(f"Processing batch {batch_number}/{len(batches)} ({len(batch_index)} sequences)")
                 
                 try:
-                    # Tokenize batch
-                    input_ids, attention_mask = self.tokenize_sequences(batch_sequences)
-                    
-                    with torch.no_grad():
-                        outputs = model(input_ids=input_ids, attention_mask=attention_mask)
-                        logits = outputs.logits if hasattr(outputs, 'logits') else outputs
-                        batch_predictions = torch.softmax(logits, dim=1).numpy()
-                        
-                        batch_pred_classes = np.argmax(batch_predictions, axis=1)
-                        batch_conf_scores = np.max(batch_predictions, axis=1)
-                        
-                        predicted_classes.extend(batch_pred_classes)
-                        confidence_scores.extend(batch_conf_scores)
-                        all_predictions.extend(batch_predictions)  # Store all predictions
-                        
-                        # Clear GPU memory if available
-                        if torch.cuda.is_available():
-                            torch.cuda.empty_cache()
-                            
+                    all_predictions[batch_index] = score_batch(batch_sequences)
                 except Exception as e:
-                    print(f"Error processing batch {i//batch_size + 1}: {e}")
-                    # Fill with default values for failed batch
-                    batch_size_actual = batch_end - i
-                    predicted_classes.extend([0] * batch_size_actual)
-                    confidence_scores.extend([0.0] * batch_size_actual)
-                    # Create dummy predictions for failed batch
-                    dummy_predictions = np.zeros((batch_size_actual, len(config['classes'])))
-                    dummy_predictions[:, 0] = 1.0  # Set first class to 100%
-                    all_predictions.extend(dummy_predictions)
-            
-            predicted_classes = np.array(predicted_classes)
-            confidence_scores = np.array(confidence_scores)
-            all_predictions = np.array(all_predictions)
-    
-        results = []
-        for i, (seq_id, pred_class, confidence) in enumerate(zip(seq_ids, predicted_classes, confidence_scores)):
-            class_name = config['classes'][pred_class] if pred_class < len(config['classes']) else 'Unknown'
-            
-            # Get probabilities for all classes
-            if config['type'] == 'keras':
-                if predictions.shape[1] > 1:
-                    # Multi-class: get probabilities for all classes
-                    all_probs = predictions[i]
-                else:
-                    # Binary: create [1-pred, pred] for [class0, class1]
-                    pred_val = predictions[i][0] if len(predictions[i]) == 1 else predictions[i][0]
-                    all_probs = [1 - pred_val, pred_val]
-            elif config['type'] == 'pytorch':
-                all_probs = predictions[i]
-            elif config['type'] == 'pytorch_transformer':
-                all_probs = all_predictions[i]
-            
-            # Create result row with all class probabilities
-            result_row = {
-                'Sequence_ID': seq_id,
-                'Predicted_Class': class_name,
-                'Confidence': f"{confidence:.2%}"
-            }
+                    print(f"Error processing batch {batch_number}: {e}")
+                    # Mark the failed batch; _assign_classes reports it as the first class at 0%
+                    all_predictions[batch_index] = np.nan
             
-            # Add probabilities for each class
-            for j, class_name_j in enumerate(config['classes']):
-                if j < len(all_probs):
-                    prob_value = all_probs[j]
-                    result_row[f'{class_name_j}_Probability'] = f"{prob_value:.2%}"
-                else:
-                    result_row[f'{class_name_j}_Probability'] = "0.00%"
+            self.last_padding_ratio = padding_ratio
+            return all_predictions
+
+        raise ValueError(f"Unsupported model type: {config['type']}")
+    
+    def _assign_classes(self, predictions, config, custom_thresholds=None):
+        """
+        Turn raw model outputs into class indices, confidences and per-class probabilities.
+        
+        Single-output binary models are thresholded (custom threshold of the first
+        class, or 50%); multi-output models use argmax. Rows that failed inference
+        (NaN) are reported as the first class with zero confidence.
+        """
+        failed = np.isnan(predictions).any(axis=1)
+        if failed.any():
+            predictions = predictions.copy()
+            predictions[failed] = 0.0
+            if predictions.shape[1] > 1:
+                predictions[failed, 0] = 1.0
+        
+        if predictions.shape[1] > 1:
+            predicted_classes = np.argmax(predictions, axis=1)
+            confidence_scores = np.max(predictions, axis=1)
+            class_probabilities = predictions
+        else:
+            flat = predictions.flatten()
+            if custom_thresholds:
+                # Use custom threshold for first class (index 0)
+                threshold = custom_thresholds[config['classes'][0]]
+                predicted_classes = (flat >= threshold).astype(int)
+            else:
+                # Default 50% threshold
+                predicted_classes = (flat > 0.5).astype(int)
+            confidence_scores = np.where(predicted_classes == 1, flat, 1 - flat)
+            # Binary: [1-pred, pred] for [class0, class1]
+            class_probabilities = np.column_stack([1 - flat, flat])
+        
+        confidence_scores = np.where(failed, 0.0, confidence_scores)
+        return predicted_classes, confidence_scores, class_probabilities
+    
+    def predict(self, phase, input_file, output_file=None, custom_thresholds=None,
+                sequences=None, seq_ids=None, feature_cache=None, prompt_thresholds=True,
+                chunk_size=None, probabilities=None):
+        """
+        Run one phase over a FASTA file or an already-read batch of sequences.
+        
+        Args:
+            phase: Phase number (1-5)
+            input_file: Input FASTA file (ignored when sequences are given)
+            output_file: Optional CSV file for the results
+            custom_thresholds: Thresholds for binary classification phases
+            sequences: Pre-read protein sequences; skips reading input_file
+            seq_ids: Sequence IDs matching sequences
+            feature_cache: Optional dict used to share CKSAAP features between phases
+            prompt_thresholds: Ask for binary thresholds interactively when none are given
+            chunk_size: Score input_file in chunks of this many records, appending each
+                chunk's rows to output_file; use predict_stream() to keep only one
+                chunk's results in memory
+            probabilities: Raw model outputs already computed for sequences (e.g. by the
+                fused Keras model); skips inference
             
-            results.append(result_row)
+        Returns:
+            DataFrame with one row per sequence
+        """
+        config = self.models_config[phase]
         
-
-        results_df = pd.DataFrame(results)
+        # Handle custom thresholds for binary classification
+        if custom_thresholds is None and prompt_thresholds and len(config['classes']) == 2:
+            custom_thresholds = self._get_binary_thresholds(phase, config)
         
-
-        print(f"\n{'='*60}")
-        print(f"PHASE {phase} RESULTS: {config['description']}")
-        print(f"{'='*60}")
-        print(results_df.to_string(index=False))
+        if chunk_size and sequences is None:
+            chunks = [results_df for _, results_df in self.predict_stream(
+                phase, input_file, chunk_size, custom_thresholds, output_file)]
+            if output_file:
+                print(f"\nResults saved to: {output_file}")
+            if not chunks:
+                return self._empty_results(phase)
+            return pd.concat(chunks, ignore_index=True)
+        
+        if sequences is None:
+            sequences, seq_ids = self.read_sequences(input_file)
+        
+        if probabilities is None:
+            print(f"Making predictions using Phase {phase} model...")
+            predictions = self._predict_unique(phase, sequences, feature_cache)
+        else:
+            predictions = probabilities
+        predicted_classes, confidence_scores, class_probabilities = \
+            self._assign_classes(predictions, config, custom_thresholds)
+        results_df = self._results_frame(config['classes'], seq_ids, predicted_classes,
+                                         confidence_scores, class_probabilities)
+        self._print_results(phase, config, results_df)
         
-
         if output_file:
-            results_df.to_csv(output_file, index=False)
+            self.write_results(results_df, output_file)
             print(f"\nResults saved to: {output_file}")
         
         return results_df
     
-    def _get_binary_thresholds(self, phase, config):
+    @staticmethod
+    def _results_frame(classes, seq_ids, predicted_classes, confidence_scores, class_probabilities):
+        """
+        Build a phase's results column by column from the prediction arrays.
+        
+        Confidence and the per-class probabilities are fractions between 0 and 1;
+        write_results formats them as percentages.
+        """
+        # Class indices outside the class list (more model outputs than classes) map to 'Unknown'
+        names = np.asarray(list(classes) + ['Unknown'], dtype=object)
+        columns = {
+            'Sequence_ID': list(seq_ids),
+            'Predicted_Class': names[np.minimum(predicted_classes, len(classes))],
+            'Confidence': np.asarray(confidence_scores)
+        }
+        for j, class_name in enumerate(classes):
+            if j < class_probabilities.shape[1]:
+                columns[f'{class_name}_Probability'] = class_probabilities[:, j]
+            else:
+                columns[f'{class_name}_Probability'] = np.zeros(len(class_probabilities),
+                                                                dtype=class_probabilities.dtype)
+        return pd.DataFrame(columns)
+    
+    def _print_results(self, phase, config, results_df):
+        """Print class counts and the first RESULTS_PREVIEW_ROWS rows of a phase's results."""
+        print(f"\n{'='*60}")
+        print(f"PHASE {phase} RESULTS: {config['description']}")
+        print(f"{'='*60}")
+        summary = results_df.groupby('Predicted_Class', sort=False)['Confidence'].agg(['size', 'mean'])
+        for class_name, (count, mean_confidence) in summary.sort_values('size', ascending=False).iterrows():
+            print(f"{class_name}: {int(count)} sequences (mean confidence {mean_confidence:.2%})")
+        if len(results_df):
+            print()
+            print(format_percentages(results_df.head(RESULTS_PREVIEW_ROWS)).to_string(index=False))
+        if len(results_df) > RESULTS_PREVIEW_ROWS:
+            print(f"... {len(results_df) - RESULTS_PREVIEW_ROWS} more rows")
+    
+    def write_results(self, results_df, path, mode='w', header=True):
+        """Write a results frame to CSV, as percentages unless percentages=False."""
+        if self.percentages:
+            results_df = format_percentages(results_df)
+        results_df.to_csv(path, mode=mode, header=header, index=False)
+    
+    @staticmethod
+    def _get_binary_thresholds(phase, config):
         """
         Get custom thresholds for binary classification phases from user input.
         
@@ -592,7 +1344,8 @@ class COVIDClassifier:
         
         return thresholds
     
-    def run_all_phases(self, input_file, output_dir=None, base_filename=None):
+    def run_all_phases(self, input_file, output_dir=None, base_filename=None,
+                       cascade=False, thresholds=None, chunk_size=None):
         """
         Run all phases of the COVID classifier pipeline and save results separately.
         
@@ -600,9 +1353,18 @@ class COVIDClassifier:
             input_file: Input FASTA file
             output_dir: Directory to save results (default: current directory)
             base_filename: Base filename for output files (default: input filename without extension)
+            cascade: Only forward sequences predicted as the phase's 'cascade_class'
+                to the next phase, and write a merged per-sequence table
+            thresholds: Optional dict mapping phase to binary-classification thresholds;
+                phases without an entry are asked for interactively before the run starts
+            chunk_size: Stream the input in chunks of this many records, appending to the
+                output CSVs as each chunk finishes, so memory stays bounded by the chunk
+                size; None reads the whole file at once
             
         Returns:
-            Dictionary containing results from all phases
+            Dictionary containing results from all phases (plus the merged table under
+            'cascade' when cascade is enabled). When streaming, each phase maps to a
+            Series of predicted-class counts and 'cascade' to the merged CSV path.
         """
         if output_dir is None:
             output_dir = Path.cwd()
@@ -613,65 +1375,278 @@ class COVIDClassifier:
         if base_filename is None:
             base_filename = Path(input_file).stem
         
-        all_results = {}
-        
         print(f"\n{'='*80}")
         print("RUNNING COMPLETE COVID CLASSIFICATION PIPELINE")
         print(f"{'='*80}")
         print(f"Input file: {input_file}")
         print(f"Output directory: {output_dir}")
         print(f"Base filename: {base_filename}")
+        if chunk_size:
+            print(f"Streaming in chunks of {chunk_size} sequences")
         print(f"{'='*80}\n")
         
-        # Process sequences once (nucleotide conversion if needed)
+        # Resolve binary thresholds once, before any sequences are scored; an entry of
+        # None means the default 50% threshold
+        thresholds = dict(thresholds or {})
+        for phase, config in self.models_config.items():
+            if len(config['classes']) == 2 and phase not in thresholds:
+                thresholds[phase] = self._get_binary_thresholds(phase, config)
+        
+        phase_files = {phase: output_dir / f"{base_filename}_phase_{phase}_results.csv"
+                       for phase in self.models_config}
+        cascade_file = output_dir / f"{base_filename}_cascade_results.csv"
+        
         try:
-            processed_file, was_converted = self.process_input_sequences(input_file)
-            if was_converted:
-                print(f"Using converted protein sequences from: {processed_file}")
-                working_file = processed_file
+            if chunk_size:
+                all_results, run_stats, cascade_counts = self._run_all_phases_streaming(
+                    input_file, phase_files, cascade_file, cascade, thresholds, chunk_size)
             else:
-                working_file = input_file
+                all_results, run_stats, cascade_counts = self._run_all_phases_in_memory(
+                    input_file, phase_files, cascade_file, cascade, thresholds)
         except Exception as e:
-            print(f"Warning: Sequence processing failed: {e}")
-            print("Proceeding with original input file...")
-            working_file = input_file
+            # Phase errors are caught per phase, so this is an unreadable or empty input:
+            # report every phase as failed and still write the summary
+            print(f"Error reading input: {e}")
+            all_results = {phase: None for phase in self.models_config}
+            run_stats, cascade_counts = {}, None
+        
+        if self.last_padding_ratio is not None:
+            run_stats['Phase 5 padding ratio'] = f"{self.last_padding_ratio:.1%}"
+        if self.resource_plan is not None:
+            run_stats['Resources'] = self.resource_plan.describe()
+        if self.prediction_cache is not None:
+            cache_stats = self.prediction_cache.stats()
+            run_stats['Prediction cache'] = (f"{cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+                                             f"{cache_stats['entries']} entries")
+        
+        # Generate summary report
+        summary_file = output_dir / f"{base_filename}_pipeline_summary.txt"
+        self._generate_pipeline_summary(all_results, summary_file, input_file, run_stats,
+                                        cascade_counts)
+        
+        print(f"\n{'='*80}")
+        print("PIPELINE COMPLETED")
+        print(f"{'='*80}")
+        print(f"Summary report saved to: {summary_file}")
+        print(f"Individual phase results saved to: {output_dir}")
+        print(f"{'='*80}")
+        
+        return all_results
+    
+    def _run_all_phases_in_memory(self, input_file, phase_files, cascade_file, cascade, thresholds):
+        """Read the whole input, run every phase once and write each phase's CSV."""
+        # Parse, detect and convert once; every phase gets the same in-memory batch
+        # and the Keras phases share its CKSAAP features
+        _, sequences, seq_ids = self.ingest_sequences(input_file)
+        run_stats = self._sequence_stats(len(sequences), len(set(sequences)))
+        
+        all_results, merged = self._run_phase_batch(sequences, seq_ids, thresholds, cascade)
+        for phase, results_df in all_results.items():
+            if results_df is not None:
+                self.write_results(results_df, phase_files[phase])
+                print(f"Phase {phase} results saved to: {phase_files[phase]}")
+        
+        cascade_counts = None
+        if cascade:
+            self.write_results(merged, cascade_file)
+            all_results['cascade'] = merged
+            cascade_counts = {
+                phase: ((merged[f'Phase_{phase}_Prediction'] != self.NOT_EVALUATED).sum(), len(merged))
+                for phase in self.models_config
+            }
+            print(f"\nMerged cascade results saved to: {cascade_file}")
+        
+        return all_results, run_stats, cascade_counts
+    
+    def _run_all_phases_streaming(self, input_file, phase_files, cascade_file, cascade,
+                                  thresholds, chunk_size):
+        """Run every phase chunk by chunk, appending to the CSVs and keeping only class counts."""
+        class_counts = {phase: pd.Series(dtype=np.int64) for phase in self.models_config}
+        failed = set()
+        evaluated = {phase: 0 for phase in self.models_config}
+        total = 0
+        first_chunk = True
+        # Duplicates are counted within each chunk, as inference deduplicates them, so
+        # memory stays bounded by the chunk size rather than the number of unique sequences
+        unique_in_chunks = 0
+        
+        phases = sorted(self.models_config)
+        
+        def featurize(chunk):
+            nonlocal unique_in_chunks
+            records, sequences, seq_ids = chunk
+            unique_in_chunks += len(set(sequences))
+            return sequences, seq_ids, self._prefetch_features(sequences, phases)
+        
+        def infer(chunk):
+            sequences, seq_ids, feature_cache = chunk
+            chunk_results, merged = self._run_phase_batch(sequences, seq_ids, thresholds, cascade,
+                                                          skip_phases=failed,
+                                                          feature_cache=feature_cache)
+            # A phase that fails once is reported as failed for the whole run
+            failed.update(phase for phase, results_df in chunk_results.items() if results_df is None)
+            return len(sequences), chunk_results, merged
+        
+        # Parsing and conversion (one Prodigal shard at a time), featurization and inference
+        # each run in their own thread on consecutive chunks; this thread only writes results
+        for chunk_count, chunk_results, merged in staged_pipeline(
+                self.iter_sequence_chunks(input_file, chunk_size),
+                [featurize, infer],
+                maxsize=PIPELINE_QUEUE_SIZE):
+            total += chunk_count
+            print(f"\nStreaming chunk written: sequences {total - chunk_count + 1}-{total}")
+            mode = 'w' if first_chunk else 'a'
+            for phase, results_df in chunk_results.items():
+                if results_df is None:
+                    continue
+                self.write_results(results_df, phase_files[phase], mode=mode, header=first_chunk)
+                class_counts[phase] = class_counts[phase].add(
+                    results_df['Predicted_Class'].value_counts(), fill_value=0).astype(np.int64)
+                evaluated[phase] += len(results_df)
+            if cascade:
+                self.write_results(merged, cascade_file, mode=mode, header=first_chunk)
+            first_chunk = False
+        if total == 0:
+            raise ValueError(f"No sequences found in {input_file}")
+        
+        all_results = {phase: None if phase in failed else counts
+                       for phase, counts in class_counts.items()}
+        cascade_counts = None
+        if cascade:
+            all_results['cascade'] = str(cascade_file)
+            cascade_counts = {phase: (evaluated[phase], total) for phase in self.models_config}
+            print(f"\nMerged cascade results saved to: {cascade_file}")
+        print(f"Phase results appended to: {', '.join(str(f) for f in phase_files.values())}")
+        
+        run_stats = self._sequence_stats(total, unique_in_chunks, scope=' within chunks')
+        run_stats['Chunk size'] = chunk_size
+        return all_results, run_stats, cascade_counts
+    
+    @staticmethod
+    def _sequence_stats(total, unique, scope=''):
+        """Run statistics on input size and duplicate sequences (counted over scope)."""
+        return {
+            'Sequences': total,
+            f'Unique sequences{scope}': unique,
+            f'Dedup ratio{scope}': f"{1 - unique / total:.1%} duplicates" if total else "n/a",
+        }
+    
+    def _empty_results(self, phase):
+        """Zero-row results frame with the same columns predict() produces for the phase."""
+        classes = self.models_config[phase]['classes']
+        return pd.DataFrame(columns=['Sequence_ID', 'Predicted_Class', 'Confidence'] +
+                            [f'{class_name}_Probability' for class_name in classes])
+    
+    def _run_phase_batch(self, sequences, seq_ids, thresholds, cascade, skip_phases=(),
+                         feature_cache=None):
+        """
+        Run every phase over one batch of sequences, sharing CKSAAP features between phases.
+        
+        Args:
+            sequences: Protein sequences of the batch
+            seq_ids: Sequence IDs matching sequences
+            thresholds: Dict mapping binary phases to their thresholds
+            cascade: Forward only sequences predicted as each phase's 'cascade_class'
+            skip_phases: Phases to report as failed without running them
+            feature_cache: Optional features already computed for the whole batch
+            
+        Returns:
+            Tuple of (phase_results, merged) where phase_results maps each phase to its
+            results DataFrame (None if it failed) and merged is the per-sequence cascade
+            table (None unless cascade is set)
+        """
+        phase_results = {}
+        feature_cache = {} if feature_cache is None else feature_cache
+        sequences = SequenceBatch.from_strings(sequences, seq_ids)
+        
+        # In cascade mode only the positions in `active` reach the next phase
+        active = np.arange(len(sequences))
+        merged = pd.DataFrame({'Sequence_ID': seq_ids}) if cascade else None
+        
+        # The fused model scores every Keras phase for the whole batch at once; cascade
+        # mode then takes the rows of the sequences that reach each phase. Cached runs
+        # keep per-phase inference so that cache hits skip the models entirely
+        fused_outputs = {}
+        if self.fused and self.backend == 'native' and self.prediction_cache is None and len(sequences):
+            try:
+                fused_outputs = self.fused_probabilities(sequences, feature_cache)
+            except Exception as e:
+                print(f"Fused Keras model unavailable, running phases separately: {e}")
         
         # Run through all phases
         for phase in sorted(self.models_config.keys()):
+            config = self.models_config[phase]
             try:
                 print(f"\n{'='*60}")
-                print(f"RUNNING PHASE {phase}: {self.models_config[phase]['description']}")
+                print(f"RUNNING PHASE {phase}: {config['description']}")
                 print(f"{'='*60}")
                 
-                # Generate output filename for this phase
-                phase_output_file = output_dir / f"{base_filename}_phase_{phase}_results.csv"
+                if cascade:
+                    # Both columns exist before anything can fail, so every chunk of a
+                    # streamed cascade table has the same layout
+                    merged[f'Phase_{phase}_Prediction'] = self.NOT_EVALUATED
+                    # Object dtype: holds numeric confidences next to the placeholder
+                    merged[f'Phase_{phase}_Confidence'] = pd.Series(self.NOT_EVALUATED, index=merged.index,
+                                                                    dtype=object)
+                
+                if phase in skip_phases:
+                    raise RuntimeError("phase failed on an earlier chunk")
+                
+                phase_probabilities = fused_outputs.get(phase)
+                if cascade:
+                    print(f"Cascade: {len(active)}/{len(sequences)} sequences forwarded to Phase {phase}")
+                    if len(active) == 0:
+                        phase_results[phase] = self._empty_results(phase)
+                        continue
+                    phase_sequences = sequences.take(active)
+                    phase_seq_ids = [seq_ids[i] for i in active]
+                    phase_cache = {size: features[active] for size, features in feature_cache.items()}
+                    if phase_probabilities is not None:
+                        phase_probabilities = phase_probabilities[active]
+                else:
+                    phase_sequences, phase_seq_ids, phase_cache = sequences, seq_ids, feature_cache
                 
                 # Run prediction for this phase
-                results_df = self.predict(phase, working_file, str(phase_output_file))
-                all_results[phase] = results_df
+                results_df = self.predict(phase, None,
+                                          custom_thresholds=thresholds.get(phase),
+                                          sequences=phase_sequences, seq_ids=phase_seq_ids,
+                                          feature_cache=phase_cache, prompt_thresholds=False,
+                                          probabilities=phase_probabilities)
+                phase_results[phase] = results_df
+                
+                if cascade:
+                    # Keep the full-batch matrix so later phases can subset it
+                    if len(active) == len(sequences):
+                        feature_cache.update(phase_cache)
+                    merged.loc[active, f'Phase_{phase}_Prediction'] = results_df['Predicted_Class'].values
+                    merged.loc[active, f'Phase_{phase}_Confidence'] = results_df['Confidence'].values
+                    if 'cascade_class' in config:
+                        active = active[results_df['Predicted_Class'].values == config['cascade_class']]
                 
                 print(f"Phase {phase} completed successfully!")
-                print(f"Results saved to: {phase_output_file}")
                 
             except Exception as e:
                 print(f"Error in Phase {phase}: {e}")
-                all_results[phase] = None
+                phase_results[phase] = None
+                if cascade:
+                    merged.loc[active, f'Phase_{phase}_Prediction'] = 'ERROR'
+                    merged.loc[active, f'Phase_{phase}_Confidence'] = 'ERROR'
+                    active = active[:0]
                 continue
         
-        # Generate summary report
-        summary_file = output_dir / f"{base_filename}_pipeline_summary.txt"
-        self._generate_pipeline_summary(all_results, summary_file, input_file)
-        
-        print(f"\n{'='*80}")
-        print("PIPELINE COMPLETED")
-        print(f"{'='*80}")
-        print(f"Summary report saved to: {summary_file}")
-        print(f"Individual phase results saved to: {output_dir}")
-        print(f"{'='*80}")
-        
-        return all_results
+        if cascade:
+            merged = merged.reindex(columns=self._cascade_columns())
+        return phase_results, merged
     
-    def _generate_pipeline_summary(self, all_results, summary_file, input_file):
+    def _cascade_columns(self):
+        """Columns of the merged cascade table, in order."""
+        columns = ['Sequence_ID']
+        for phase in sorted(self.models_config):
+            columns += [f'Phase_{phase}_Prediction', f'Phase_{phase}_Confidence']
+        return columns
+    
+    def _generate_pipeline_summary(self, all_results, summary_file, input_file, run_stats=None,
+                                   cascade_counts=None):
         """Generate a summary report of all pipeline phases."""
         with open(summary_file, 'w') as f:
             f.write("COVID CLASSIFICATION PIPELINE SUMMARY REPORT\n")
@@ -679,19 +1654,32 @@ class COVIDClassifier:
             f.write(f"Input file: {input_file}\n")
             f.write(f"Generated: {pd.Timestamp.now()}\n\n")
             
+            if run_stats:
+                f.write("RUN STATISTICS:\n")
+                f.write("-" * 30 + "\n")
+                for name, value in run_stats.items():
+                    f.write(f"{name}: {value}\n")
+                f.write("\n")
+            
             f.write("PHASE RESULTS SUMMARY:\n")
             f.write("-" * 30 + "\n")
             
             for phase, results in all_results.items():
+                if phase == 'cascade':
+                    continue
                 if results is not None:
                     config = self.models_config[phase]
+                    # Streaming runs keep only the class counts
+                    if isinstance(results, pd.DataFrame):
+                        class_counts = results['Predicted_Class'].value_counts()
+                    else:
+                        class_counts = results.sort_values(ascending=False)
                     f.write(f"\nPhase {phase}: {config['description']}\n")
                     f.write(f"Status: Completed\n")
                     f.write(f"Classes: {', '.join(config['classes'])}\n")
-                    f.write(f"Sequences processed: {len(results)}\n")
+                    f.write(f"Sequences processed: {int(class_counts.sum())}\n")
                     
                     # Count predictions for each class
-                    class_counts = results['Predicted_Class'].value_counts()
                     f.write("Predictions:\n")
                     for class_name, count in class_counts.items():
                         f.write(f"  {class_name}: {count}\n")
@@ -699,6 +1687,13 @@ class COVIDClassifier:
                     f.write(f"\nPhase {phase}: FAILED\n")
                     f.write(f"Status: Error occurred during processing\n")
             
+            if cascade_counts:
+                f.write("\nCASCADE MODE:\n")
+                f.write("-" * 30 + "\n")
+                for phase in sorted(cascade_counts):
+                    evaluated, total = cascade_counts[phase]
+                    f.write(f"Phase {phase}: {evaluated}/{total} sequences evaluated\n")
+            
             f.write(f"\n{'='*50}\n")
             f.write("End of Report\n")
     
@@ -805,6 +1800,10 @@ def main():
     parser.add_argument('--prodigal-path', 
                        help='Path to Prodigal executable for nucleotide conversion')
     
+    parser.add_argument('--converter', choices=CONVERTERS, default='auto',
+                       help='Nucleotide-to-protein converter: Prodigal, the built-in ORF '
+                            'translator, or auto (Prodigal when installed)')
+    
     parser.add_argument('--no-auto-convert', action='store_true',
                        help='Disable automatic nucleotide to protein conversion')
     
@@ -828,33 +1827,21 @@ def main():
         print(f"Warning: Input file should have one of these extensions: {valid_extensions}")
     
     try:
-        classifier = COVIDClassifier(args.model_dir, args.prodigal_path)
-        
-        # Process sequences if requested
-        if args.force_convert or not args.no_auto_convert:
-            try:
-                processed_file, was_converted = classifier.process_input_sequences(
-                    args.input_file, force_conversion=args.force_convert
-                )
-                if was_converted:
-                    print(f"Using converted protein sequences from: {processed_file}")
-                    input_file = processed_file
-                else:
-                    input_file = args.input_file
-            except Exception as e:
-                print(f"Warning: Sequence processing failed: {e}")
-                print("Proceeding with original input file...")
-                input_file = args.input_file
-        else:
-            input_file = args.input_file
+        classifier = COVIDClassifier(args.model_dir, args.prodigal_path, converter=args.converter)
         
+        # Each path below reads, detects and converts the input exactly once
         if args.run_all:
             # Run complete pipeline
-            classifier.run_all_phases(input_file, args.output_dir)
+            classifier.run_all_phases(args.input_file, args.output_dir)
         elif args.phase:
-            classifier.predict(args.phase, input_file, args.output)
+            _, sequences, seq_ids = classifier.ingest_sequences(
+                args.input_file, auto_convert=not args.no_auto_convert,
+                force_conversion=args.force_convert
+            )
+            classifier.predict(args.phase, args.input_file, args.output,
+                               sequences=sequences, seq_ids=seq_ids)
         else:
-            classifier.interactive_mode(input_file)
+            classifier.interactive_mode(args.input_file)
             
     except Exception as e:
         print(f"Error: {str(e)}")
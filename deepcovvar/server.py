@@ -0,0 +1,309 @@
+"""
+Warm inference daemon for DeepCovVar.
+
+`deepcovvar serve` keeps one COVIDClassifier with its models loaded and answers
+requests over a Unix domain socket (or a localhost TCP port), so repeated CLI
+runs skip the TensorFlow/torch import and model loading cost.
+
+Protocol: one JSON object per line in each direction, one request per connection.
+
+    {"command": "predict", "phase": 1, "fasta": ">id\\nMKT..."}      # or "fasta_path",
+    {"command": "predict", "phase": 4, "sequences": [...], "ids": [...]}   # or "sequences"/"ids"
+    {"command": "run_all_phases", "input_file": "...", "output_dir": "...", "cascade": false,
+     "percentages": true}
+    {"command": "ping"}
+
+Binary phases use "phase_thresholds" ({phase: {class: fraction} or null}) when given,
+else "thresholds": [CLASS1_PERCENT, CLASS2_PERCENT], else the default 50% threshold
+(a daemon cannot prompt; the CLI prompts before forwarding). Predict results carry
+confidences and probabilities as fractions; run_all_phases writes them to its CSVs as
+percentages unless "percentages" is false.
+
+A daemon answers ping with the options it was started with (model directory, backend,
+converter, ...) and the classes of each phase. A request carrying "options" is rejected
+when they differ from the daemon's, so results never silently come from another
+configuration.
+
+Over TCP every request must carry "token", the shared secret the daemon writes to
+~/.deepcovvar/serve.token (or $DEEPCOVVAR_TOKEN_FILE) with owner-only permissions;
+clients on the same account read it from there, or from $DEEPCOVVAR_TOKEN. Any local
+user can connect to a TCP port, and requests name files to read and directories to
+write, so requests without the token are refused. The Unix socket is already
+restricted to its owner by its file mode.
+"""
+
+import hmac
+import io
+import json
+import logging
+import os
+import secrets
+import socket
+import socketserver
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from Bio import SeqIO
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOCKET = os.environ.get(
+    'DEEPCOVVAR_SOCKET', str(Path.home() / '.deepcovvar' / 'serve.sock')
+)
+DEFAULT_TOKEN_FILE = os.environ.get(
+    'DEEPCOVVAR_TOKEN_FILE', str(Path.home() / '.deepcovvar' / 'serve.token')
+)
+
+
+def load_token(token_file: Optional[str] = None) -> Optional[str]:
+    """The TCP shared secret from $DEEPCOVVAR_TOKEN or the token file, None when neither is set."""
+    if os.environ.get('DEEPCOVVAR_TOKEN'):
+        return os.environ['DEEPCOVVAR_TOKEN']
+    path = Path(token_file or DEFAULT_TOKEN_FILE)
+    if not path.exists():
+        return None
+    return path.read_text().strip() or None
+
+
+def create_token(token_file: Optional[str] = None) -> str:
+    """
+    Token for a TCP daemon: $DEEPCOVVAR_TOKEN when set, else a new random one
+    written to the token file, readable by its owner only.
+    """
+    if os.environ.get('DEEPCOVVAR_TOKEN'):
+        return os.environ['DEEPCOVVAR_TOKEN']
+    path = Path(token_file or DEFAULT_TOKEN_FILE)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    token = secrets.token_hex(32)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w') as handle:
+        handle.write(token + '\n')
+    os.chmod(path, 0o600)
+    return token
+
+
+def thresholds_for_phase(config: Dict, thresholds: Optional[list]) -> Optional[Dict[str, float]]:
+    """Map [CLASS1_PERCENT, CLASS2_PERCENT] onto a binary phase's classes."""
+    if not thresholds or len(config['classes']) != 2:
+        return None
+    return {
+        config['classes'][0]: float(thresholds[0]) / 100.0,
+        config['classes'][1]: float(thresholds[1]) / 100.0
+    }
+
+
+def option_mismatches(requested: Dict, configured: Optional[Dict]) -> List[str]:
+    """Descriptions of the requested options that differ from a daemon's configuration."""
+    if configured is None:
+        return []
+    return [f"{name}={value!r} (daemon: {configured.get(name)!r})"
+            for name, value in sorted(requested.items()) if configured.get(name) != value]
+
+
+def _phase_thresholds(request: Dict, phase: int, config: Dict) -> Optional[Dict[str, float]]:
+    """Thresholds of one phase: per-phase entries first, then the shared percentages."""
+    if 'phase_thresholds' in request:
+        return request['phase_thresholds'].get(str(phase))
+    return thresholds_for_phase(config, request.get('thresholds'))
+
+
+def handle_request(classifier, request: Dict, options: Optional[Dict] = None) -> Dict:
+    """
+    Execute one decoded request against a loaded classifier.
+
+    Args:
+        classifier: Loaded COVIDClassifier
+        request: Decoded request
+        options: Options the daemon was started with; requests whose "options"
+            differ are rejected (None skips the check)
+    """
+    command = request.get('command', 'predict')
+
+    if command == 'ping':
+        return {
+            'status': 'ok',
+            'loaded_phases': sorted(classifier.loaded_models),
+            'options': options,
+            'phases': {str(phase): {'classes': config['classes'],
+                                    'description': config.get('description', '')}
+                       for phase, config in classifier.models_config.items()},
+        }
+
+    mismatches = option_mismatches(request.get('options') or {}, options)
+    if mismatches:
+        raise ValueError(f"Request options differ from the daemon's: {', '.join(mismatches)}")
+
+    if command == 'predict':
+        phase = int(request['phase'])
+        if 'sequences' in request:
+            records = list(zip(request.get('ids') or
+                               [f"seq_{i + 1}" for i in range(len(request['sequences']))],
+                               request['sequences']))
+        else:
+            handle = open(request['fasta_path']) if 'fasta_path' in request \
+                else io.StringIO(request['fasta'])
+            with handle:
+                records = [(record.id, str(record.seq)) for record in SeqIO.parse(handle, 'fasta')]
+        if not records:
+            raise ValueError("No sequences found in request")
+
+        _, sequences, seq_ids = classifier._prepare_chunk(records, auto_convert=True)
+        results_df = classifier.predict(
+            phase, None,
+            custom_thresholds=_phase_thresholds(request, phase, classifier.models_config[phase]),
+            sequences=sequences, seq_ids=seq_ids, prompt_thresholds=False
+        )
+        return {'status': 'ok', 'results': results_df.to_dict(orient='records')}
+
+    if command == 'run_all_phases':
+        thresholds = {
+            phase: _phase_thresholds(request, phase, config)
+            for phase, config in classifier.models_config.items()
+            if len(config['classes']) == 2
+        }
+        percentages = classifier.percentages
+        classifier.percentages = request.get('percentages', True)
+        try:
+            all_results = classifier.run_all_phases(
+                request['input_file'],
+                output_dir=request.get('output_dir'),
+                base_filename=request.get('base_filename'),
+                cascade=request.get('cascade', False),
+                thresholds=thresholds
+            )
+        finally:
+            classifier.percentages = percentages
+        completed = [phase for phase, results in all_results.items()
+                     if phase != 'cascade' and results is not None]
+        return {'status': 'ok', 'completed_phases': completed}
+
+    raise ValueError(f"Unknown command: {command}")
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+        try:
+            request = json.loads(line)
+            token = self.server.token
+            if token is not None and not hmac.compare_digest(
+                    str(request.pop('token', '')).encode(), token.encode()):
+                raise PermissionError("Missing or invalid daemon token")
+            # Models and tokenizer are shared, so inference is serialized
+            with self.server.inference_lock:
+                response = handle_request(self.server.classifier, request, self.server.options)
+        except PermissionError as e:
+            logger.warning(f"Rejected request from {self.client_address}: {e}")
+            response = {'status': 'error', 'error': str(e)}
+        except Exception as e:
+            logger.exception("Request failed")
+            response = {'status': 'error', 'error': str(e)}
+        self.wfile.write((json.dumps(response, default=str) + '\n').encode())
+
+
+class UnixInferenceServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class TCPInferenceServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def create_server(classifier, socket_path: Optional[str] = None,
+                  host: Optional[str] = None, port: Optional[int] = None,
+                  options: Optional[Dict] = None, token: Optional[str] = None):
+    """
+    Bind a server around a classifier.
+
+    Args:
+        classifier: COVIDClassifier with any models to keep warm already loaded
+        socket_path: Unix socket path (default: DEFAULT_SOCKET); ignored when port is set
+        host: TCP host when serving over a port (default: 127.0.0.1)
+        port: TCP port; serve over localhost TCP instead of a Unix socket
+        options: Options the daemon was started with, reported by ping and checked
+            against the "options" of every request
+        token: Shared secret every request must carry; required with port
+
+    Returns:
+        A socketserver instance; call serve_forever() on it
+
+    Raises:
+        ValueError: If port is set without a token
+    """
+    if port is not None:
+        if not token:
+            raise ValueError("Serving over TCP requires a token (see create_token)")
+        server = TCPInferenceServer((host or '127.0.0.1', port), _RequestHandler)
+    else:
+        socket_path = Path(socket_path or DEFAULT_SOCKET)
+        socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if socket_path.exists():
+            if daemon_available(str(socket_path)):
+                raise RuntimeError(f"A DeepCovVar daemon is already listening on {socket_path}")
+            socket_path.unlink()  # stale socket from a previous run
+        server = UnixInferenceServer(str(socket_path), _RequestHandler)
+        os.chmod(socket_path, 0o600)
+    server.classifier = classifier
+    server.options = options
+    server.token = token
+    server.inference_lock = threading.Lock()
+    return server
+
+
+def _connect(socket_path: Optional[str] = None, host: Optional[str] = None,
+             port: Optional[int] = None, timeout: Optional[float] = None):
+    if port is not None:
+        return socket.create_connection((host or '127.0.0.1', port), timeout=timeout)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    sock.connect(socket_path or DEFAULT_SOCKET)
+    return sock
+
+
+def send_request(request: Dict, socket_path: Optional[str] = None, host: Optional[str] = None,
+                 port: Optional[int] = None, timeout: Optional[float] = None,
+                 token: Optional[str] = None) -> Dict:
+    """
+    Send one request to a running daemon and return its decoded response.
+
+    Over TCP the request carries token, by default the one from load_token().
+
+    Raises:
+        RuntimeError: If the daemon reports an error
+    """
+    if port is not None:
+        token = token or load_token()
+        if token:
+            request = dict(request, token=token)
+    with _connect(socket_path, host, port, timeout) as sock:
+        sock.sendall((json.dumps(request) + '\n').encode())
+        sock.shutdown(socket.SHUT_WR)
+        with sock.makefile('rb') as reader:
+            response = json.loads(reader.readline())
+    if response.get('status') != 'ok':
+        raise RuntimeError(f"DeepCovVar daemon error: {response.get('error')}")
+    return response
+
+
+def daemon_info(socket_path: Optional[str] = None, host: Optional[str] = None,
+                port: Optional[int] = None) -> Optional[Dict]:
+    """A running daemon's ping response (options, phases), or None when none answers."""
+    if port is None and not hasattr(socket, 'AF_UNIX'):
+        return None
+    if port is None and not Path(socket_path or DEFAULT_SOCKET).exists():
+        return None
+    try:
+        return send_request({'command': 'ping'}, socket_path, host, port, timeout=2.0)
+    except (OSError, ValueError, RuntimeError):
+        return None
+
+
+def daemon_available(socket_path: Optional[str] = None, host: Optional[str] = None,
+                     port: Optional[int] = None) -> bool:
+    """True when a daemon answers a ping on the given socket or port."""
+    return daemon_info(socket_path, host, port) is not None
@@ -19,18 +19,25 @@ def run_test_script(script_path):
             print("STDERR:")
             print(result.stderr)
         
-        success = result.returncode == 0
-        status = "PASSED" if success else "FAILED"
+        # pytest.importorskip ends the script with "Skipped: ..." when an optional
+        # dependency is missing
+        stderr_lines = result.stderr.strip().splitlines()
+        if result.returncode == 0:
+            status = "PASSED"
+        elif stderr_lines and stderr_lines[-1].startswith("Skipped:"):
+            status = "SKIPPED"
+        else:
+            status = "FAILED"
         print(f"\nResult: {status}")
         
-        return success
+        return status
         
     except subprocess.TimeoutExpired:
         print(f"Test {script_path.name} timed out after 60 seconds")
-        return False
+        return "FAILED"
     except Exception as e:
         print(f"Error running {script_path.name}: {e}")
-        return False
+        return "FAILED"
 
 def main():
     print("DeepCovVar Test Suite")
@@ -41,7 +48,25 @@ def main():
     test_scripts = [
         tests_dir / "test_nucleotide_detection.py",
         tests_dir / "test_pipeline_integration.py",
-        tests_dir / "test_deepcovvar.py"
+        tests_dir / "test_deepcovvar.py",
+        tests_dir / "test_cksaap_vectorized.py",
+        tests_dir / "test_token_batching.py",
+        tests_dir / "test_prediction_cache.py",
+        tests_dir / "test_deduplication.py",
+        tests_dir / "test_server.py",
+        tests_dir / "test_staged_pipeline.py",
+        tests_dir / "test_fused_keras.py",
+        tests_dir / "test_model_export.py",
+        tests_dir / "test_fast_esm.py",
+        tests_dir / "test_onnx_backend.py",
+        tests_dir / "test_resources.py",
+        tests_dir / "test_result_formatting.py",
+        tests_dir / "test_detection_batch.py",
+        tests_dir / "test_ingestion.py",
+        tests_dir / "test_prodigal_sharding.py",
+        tests_dir / "test_orf_translator.py",
+        tests_dir / "test_sequence_batch.py",
+        tests_dir / "test_pipeline_runs.py"
     ]
     
     # Filter to only existing scripts
@@ -60,22 +85,23 @@ def main():
     # Run all tests
     results = []
     for script in available_tests:
-        success = run_test_script(script)
-        results.append((script.name, success))
+        status = run_test_script(script)
+        results.append((script.name, status))
     
     # Summary
     print(f"\n{'='*60}")
     print("TEST SUMMARY")
     print(f"{'='*60}")
     
-    passed = sum(1 for _, success in results if success)
-    total = len(results)
+    passed = sum(1 for _, status in results if status == "PASSED")
+    skipped = sum(1 for _, status in results if status == "SKIPPED")
+    total = len(results) - skipped
     
-    for script_name, success in results:
-        status = "PASSED" if success else "FAILED"
+    for script_name, status in results:
         print(f"{script_name}: {status}")
     
-    print(f"\nOverall: {passed}/{total} test suites passed")
+    print(f"\nOverall: {passed}/{total} test suites passed"
+          + (f" ({skipped} skipped)" if skipped else ""))
     
     if passed == total:
         print("\nAll tests passed!")
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Parity test for the vectorized CKSAAP engine.
+
+Checks that FEATURE.CKSAAP_batch produces exactly the same matrix as the
+per-sequence FEATURE.CKSAAP reference used by COVIDClassifier.extract_features,
+and that the process-pool variant matches the single-process engine.
+"""
+
+import multiprocessing
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from Bio import SeqIO
+
+# Add the repository root to the path to import DeepCovVar modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.absolute()))
+
+from deepcovvar.utils.features import FEATURE
+
+TESTS_DIR = Path(__file__).parent
+STANDARD_AA = 'ARNDCQEGHILKMFPSTWYV'
+
+
+def legacy_features(extractor, sequences, gap=5):
+    """Reference matrix built the way extract_features did before vectorization."""
+    feature_size = 400 * (gap + 1)
+    rows = []
+    for seq in sequences:
+        clean_seq = ''.join([aa for aa in seq if aa in STANDARD_AA])
+        encoding = extractor.CKSAAP(clean_seq, gap=gap) if len(clean_seq) >= 2 else 0
+        if isinstance(encoding, list) and len(encoding) == feature_size:
+            rows.append(encoding)
+        else:
+            rows.append([0.0] * feature_size)
+    return np.array(rows, dtype=np.float32)
+
+
+def test_cksaap_batch_matches_legacy_on_fasta():
+    """Vectorized features are bit-identical to the legacy loop on real inputs."""
+    extractor = FEATURE()
+    sequences = [str(record.seq).upper()
+                 for record in SeqIO.parse(TESTS_DIR / "test_5_sequences_converted_proteins.fasta", "fasta")]
+    assert sequences
+
+    expected = legacy_features(extractor, sequences)
+    actual = extractor.CKSAAP_batch(sequences, gap=5, clean=True)
+
+    assert actual.dtype == np.float32
+    assert actual.shape == (len(sequences), 2400)
+    assert np.array_equal(actual, expected)
+    return True
+
+
+def test_cksaap_batch_edge_cases():
+    """Short sequences, non-standard residues and other gaps agree with the reference."""
+    extractor = FEATURE()
+    sequences = [
+        "",
+        "M",
+        "MKT",
+        "MKTAYIA",
+        "MKTXXAYIA*BZ",
+        "ACDEFGHIKLMNPQRSTVWY" * 3,
+        "MFVFLVLLPLVSSQCVNLTTRTQLPPAYTNSFTRGVYYPDKVFRSSVLHSTQDLFLPFFSNVTWFHAIHV",
+    ]
+
+    assert np.array_equal(extractor.CKSAAP_batch(sequences, gap=5, clean=True),
+                          legacy_features(extractor, sequences, gap=5))
+    assert np.array_equal(extractor.CKSAAP_batch(sequences, gap=2, clean=True),
+                          legacy_features(extractor, sequences, gap=2))
+
+    # Without cleaning, the batch engine mirrors CKSAAP on the raw string
+    raw = "MKTXXAYIAKQRQISFVKSHFSRQ"
+    assert extractor.CKSAAP_batch([raw], gap=5)[0].tolist() == extractor.CKSAAP(raw, gap=5)
+
+    # Chunking must not change the result
+    assert np.array_equal(extractor.CKSAAP_batch(sequences, chunk_size=2, clean=True),
+                          extractor.CKSAAP_batch(sequences, clean=True))
+    return True
+
+
+def test_cksaap_parallel_matches_batch():
+    """Sharding across a process pool through shared memory gives the same matrix."""
+    extractor = FEATURE()
+    rng = np.random.default_rng(0)
+    alphabet = np.array(list(STANDARD_AA + 'X*'))
+    sequences = [''.join(rng.choice(alphabet, size=rng.integers(0, 400))) for _ in range(300)]
+
+    with ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context('spawn')) as executor:
+        actual = extractor.CKSAAP_parallel(sequences, executor, n_shards=7, gap=5, clean=True)
+        empty = extractor.CKSAAP_parallel([], executor, n_shards=2)
+
+    assert actual.dtype == np.float32
+    assert np.array_equal(actual, extractor.CKSAAP_batch(sequences, gap=5, clean=True))
+    assert empty.shape == (0, 2400)
+    return True
+
+
+def main():
+    """Main test function."""
+    print("CKSAAP Vectorization Parity Tests")
+    print("=" * 50)
+
+    tests = [
+        ("FASTA parity", test_cksaap_batch_matches_legacy_on_fasta),
+        ("Edge cases", test_cksaap_batch_edge_cases),
+        ("Process pool parity", test_cksaap_parallel_matches_batch),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+            print(f"{test_name}: PASSED")
+        except AssertionError as e:
+            print(f"{test_name}: FAILED {e}")
+
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Tests for collapsing duplicate sequences before featurization and inference.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+from Bio import SeqIO
+
+# Add the repository root to the path to import DeepCovVar modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.absolute()))
+
+from deepcovvar.utils.deepcovvar_utils import deduplicate_sequences
+from deepcovvar.utils.features import FEATURE
+
+TESTS_DIR = Path(__file__).parent
+
+
+def test_inverse_restores_input():
+    """unique[inverse] reproduces the input and first_index points at first copies."""
+    sequences = ["MKT", "AAA", "MKT", "CCC", "AAA", "MKT"]
+    unique, first_index, inverse = deduplicate_sequences(sequences)
+
+    assert unique == ["MKT", "AAA", "CCC"]
+    assert first_index.tolist() == [0, 1, 3]
+    assert [unique[k] for k in inverse] == sequences
+    return True
+
+
+def test_fan_out_matches_full_featurization():
+    """Featurizing unique sequences and fanning out equals featurizing everything."""
+    extractor = FEATURE()
+    sequences = [str(record.seq).upper()
+                 for record in SeqIO.parse(TESTS_DIR / "test_5_sequences_converted_proteins.fasta", "fasta")]
+    unique, _, inverse = deduplicate_sequences(sequences)
+
+    assert len(unique) < len(sequences)
+    full = extractor.CKSAAP_batch(sequences, clean=True)
+    fanned = extractor.CKSAAP_batch(unique, clean=True)[inverse]
+    assert np.array_equal(full, fanned)
+    return True
+
+
+def main():
+    """Main test function."""
+    print("Sequence Deduplication Tests")
+    print("=" * 50)
+
+    tests = [
+        ("Inverse mapping", test_inverse_restores_input),
+        ("Fan-out parity", test_fan_out_matches_full_featurization),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+            print(f"{test_name}: PASSED")
+        except AssertionError as e:
+            print(f"{test_name}: FAILED {e}")
+
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
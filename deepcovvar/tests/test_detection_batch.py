@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Tests for SequenceTypeDetector.is_nucleotide_batch, the one-pass lookup-table
+detector that must agree exactly with the per-sequence is_nucleotide rule.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add the repository root to the path to import DeepCovVar modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.absolute()))
+
+from deepcovvar.utils.sequence_converter import SequenceTypeDetector
+
+TESTS_DIR = Path(__file__).parent
+
+
+def _random_sequences(count, seed=0):
+    """Sequences drawn from mixed alphabets, so ratios land on both sides of the thresholds."""
+    rng = np.random.default_rng(seed)
+    alphabets = ['ACGT', 'ACGTUN', 'acgtn', 'ACDEFGHIKLMNPQRSTVWY', 'ACGT*-X', 'RNDQEHILKMFPSTWYV']
+    sequences = []
+    for _ in range(count):
+        length = int(rng.integers(0, 60))
+        mix = rng.choice(len(alphabets), size=2, replace=False)
+        share = rng.random()
+        chars = [rng.choice(list(alphabets[mix[0]] if rng.random() < share else alphabets[mix[1]]))
+                 for _ in range(length)]
+        sequences.append(''.join(chars))
+    return sequences
+
+
+def test_batch_matches_per_sequence_rule():
+    """Random, empty, lowercase and boundary-ratio sequences get the same answer."""
+    detector = SequenceTypeDetector()
+    sequences = _random_sequences(3000) + [
+        '', 'A', 'ACGTACGTAX', 'ACGTACGTA*', 'NNNNNNNNNN',
+        # aa ratio exactly 0.7 and nucleotide ratio exactly 0.9 sit on the rule's boundaries
+        'RRRRRRRAAA', 'ACGTACGTAC' * 9 + 'XXXXXXXXXX',
+    ]
+    expected = np.array([detector.is_nucleotide(seq) for seq in sequences])
+    assert expected.any() and not expected.all()
+    assert np.array_equal(detector.is_nucleotide_batch(sequences), expected)
+    assert detector.is_nucleotide_batch([]).shape == (0,)
+    return True
+
+
+def test_non_ascii_and_test_files():
+    """Non-ASCII input falls back to the exact rule; the test FASTA files agree."""
+    detector = SequenceTypeDetector()
+    sequences = ['ACGTß' * 5, 'ACGT' * 10]
+    assert detector.is_nucleotide_batch(sequences).tolist() == \
+        [detector.is_nucleotide(seq) for seq in sequences]
+
+    for fasta in sorted(TESTS_DIR.glob('*.fasta')):
+        sequences = [line.strip() for line in fasta.read_text().split('>') if line.strip()]
+        sequences = [''.join(entry.splitlines()[1:]) for entry in sequences]
+        assert detector.is_nucleotide_batch(sequences).tolist() == \
+            [detector.is_nucleotide(seq) for seq in sequences], fasta.name
+    return True
+
+
+def test_prefix_sampling():
+    """sample_length only looks at the start of each sequence."""
+    genome = 'ACGT' * 50 + 'MKLV' * 1000
+    assert not SequenceTypeDetector().is_nucleotide_batch([genome])[0]
+    assert SequenceTypeDetector(sample_length=200).is_nucleotide_batch([genome])[0]
+    assert SequenceTypeDetector().is_nucleotide_batch([genome], sample_length=200)[0]
+    return True
+
+
+def main():
+    """Main test function."""
+    print("Batch Sequence Type Detection Tests")
+    print("=" * 50)
+
+    tests = [
+        ("Per-sequence parity", test_batch_matches_per_sequence_rule),
+        ("Non-ASCII and test files", test_non_ascii_and_test_files),
+        ("Prefix sampling", test_prefix_sampling),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+            print(f"{test_name}: PASSED")
+        except AssertionError as e:
+            print(f"{test_name}: FAILED {e}")
+
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
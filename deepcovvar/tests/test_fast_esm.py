@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Tests for the opt-in phase 5 fast path (int8 dynamic quantization, SDPA, inference mode).
+
+Uses the tiny stand-in ESM model from test_model_export, so no network access is needed.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# torch and transformers are optional; skip the module without them
+torch = pytest.importorskip("torch")
+pytest.importorskip("transformers")
+
+# Add the repository root to the path to import DeepCovVar modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.absolute()))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from test_model_export import HubStandInClassifier, SEQUENCES
+
+
+def test_fast_path_quantizes_linear_layers():
+    """Fast mode replaces every Linear layer with a dynamically quantized one."""
+    with tempfile.TemporaryDirectory() as tmp:
+        model = HubStandInClassifier(model_dir=tmp, fast_esm=True).load_model(5)
+        modules = list(model.modules())
+        assert not any(type(module) is torch.nn.Linear for module in modules)
+        assert any(isinstance(module, torch.ao.nn.quantized.dynamic.Linear) for module in modules)
+    return True
+
+
+def test_fast_path_matches_default_outputs():
+    """Quantized outputs stay close to the full-precision ones and keep the top class."""
+    with tempfile.TemporaryDirectory() as tmp:
+        default = HubStandInClassifier(model_dir=tmp)._run_model(5, SEQUENCES)
+        fast = HubStandInClassifier(model_dir=tmp, fast_esm=True)._run_model(5, SEQUENCES)
+        assert fast.shape == default.shape
+        assert np.abs(fast - default).max() < 0.02
+        assert (fast.argmax(axis=1) == default.argmax(axis=1)).all()
+    return True
+
+
+def test_fast_path_has_own_cache_digest():
+    """Cached full-precision outputs are not served to the quantized model, or vice versa."""
+    with tempfile.TemporaryDirectory() as tmp:
+        HubStandInClassifier(model_dir=tmp).export_transformer_model()
+        default = HubStandInClassifier(model_dir=tmp).model_digest(5)
+        fast = HubStandInClassifier(model_dir=tmp, fast_esm=True).model_digest(5)
+        assert default != fast
+    return True
+
+
+def main():
+    """Main test function."""
+    print("Phase 5 Fast Path Tests")
+    print("=" * 50)
+
+    tests = [
+        ("Quantized layers", test_fast_path_quantizes_linear_layers),
+        ("Output parity", test_fast_path_matches_default_outputs),
+        ("Cache digest", test_fast_path_has_own_cache_digest),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+            print(f"{test_name}: PASSED")
+        except AssertionError as e:
+            print(f"{test_name}: FAILED {e}")
+
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Tests for scoring phases 1-4 with one fused multi-output Keras model.
+
+Small random models stand in for the shipped ones; the fused run must write
+the same per-phase CSVs as running each phase model separately.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# TensorFlow is optional; skip the module without it
+tf = pytest.importorskip("tensorflow")
+
+# Add the repository root to the path to import DeepCovVar modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.absolute()))
+
+from deepcovvar.covid_classifier import COVIDClassifier
+
+TESTS_DIR = Path(__file__).parent
+
+
+def _make_classifier(model_dir, fused):
+    """Classifier over random stand-in models for phases 1-4 (phase 5 is skipped)."""
+    classifier = COVIDClassifier(model_dir=str(model_dir), fused=fused)
+    for phase, config in classifier.models_config.items():
+        if config['type'] == 'keras':
+            config['_full_path'] = str(Path(model_dir) / config['file'])
+    classifier.models_config = {phase: config for phase, config in classifier.models_config.items()
+                                if config['type'] == 'keras'}
+    return classifier
+
+
+def _save_models(model_dir):
+    """Write one model per Keras phase; phase 2 takes 4D input like a Conv2D model."""
+    tf.keras.utils.set_random_seed(0)
+    classifier = COVIDClassifier(model_dir=str(model_dir))
+    for phase, config in classifier.models_config.items():
+        if config['type'] != 'keras':
+            continue
+        outputs = len(config['classes']) if len(config['classes']) > 2 else 1
+        activation = 'softmax' if outputs > 1 else 'sigmoid'
+        if phase == 2:
+            layers = [tf.keras.Input((1, 2400, 1)), tf.keras.layers.Flatten()]
+        else:
+            layers = [tf.keras.Input((2400,))]
+        # Same name for every model, as independently saved models often have
+        model = tf.keras.Sequential(layers + [tf.keras.layers.Dense(8, activation='relu'),
+                                              tf.keras.layers.Dense(outputs, activation=activation)],
+                                    name='sequential')
+        model.save(str(Path(model_dir) / config['file']))
+
+
+def test_fused_outputs_match_separate_models():
+    """Each fused head returns the outputs of its phase model."""
+    with tempfile.TemporaryDirectory() as tmp:
+        _save_models(tmp)
+        separate = _make_classifier(tmp, fused=False)
+        fused = _make_classifier(tmp, fused=True)
+        sequences, _ = separate.read_sequences(str(TESTS_DIR / "test_5_sequences_converted_proteins.fasta"))
+
+        outputs = fused.fused_probabilities(sequences)
+        assert fused.fused_phases == [1, 2, 3, 4]
+        for phase in fused.fused_phases:
+            expected = separate.predict_probabilities(phase, sequences)
+            assert outputs[phase].shape == expected.shape
+            assert np.allclose(outputs[phase], expected, atol=1e-6)
+    return True
+
+
+def test_fused_run_writes_identical_csvs():
+    """run_all_phases writes the same CSVs with and without fusion, cascade included."""
+    input_file = str(TESTS_DIR / "test_5_sequences_converted_proteins.fasta")
+    thresholds = {phase: None for phase in range(1, 5)}
+    with tempfile.TemporaryDirectory() as tmp:
+        _save_models(tmp)
+        for cascade in (False, True):
+            runs = {}
+            for fused in (False, True):
+                out_dir = Path(tmp) / f"out_{cascade}_{fused}"
+                _make_classifier(tmp, fused).run_all_phases(input_file, output_dir=out_dir,
+                                                           cascade=cascade, thresholds=thresholds)
+                runs[fused] = {path.name: path.read_text() for path in out_dir.glob("*.csv")}
+            assert runs[False] and runs[False] == runs[True]
+    return True
+
+
+def main():
+    """Main test function."""
+    print("Fused Keras Model Tests")
+    print("=" * 50)
+
+    tests = [
+        ("Head parity", test_fused_outputs_match_separate_models),
+        ("CSV parity", test_fused_run_writes_identical_csvs),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+            print(f"{test_name}: PASSED")
+        except AssertionError as e:
+            print(f"{test_name}: FAILED {e}")
+
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Tests for the single ingestion stage: a pipeline run parses, type-checks and
+converts its input once and hands the same in-memory batch to every phase.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add the repository root to the path to import DeepCovVar modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.absolute()))
+
+import deepcovvar.covid_classifier as covid_classifier
+from deepcovvar.covid_classifier import COVIDClassifier
+from deepcovvar.utils.sequence_batch import SequenceBatch
+from deepcovvar.utils.sequence_converter import SequenceProcessor, SequenceTypeDetector
+
+TESTS_DIR = Path(__file__).parent
+PROTEIN_FASTA = TESTS_DIR / "test_5_sequences_converted_proteins.fasta"
+
+
+class _CountingDetector(SequenceTypeDetector):
+    calls = 0
+
+    def is_nucleotide_batch(self, sequences, sample_length=None):
+        _CountingDetector.calls += 1
+        return super().is_nucleotide_batch(sequences, sample_length)
+
+
+class _FakeConverter:
+    """Stands in for Prodigal: one 'protein' per input sequence."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def convert_sequences_in_memory(self, sequences, seq_ids, mode='single'):
+        self.calls += 1
+        return ['MKT' for _ in sequences], [f"{seq_id}_1" for seq_id in seq_ids]
+
+
+def _classifier():
+    processor = SequenceProcessor.__new__(SequenceProcessor)
+    processor.detector = _CountingDetector()
+    processor.converter = _FakeConverter()
+    classifier = COVIDClassifier.__new__(COVIDClassifier)
+    classifier.sequence_processor = processor
+    return classifier
+
+
+def _count_parses():
+    """Wrap SeqIO.parse in the classifier module; returns the call list and a restore function."""
+    calls = []
+    original = covid_classifier.SeqIO.parse
+
+    def parse(handle, fmt, *args, **kwargs):
+        calls.append(handle)
+        return original(handle, fmt, *args, **kwargs)
+
+    covid_classifier.SeqIO.parse = parse
+    return calls, lambda: setattr(covid_classifier.SeqIO, 'parse', original)
+
+
+def test_run_all_phases_reads_input_once():
+    """The whole-file pipeline parses and type-checks the input exactly once for all phases."""
+    classifier = _classifier()
+    seen = []
+
+    def run_phase_batch(sequences, seq_ids, thresholds, cascade, **kwargs):
+        seen.append((sequences, seq_ids))
+        return {}, None
+
+    classifier._run_phase_batch = run_phase_batch
+    _CountingDetector.calls = 0
+    parses, restore = _count_parses()
+    try:
+        _, run_stats, _ = classifier._run_all_phases_in_memory(
+            str(PROTEIN_FASTA), {}, None, cascade=False, thresholds={})
+    finally:
+        restore()
+    assert len(parses) == 1 and _CountingDetector.calls == 1
+    assert classifier.sequence_processor.converter.calls == 0
+    assert len(seen) == 1 and run_stats['Sequences'] == len(seen[0][0]) == 55
+    return True
+
+
+def test_nucleotide_input_converted_once():
+    """Nucleotide input is converted in memory once; the raw records are kept alongside."""
+    classifier = _classifier()
+    with tempfile.TemporaryDirectory() as tmp:
+        fasta = Path(tmp) / "genomes.fasta"
+        fasta.write_text(">g1\nacgtacgtacgt\n>g2\nACGTTTGACCAA\n")
+        records, sequences, seq_ids = classifier.ingest_sequences(str(fasta))
+    assert records == [('g1', 'acgtacgtacgt'), ('g2', 'ACGTTTGACCAA')]
+    assert isinstance(sequences, SequenceBatch) and sequences.ids == seq_ids
+    assert list(sequences) == ['MKT', 'MKT'] and seq_ids == ['g1_1', 'g2_1']
+    assert classifier.sequence_processor.converter.calls == 1
+    return True
+
+
+def test_force_and_no_conversion():
+    """force_conversion converts protein input; auto_convert=False skips detection entirely."""
+    classifier = _classifier()
+    _, sequences, _ = classifier.ingest_sequences(str(PROTEIN_FASTA), force_conversion=True)
+    assert list(sequences) == ['MKT'] * 55
+
+    classifier = _classifier()
+    _CountingDetector.calls = 0
+    _, sequences, seq_ids = classifier.ingest_sequences(str(PROTEIN_FASTA), auto_convert=False)
+    assert _CountingDetector.calls == 0 and len(sequences) == len(seq_ids) == 55
+    assert all(seq == seq.upper() for seq in sequences)
+    return True
+
+
+def main():
+    """Main test function."""
+    print("Single Ingestion Stage Tests")
+    print("=" * 50)
+
+    tests = [
+        ("Run-all reads input once", test_run_all_phases_reads_input_once),
+        ("Nucleotide input converted once", test_nucleotide_input_converted_once),
+        ("Forced and skipped conversion", test_force_and_no_conversion),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+            print(f"{test_name}: PASSED")
+        except AssertionError as e:
+            print(f"{test_name}: FAILED {e}")
+
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
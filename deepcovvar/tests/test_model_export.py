@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Tests for exporting the merged phase 5 model and loading it back offline.
+
+A tiny randomly initialized ESM model stands in for the hub model, so no
+network access is needed.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# torch and transformers are optional; skip the module without them
+torch = pytest.importorskip("torch")
+pytest.importorskip("transformers")
+
+# Add the repository root to the path to import DeepCovVar modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.absolute()))
+
+from transformers import EsmConfig, EsmForSequenceClassification, EsmTokenizer
+
+from deepcovvar.covid_classifier import COVIDClassifier, EXPORTED_TRANSFORMER_DIR
+
+ESM_VOCAB = ['<cls>', '<pad>', '<eos>', '<unk>', 'L', 'A', 'G', 'V', 'S', 'E', 'R', 'T', 'I', 'D',
+             'P', 'K', 'Q', 'N', 'F', 'Y', 'M', 'H', 'W', 'C', 'X', 'B', 'U', 'Z', 'O', '.', '-',
+             '<null_1>', '<mask>']
+SEQUENCES = ["MFVFLVLLPLVSSQCVNLTTRTQLPPAYTNSFTRGVYYPDKVFRSSVLHSTQDLFLPFFSNVTWFHAI",
+             "MKTAYIAKQRQISFVKSHFSRQ",
+             "MFVFLVLLPLVSSQCVNLTTRTQLPPAYTNSFTRGVYYPDKVFRSSVLHSTQDLFLPFFSNVTWFHAI"]
+
+
+class HubStandInClassifier(COVIDClassifier):
+    """Builds a tiny ESM model where the real classifier would download ESM-2."""
+
+    def load_transformer_model(self, model_path, use_export=True):
+        if use_export and (Path(model_path) / EXPORTED_TRANSFORMER_DIR / 'config.json').exists():
+            return self.load_exported_transformer_model(Path(model_path) / EXPORTED_TRANSFORMER_DIR)
+        vocab_file = Path(model_path) / 'stand_in_vocab.txt'
+        vocab_file.write_text('\n'.join(ESM_VOCAB))
+        self.tokenizer = EsmTokenizer(str(vocab_file))
+        torch.manual_seed(0)
+        config = EsmConfig(vocab_size=len(ESM_VOCAB), hidden_size=32, num_hidden_layers=2,
+                           num_attention_heads=4, intermediate_size=64,
+                           position_embedding_type='rotary', pad_token_id=1, mask_token_id=32,
+                           num_labels=7)
+        return EsmForSequenceClassification(config).eval()
+
+
+def test_exported_model_matches_merged_model():
+    """Phase 5 outputs are identical before and after exporting."""
+    with tempfile.TemporaryDirectory() as tmp:
+        original = HubStandInClassifier(model_dir=tmp)
+        expected = original._run_model(5, SEQUENCES)
+
+        export_dir = original.export_transformer_model()
+        assert export_dir == Path(tmp) / EXPORTED_TRANSFORMER_DIR
+        assert list(export_dir.glob('*.safetensors'))
+
+        reloaded = HubStandInClassifier(model_dir=tmp)
+        outputs = reloaded._run_model(5, SEQUENCES)
+        assert np.allclose(outputs, expected, atol=1e-6)
+        assert not np.isnan(outputs).any()
+    return True
+
+
+def test_export_changes_model_digest():
+    """Prediction cache entries from the hub model are not reused for the export."""
+    with tempfile.TemporaryDirectory() as tmp:
+        classifier = HubStandInClassifier(model_dir=tmp)
+        assert classifier.model_files(5) == []
+        classifier.export_transformer_model()
+        files = classifier.model_files(5)
+        assert files and all(path.suffix == '.safetensors' for path in files)
+    return True
+
+
+def main():
+    """Main test function."""
+    print("Phase 5 Model Export Tests")
+    print("=" * 50)
+
+    tests = [
+        ("Export parity", test_exported_model_matches_merged_model),
+        ("Model digest", test_export_changes_model_digest),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+            print(f"{test_name}: PASSED")
+        except AssertionError as e:
+            print(f"{test_name}: FAILED {e}")
+
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
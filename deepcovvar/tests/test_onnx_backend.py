@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Tests for exporting the phase models to ONNX and scoring them with onnxruntime.
+
+The random stand-in models of the fused Keras tests and the tiny ESM model of
+the export tests are exported; the ONNX backend must reproduce their outputs.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# onnxruntime and the native backends the exported models come from are optional;
+# skip the module without them
+pytest.importorskip("onnxruntime")
+pytest.importorskip("tensorflow")
+pytest.importorskip("torch")
+pytest.importorskip("transformers")
+
+# Add the repository root to the path to import DeepCovVar modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.absolute()))
+
+from deepcovvar.covid_classifier import COVIDClassifier, ONNX_MODEL_DIR
+
+from test_fused_keras import TESTS_DIR, _save_models
+from test_model_export import HubStandInClassifier, SEQUENCES
+
+
+def _keras_classifier(model_dir, backend):
+    """Classifier over the stand-in Keras models only (phase 5 is skipped)."""
+    classifier = COVIDClassifier(model_dir=str(model_dir), backend=backend)
+    classifier.models_config = {phase: dict(config, _full_path=str(Path(model_dir) / config['file']))
+                                for phase, config in classifier.models_config.items()
+                                if config['type'] == 'keras'}
+    return classifier
+
+
+def test_keras_phases_match_native():
+    """Every Keras phase, 4D-input phase 2 included, gives the native outputs on onnxruntime."""
+    with tempfile.TemporaryDirectory() as tmp:
+        _save_models(tmp)
+        native = _keras_classifier(tmp, 'native')
+        exported = native.export_onnx_models()
+        assert sorted(exported) == [1, 2, 3, 4]
+        assert all(path.parent == Path(tmp) / ONNX_MODEL_DIR for path in exported.values())
+
+        onnx = _keras_classifier(tmp, 'onnx')
+        sequences, _ = native.read_sequences(str(TESTS_DIR / "test_5_sequences_converted_proteins.fasta"))
+        for phase in exported:
+            expected = native.predict_probabilities(phase, sequences)
+            outputs = onnx.predict_probabilities(phase, sequences)
+            assert outputs.shape == expected.shape
+            assert np.allclose(outputs, expected, atol=1e-5)
+            assert onnx.model_files(phase) == [exported[phase]]
+    return True
+
+
+def test_transformer_matches_native():
+    """Phase 5 on onnxruntime reproduces the torch probabilities for padded batches."""
+    with tempfile.TemporaryDirectory() as tmp:
+        native = HubStandInClassifier(model_dir=tmp)
+        expected = native._run_model(5, SEQUENCES)
+        native.export_onnx_models(phases=[5])
+
+        onnx = COVIDClassifier(model_dir=tmp, backend='onnx')
+        outputs = onnx._run_model(5, SEQUENCES)
+        assert outputs.shape == expected.shape
+        assert np.allclose(outputs, expected, atol=1e-5)
+    return True
+
+
+def test_missing_export_is_reported():
+    """The ONNX backend points at export-onnx when a phase has not been exported."""
+    with tempfile.TemporaryDirectory() as tmp:
+        classifier = COVIDClassifier(model_dir=tmp, backend='onnx')
+        try:
+            classifier.load_model(1)
+        except FileNotFoundError as e:
+            assert 'export-onnx' in str(e)
+        else:
+            raise AssertionError("load_model did not fail without an ONNX export")
+    return True
+
+
+def main():
+    """Main test function."""
+    print("ONNX Backend Tests")
+    print("=" * 50)
+
+    tests = [
+        ("Keras parity", test_keras_phases_match_native),
+        ("Transformer parity", test_transformer_matches_native),
+        ("Missing export", test_missing_export_is_reported),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+            print(f"{test_name}: PASSED")
+        except AssertionError as e:
+            print(f"{test_name}: FAILED {e}")
+
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Tests for the built-in six-frame ORF translator and its use as the converter
+when Prodigal is not installed.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add the repository root to the path to import DeepCovVar modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.absolute()))
+
+from Bio import SeqIO
+from Bio.Seq import Seq
+
+from deepcovvar.utils.sequence_converter import OrfTranslator, SequenceProcessor
+
+TESTS_DIR = Path(__file__).parent
+# GTG and ATG starts, 36 stop-free codons and a TAA stop; the flank has stops in
+# all six frames so the gene is not part of an edge ORF
+GENE = ("GTGAAAATG" + "CGGATCGTTGGCTTATACGCCGGCCTACCAGATCGTCTGGCACTACAGAAAACTTCCTTCG"
+        "ATGTTGCAACTGCCCCGCGAGTATATCCCTATCGAGGATATCAACAG" + "TAA")
+FLANK = "TTAATTAATTAA"
+GENOME = FLANK + GENE + FLANK + str(Seq(GENE).reverse_complement()) + FLANK
+
+
+def test_both_strands():
+    """Genes on either strand get Prodigal-style coordinates and proteins."""
+    translator = OrfTranslator(min_length=20)
+    # ATG is preferred over the upstream GTG
+    protein = "M" + str(Seq(GENE[9:]).translate())
+    assert translator.find_orfs(GENOME) == [(19, 132, 1, protein, '00'), (145, 258, -1, protein, '00')]
+
+    # Unknown bases make codons unknown instead of breaking the scan
+    assert translator.find_orfs(GENOME.replace("CGGATC", "CNGATC", 1))[0][3][:2] == 'MX'
+    assert OrfTranslator(min_length=40).find_orfs(GENOME) == []
+    assert translator.find_orfs("AC") == []
+    return True
+
+
+def test_agreement_with_prodigal():
+    """Every Prodigal gene of the test genomes is found; most proteins match exactly."""
+    reference = {}
+    for record in SeqIO.parse(TESTS_DIR / "test_sarscov2_convert_prodigal.fasta", "fasta"):
+        _, left, right, strand = record.description.split(' # ')[:4]
+        stop = int(right) if strand == '1' else int(left)
+        reference[(record.id.rsplit('_', 1)[0], int(strand), stop)] = str(record.seq)
+
+    translator = OrfTranslator()
+    found = exact = expected = 0
+    for record in SeqIO.parse(TESTS_DIR / "test_5_sequences.fasta", "fasta"):
+        expected += sum(1 for genome, _, _ in reference if genome == record.id)
+        for left, right, strand, protein, _ in translator.find_orfs(str(record.seq)):
+            key = (record.id, strand, right if strand == 1 else left)
+            if key in reference:
+                found += 1
+                exact += reference[key] == protein
+    assert expected > 0 and found == expected
+    assert exact >= 0.85 * expected, f"{exact}/{expected} identical proteins"
+    return True
+
+
+def test_fallback_without_prodigal():
+    """SequenceProcessor uses the ORF translator when Prodigal is missing, unless Prodigal is required."""
+    path = os.environ.get('PATH', '')
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ['PATH'] = tmp
+        try:
+            processor = SequenceProcessor()
+            assert isinstance(processor.converter, OrfTranslator)
+            try:
+                SequenceProcessor(converter='prodigal')
+            except RuntimeError:
+                pass
+            else:
+                raise AssertionError("converter='prodigal' did not raise without Prodigal")
+        finally:
+            os.environ['PATH'] = path
+
+        processor.converter.min_length = 20
+        sequences, seq_ids, converted = processor.process_sequences_in_memory(
+            [GENOME], ["g1"], force_conversion=True)
+        assert converted and seq_ids == ["g1_1", "g1_2"] and sequences[0].endswith('*')
+
+        output_file = Path(tmp) / "proteins.faa"
+        processor.converter.convert_nucleotide_to_protein(
+            str(TESTS_DIR / "single_nucleotide.fasta"), str(output_file))
+        headers = [line for line in output_file.read_text().splitlines() if line.startswith('>')]
+        assert headers and ' # ID=1_1;partial=' in headers[0]
+    assert isinstance(SequenceProcessor(converter='orf').converter, OrfTranslator)
+    return True
+
+
+def main():
+    """Main test function."""
+    print("ORF Translator Tests")
+    print("=" * 50)
+
+    tests = [
+        ("Both strands", test_both_strands),
+        ("Agreement with Prodigal", test_agreement_with_prodigal),
+        ("Fallback without Prodigal", test_fallback_without_prodigal),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+            print(f"{test_name}: PASSED")
+        except AssertionError as e:
+            print(f"{test_name}: FAILED {e}")
+
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
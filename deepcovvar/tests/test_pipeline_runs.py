@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+End-to-end pipeline runs with stub models.
+
+The real ingestion, featurization, thresholding and CSV writing run; only the
+models are replaced by objects with predict() and input_shape, so the outputs
+are deterministic and no TensorFlow or torch is needed.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add the repository root to the path to import DeepCovVar modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.absolute()))
+
+from deepcovvar.covid_classifier import COVIDClassifier
+
+TESTS_DIR = Path(__file__).parent
+PROTEIN_FASTA = TESTS_DIR / "test_5_sequences_converted_proteins.fasta"
+NO_PROMPT = {1: None, 2: None, 3: None, 4: None}
+
+
+class StubKerasModel:
+    """Scores CKSAAP rows with a fixed function of the row, like a Keras model would."""
+
+    input_shape = (None, 2400)
+
+    def __init__(self, score):
+        self.score = score
+        self.calls = 0
+
+    def predict(self, features, verbose=0):
+        self.calls += 1
+        return np.asarray(self.score(np.asarray(features)), dtype=np.float32)
+
+
+def _softmax_rows(features, width):
+    # Multi-class outputs from the pair counts of the first `width` residues
+    logits = features[:, :width * 20:20] / np.maximum(features.sum(axis=1, keepdims=True), 1)
+    exp = np.exp(logits - logits.max(axis=1, keepdims=True))
+    return exp / exp.sum(axis=1, keepdims=True)
+
+
+def _stub_classifier():
+    """
+    COVIDClassifier whose five phases are stub models.
+
+    Phase 1 calls sequences with at most 1200 CKSAAP pairs 'Virus' (26 of the 55
+    in PROTEIN_FASTA); phase 2 calls every sequence 'Others', so in cascade mode
+    nothing reaches phases 3-5. Phase 5 is scored from CKSAAP features too.
+    """
+    classifier = COVIDClassifier()
+    classifier.models_config[5] = dict(classifier.models_config[5], type='keras', feature_size=2400)
+    classifier.loaded_models = {
+        1: StubKerasModel(lambda f: (f.sum(axis=1, keepdims=True) > 1200).astype(float)),
+        2: StubKerasModel(lambda f: np.zeros((len(f), 1))),
+        3: StubKerasModel(lambda f: (f[:, :1] > 0).astype(float)),
+        4: StubKerasModel(lambda f: _softmax_rows(f, 4)),
+        5: StubKerasModel(lambda f: _softmax_rows(f, 7)),
+    }
+    return classifier
+
+
+def test_cascade_routing():
+    """Cascade forwards only each phase's cascade class and fills the rest with 'Not evaluated'."""
+    classifier = _stub_classifier()
+    with tempfile.TemporaryDirectory() as tmp:
+        results = classifier.run_all_phases(str(PROTEIN_FASTA), output_dir=tmp, base_filename='run',
+                                            cascade=True, thresholds=NO_PROMPT)
+        merged = pd.read_csv(Path(tmp) / 'run_cascade_results.csv')
+        summary = (Path(tmp) / 'run_pipeline_summary.txt').read_text()
+
+    assert len(merged) == 55
+    evaluated = [(merged[f'Phase_{phase}_Prediction'] != COVIDClassifier.NOT_EVALUATED).sum()
+                 for phase in range(1, 6)]
+    assert evaluated == [55, 26, 0, 0, 0], evaluated
+    assert [len(results[phase]) for phase in range(1, 6)] == evaluated
+
+    virus = merged['Phase_1_Prediction'] == 'Virus'
+    assert (merged.loc[virus, 'Phase_2_Prediction'] == 'Others').all()
+    assert (merged.loc[~virus, 'Phase_2_Prediction'] == COVIDClassifier.NOT_EVALUATED).all()
+    assert (merged.loc[~virus, 'Phase_2_Confidence'] == COVIDClassifier.NOT_EVALUATED).all()
+    for phase in (3, 4, 5):
+        assert (merged[f'Phase_{phase}_Prediction'] == COVIDClassifier.NOT_EVALUATED).all()
+
+    assert "Phase 2: 26/55 sequences evaluated" in summary
+    assert "Phase 5: 0/55 sequences evaluated" in summary
+    return True
+
+
+def _count_feature_extraction(classifier):
+    """Wrap classifier.extract_features; returns the list of feature sizes it was called with."""
+    calls = []
+    extract_features = classifier.extract_features
+
+    def counting(sequences, feature_size=2400, **kwargs):
+        calls.append(feature_size)
+        return extract_features(sequences, feature_size, **kwargs)
+
+    classifier.extract_features = counting
+    return calls
+
+
+def test_cksaap_computed_once():
+    """Phases that share a feature size share one CKSAAP matrix, in and out of cascade mode."""
+    for cascade in (False, True):
+        classifier = _stub_classifier()
+        calls = _count_feature_extraction(classifier)
+        with tempfile.TemporaryDirectory() as tmp:
+            classifier.run_all_phases(str(PROTEIN_FASTA), output_dir=tmp, base_filename='run',
+                                      cascade=cascade, thresholds=NO_PROMPT)
+        assert calls == [2400], calls
+        assert all(classifier.loaded_models[phase].calls == 1 for phase in (1, 2))
+
+    # predict() calls sharing a feature_cache featurize once too
+    classifier = _stub_classifier()
+    calls = _count_feature_extraction(classifier)
+    _, sequences, seq_ids = classifier.ingest_sequences(str(PROTEIN_FASTA))
+    feature_cache = {}
+    for phase in (1, 2, 3, 4):
+        classifier.predict(phase, None, sequences=sequences, seq_ids=seq_ids,
+                           feature_cache=feature_cache, prompt_thresholds=False)
+    assert calls == [2400] and list(feature_cache) == [2400]
+    return True
+
+
+def test_single_phase_cli():
+    """`deepcovvar -p 1` makes one batched predict call and writes one row per input record."""
+    import deepcovvar.__main__ as cli
+
+    predict_calls = []
+
+    class StubCLIClassifier(COVIDClassifier):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.loaded_models = _stub_classifier().loaded_models
+
+        def predict(self, phase, *args, **kwargs):
+            predict_calls.append(phase)
+            return super().predict(phase, *args, **kwargs)
+
+    saved = cli.COVIDClassifier, cli.configure_tensorflow, sys.argv, os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        cli.COVIDClassifier = StubCLIClassifier
+        cli.configure_tensorflow = lambda *args, **kwargs: None
+        sys.argv = ['deepcovvar', '-f', str(PROTEIN_FASTA), '-o', tmp, '-p', '1',
+                    '--thresholds', '50', '50', '--no-daemon']
+        # The CLI logs to deepcovvar.log in the working directory
+        os.chdir(tmp)
+        try:
+            cli.main()
+        finally:
+            cli.COVIDClassifier, cli.configure_tensorflow, sys.argv, cwd = saved
+            os.chdir(cwd)
+        rows = pd.read_csv(Path(tmp) / 'phase_1_results.csv')
+
+    record_ids = [line[1:].split()[0] for line in PROTEIN_FASTA.read_text().splitlines()
+                  if line.startswith('>')]
+    assert predict_calls == [1]
+    assert rows['sequence_id'].tolist() == record_ids
+    assert list(rows.columns) == ['sequence_id', 'sequence', 'phase', 'prediction', 'confidence']
+    assert (rows['prediction'] == 'Virus').sum() == 26 and (rows['phase'] == 1).all()
+    return True
+
+
+def test_unreadable_input_reports_failure():
+    """Empty or missing input fails every phase but still writes the summary, as before."""
+    with tempfile.TemporaryDirectory() as tmp:
+        empty = Path(tmp) / 'empty.fasta'
+        empty.write_text('')
+        for input_file in (empty, Path(tmp) / 'missing.fasta'):
+            for chunk_size in (None, 7):
+                results = _stub_classifier().run_all_phases(
+                    str(input_file), output_dir=tmp, base_filename='run', cascade=True,
+                    thresholds=NO_PROMPT, chunk_size=chunk_size)
+                assert results == {phase: None for phase in range(1, 6)}, results
+                summary = Path(tmp) / 'run_pipeline_summary.txt'
+                assert summary.read_text().count('FAILED') == 5
+                summary.unlink()
+        assert not list(Path(tmp).glob('*.csv'))
+    return True
+
+
+def _run_files(tmp, name, cascade, chunk_size=None, classifier=None):
+    """Run the stub pipeline into tmp/name and return {file name: bytes} of its CSVs."""
+    output_dir = Path(tmp) / name
+    (classifier or _stub_classifier()).run_all_phases(
+        str(PROTEIN_FASTA), output_dir=str(output_dir), base_filename='run', cascade=cascade,
+        thresholds=NO_PROMPT, chunk_size=chunk_size)
+    summary = (output_dir / 'run_pipeline_summary.txt').read_text()
+    return {path.name: path.read_bytes() for path in output_dir.glob('*.csv')}, summary
+
+
+def test_streaming_matches_in_memory():
+    """Streaming in chunks of 7 writes byte-identical per-phase and cascade CSVs."""
+    with tempfile.TemporaryDirectory() as tmp:
+        for cascade in (False, True):
+            in_memory, memory_summary = _run_files(tmp, f'memory_{cascade}', cascade)
+            streamed, stream_summary = _run_files(tmp, f'stream_{cascade}', cascade, chunk_size=7)
+            expected = {f'run_phase_{phase}_results.csv' for phase in range(1, 6)}
+            if cascade:
+                expected.add('run_cascade_results.csv')
+            assert set(in_memory) == expected, sorted(in_memory)
+            assert streamed == in_memory, [name for name in expected if streamed.get(name) != in_memory[name]]
+
+            # Streaming counts duplicates within each chunk, keeping memory bounded
+            assert "Sequences: 55\nUnique sequences: 32\nDedup ratio: 41.8% duplicates" in memory_summary
+            assert ("Sequences: 55\nUnique sequences within chunks: 55\n"
+                    "Dedup ratio within chunks: 0.0% duplicates\nChunk size: 7") in stream_summary
+
+    # predict() with chunk_size still returns the per-sequence frame
+    classifier = _stub_classifier()
+    for phase in (1, 4):
+        expected = classifier.predict(phase, str(PROTEIN_FASTA), prompt_thresholds=False)
+        streamed = classifier.predict(phase, str(PROTEIN_FASTA), prompt_thresholds=False, chunk_size=7)
+        pd.testing.assert_frame_equal(streamed, expected)
+    return True
+
+
+def test_streaming_cascade_with_failing_phase():
+    """A phase that fails keeps every streamed cascade chunk aligned with the header."""
+    def failing_classifier():
+        classifier = _stub_classifier()
+
+        def fail(features):
+            raise RuntimeError("stub phase 2 failure")
+
+        classifier.loaded_models[2] = StubKerasModel(fail)
+        return classifier
+
+    with tempfile.TemporaryDirectory() as tmp:
+        in_memory, _ = _run_files(tmp, 'memory', True, classifier=failing_classifier())
+        streamed, _ = _run_files(tmp, 'stream', True, chunk_size=7, classifier=failing_classifier())
+        assert streamed['run_cascade_results.csv'] == in_memory['run_cascade_results.csv']
+        merged = pd.read_csv(Path(tmp) / 'stream' / 'run_cascade_results.csv')
+
+    assert len(merged) == 55 and len(merged.columns) == 11
+    virus = merged['Phase_1_Prediction'] == 'Virus'
+    assert virus.sum() == 26
+    for column in ('Phase_2_Prediction', 'Phase_2_Confidence'):
+        assert (merged.loc[virus, column] == 'ERROR').all()
+        assert (merged.loc[~virus, column] == COVIDClassifier.NOT_EVALUATED).all()
+    assert (merged['Phase_5_Confidence'] == COVIDClassifier.NOT_EVALUATED).all()
+    return True
+
+
+def main():
+    """Main test function."""
+    print("Pipeline Run Tests")
+    print("=" * 50)
+
+    tests = [
+        ("Cascade routing", test_cascade_routing),
+        ("Streaming matches in-memory", test_streaming_matches_in_memory),
+        ("Streaming cascade with failing phase", test_streaming_cascade_with_failing_phase),
+        ("CKSAAP computed once", test_cksaap_computed_once),
+        ("Single-phase CLI", test_single_phase_cli),
+        ("Unreadable input reports failure", test_unreadable_input_reports_failure),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+            print(f"{test_name}: PASSED")
+        except AssertionError as e:
+            print(f"{test_name}: FAILED {e}")
+
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
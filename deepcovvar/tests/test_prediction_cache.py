@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Tests for the persistent prediction cache.
+
+Covers hit/miss counting, invalidation when a model file changes, separate
+entries per model variant, stored file digests and size-bounded eviction
+without counting the table on every insert.
+"""
+
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# Add the repository root to the path to import DeepCovVar modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.absolute()))
+
+import deepcovvar.utils.prediction_cache as prediction_cache
+from deepcovvar.utils.prediction_cache import PredictionCache, file_digest
+
+
+def test_hits_and_misses():
+    """Stored vectors come back unchanged and are counted as hits."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = PredictionCache(Path(tmp) / "cache.sqlite")
+        probs = np.array([0.1, 0.7, 0.2], dtype=np.float32)
+
+        assert cache.get_many(5, "model-a", ["seq1"]) == {}
+        cache.put_many(5, "model-a", {"seq1": probs})
+        found = cache.get_many(5, "model-a", ["seq1", "seq2"])
+
+        assert np.array_equal(found["seq1"], probs)
+        assert "seq2" not in found
+        assert cache.stats() == {'hits': 1, 'misses': 2, 'entries': 1}
+        cache.close()
+    return True
+
+
+def test_model_change_invalidates_phase():
+    """A new model digest drops only that phase's entries, also across reopen."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "cache.sqlite"
+        cache = PredictionCache(path)
+        cache.put_many(1, "model-a", {"seq1": np.array([0.9], dtype=np.float32)})
+        cache.put_many(2, "model-b", {"seq1": np.array([0.3], dtype=np.float32)})
+        cache.close()
+
+        cache = PredictionCache(path)
+        assert cache.get_many(1, "model-a2", ["seq1"]) == {}
+        assert "seq1" in cache.get_many(2, "model-b", ["seq1"])
+        cache.close()
+    return True
+
+
+def test_model_variants_coexist():
+    """Switching a phase's model variant keeps the other variant's entries."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = PredictionCache(Path(tmp) / "cache.sqlite")
+        cache.put_many(5, "esm", {"seq1": np.array([0.9], dtype=np.float32)})
+        cache.put_many(5, "esm-int8", {"seq1": np.array([0.8], dtype=np.float32)},
+                       variant="int8-dynamic")
+
+        assert cache.get_many(5, "esm", ["seq1"])["seq1"][0] == np.float32(0.9)
+        assert cache.get_many(5, "esm-int8", ["seq1"], variant="int8-dynamic")["seq1"][0] == np.float32(0.8)
+        assert cache.get_many(5, "esm2", ["seq1"]) == {}
+        assert "seq1" in cache.get_many(5, "esm-int8", ["seq1"], variant="int8-dynamic")
+        cache.close()
+    return True
+
+
+def test_file_digests_are_stored():
+    """Unchanged model files are hashed once, even by a new cache instance."""
+    hashed = []
+
+    def counting_digest(paths, *args, **kwargs):
+        hashed.extend(paths)
+        return file_digest(paths, *args, **kwargs)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "cache.sqlite"
+        model_file = Path(tmp) / "model.keras"
+        model_file.write_bytes(b"weights-v1")
+        prediction_cache.file_digest = counting_digest
+        try:
+            first = PredictionCache(path).files_digest([model_file])
+            assert first == file_digest([model_file])
+            assert PredictionCache(path).files_digest([model_file]) == first
+            assert hashed == [model_file]
+
+            model_file.write_bytes(b"weights-v2-longer")
+            assert PredictionCache(path).files_digest([model_file]) != first
+            assert hashed == [model_file, model_file]
+        finally:
+            prediction_cache.file_digest = file_digest
+    return True
+
+
+def test_old_schema_is_rebuilt():
+    """A cache written before variants were keyed is dropped rather than misread."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "cache.sqlite"
+        conn = sqlite3.connect(str(path))
+        conn.executescript("""
+            CREATE TABLE models (phase INTEGER PRIMARY KEY, digest TEXT NOT NULL);
+            CREATE TABLE predictions (phase INTEGER NOT NULL, seq_hash TEXT NOT NULL,
+                                      probs BLOB NOT NULL, last_used REAL NOT NULL,
+                                      PRIMARY KEY (phase, seq_hash));
+            INSERT INTO predictions VALUES (1, 'seq1', x'00000000', 0);
+        """)
+        conn.close()
+
+        cache = PredictionCache(path)
+        assert cache.stats()['entries'] == 0
+        cache.put_many(1, "model", {"seq1": np.array([0.5], dtype=np.float32)})
+        assert "seq1" in cache.get_many(1, "model", ["seq1"])
+        cache.close()
+    return True
+
+
+def test_eviction_keeps_recent_entries():
+    """The cache never grows past max_entries and evicts least recently used rows."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = PredictionCache(Path(tmp) / "cache.sqlite", max_entries=3)
+        for i in range(3):
+            cache.put_many(1, "model", {f"seq{i}": np.array([i], dtype=np.float32)})
+        cache.get_many(1, "model", ["seq0"])
+        cache.put_many(1, "model", {"seq3": np.array([3], dtype=np.float32)})
+
+        assert cache.stats()['entries'] == 3
+        remaining = cache.get_many(1, "model", ["seq0", "seq1", "seq2", "seq3"])
+        assert "seq0" in remaining and "seq3" in remaining
+        assert "seq1" not in remaining
+        cache.close()
+    return True
+
+
+def test_eviction_counts_rows_rarely():
+    """Inserts below max_entries do not count the table; replaced rows do not trigger eviction."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = PredictionCache(Path(tmp) / "cache.sqlite", max_entries=4)
+        statements = []
+        cache.conn.set_trace_callback(statements.append)
+        for i in range(4):
+            cache.put_many(1, "model", {f"seq{i}": np.array([i], dtype=np.float32)})
+        assert not [s for s in statements if 'COUNT(*)' in s]
+
+        # The estimate passes max_entries, but an exact count finds nothing to evict
+        cache.put_many(1, "model", {"seq0": np.array([5], dtype=np.float32)})
+        assert len([s for s in statements if 'COUNT(*)' in s]) == 1
+        cache.conn.set_trace_callback(None)
+        assert cache.stats()['entries'] == 4
+        assert len(cache.get_many(1, "model", [f"seq{i}" for i in range(4)])) == 4
+        cache.close()
+    return True
+
+
+def test_file_digest_tracks_contents():
+    """The model digest changes when the file contents change."""
+    with tempfile.TemporaryDirectory() as tmp:
+        model_file = Path(tmp) / "model.keras"
+        model_file.write_bytes(b"weights-v1")
+        first = file_digest([model_file])
+        model_file.write_bytes(b"weights-v2")
+        assert file_digest([model_file]) != first
+    return True
+
+
+def main():
+    """Main test function."""
+    print("Prediction Cache Tests")
+    print("=" * 50)
+
+    tests = [
+        ("Hits and misses", test_hits_and_misses),
+        ("Model invalidation", test_model_change_invalidates_phase),
+        ("Model variants coexist", test_model_variants_coexist),
+        ("Stored file digests", test_file_digests_are_stored),
+        ("Old schema rebuilt", test_old_schema_is_rebuilt),
+        ("Eviction", test_eviction_keeps_recent_entries),
+        ("Eviction counts rows rarely", test_eviction_counts_rows_rarely),
+        ("File digest", test_file_digest_tracks_contents),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+            print(f"{test_name}: PASSED")
+        except AssertionError as e:
+            print(f"{test_name}: FAILED {e}")
+
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Tests for sharded Prodigal conversion: records are split into base-balanced
+shards, translated by concurrent processes over pipes, and returned in order.
+"""
+
+import os
+import stat
+import sys
+import tempfile
+from pathlib import Path
+
+# Add the repository root to the path to import DeepCovVar modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.absolute()))
+
+from deepcovvar.utils.sequence_converter import ProdigalConverter
+
+# Reads FASTA on stdin and writes one "protein" per record to the -a target; the
+# first shard sleeps longest so shards finish out of order
+FAKE_PRODIGAL = '''#!{python}
+import sys, time
+args = sys.argv[1:]
+assert '-i' not in args
+out = args[args.index('-a') + 1]
+records = [r.split('\\n', 1) for r in sys.stdin.read().split('>') if r]
+if records[0][0].startswith('g0_'):
+    time.sleep(0.5)
+with open(out, 'w') as handle:
+    for header, seq in records:
+        handle.write(">%s_1 # 1 # %d # 1\\nM%s\\n" % (header.split()[0], len(seq), seq.strip()[:5]))
+'''
+
+
+def _fake_prodigal(directory):
+    path = Path(directory) / "prodigal"
+    path.write_text(FAKE_PRODIGAL.format(python=sys.executable))
+    path.chmod(path.stat().st_mode | stat.S_IEXEC)
+    return str(path)
+
+
+def test_shard_bounds():
+    """Shards are contiguous, cover every record, balance bases and respect min_bases."""
+    lengths = [30000] * 10 + [1000] * 5
+    bounds = ProdigalConverter.shard_bounds(lengths, 4, min_bases=1)
+    assert bounds[0][0] == 0 and bounds[-1][1] == len(lengths) and len(bounds) == 4
+    assert all(prev[1] == nxt[0] for prev, nxt in zip(bounds, bounds[1:]))
+
+    assert ProdigalConverter.shard_bounds(lengths, 4) == [(0, 4), (4, 7), (7, 15)]
+    assert ProdigalConverter.shard_bounds([30000] * 3, 8) == [(0, 3)]
+    assert ProdigalConverter.shard_bounds([], 4) == []
+    return True
+
+
+def test_sharded_conversion_keeps_order():
+    """Concurrent shards come back in input order and match a single process."""
+    with tempfile.TemporaryDirectory() as tmp:
+        converter = ProdigalConverter(_fake_prodigal(tmp), workers=3)
+        seq_ids = [f"g{i}_x" for i in range(9)]
+        sequences = ["ACGTACGTAC" * 20000] * 9
+
+        shards = list(converter.iter_convert_sequences(sequences, seq_ids))
+        assert [shard for shard, _, _ in shards] == [(0, 3), (3, 6), (6, 9)]
+        proteins, protein_ids = converter.convert_sequences_in_memory(sequences, seq_ids)
+        assert protein_ids == [f"{seq_id}_1" for seq_id in seq_ids]
+
+        converter.workers = 1
+        assert converter.convert_sequences_in_memory(sequences, seq_ids) == (proteins, protein_ids)
+    return True
+
+
+def test_file_conversion_and_failure():
+    """The file API writes Prodigal's FASTA in order; a failing process raises RuntimeError."""
+    with tempfile.TemporaryDirectory() as tmp:
+        converter = ProdigalConverter(_fake_prodigal(tmp), workers=2)
+        input_file, output_file = Path(tmp) / "in.fasta", Path(tmp) / "out.faa"
+        input_file.write_text(''.join(f">g{i}_x\n{'ACGT' * 30000}\n" for i in range(4)))
+        converter.convert_nucleotide_to_protein(str(input_file), str(output_file))
+        headers = [line for line in output_file.read_text().splitlines() if line.startswith('>')]
+        assert [header.split()[0] for header in headers] == [f">g{i}_x_1" for i in range(4)]
+
+        failing = Path(tmp) / "failing"
+        failing.write_text("#!/bin/sh\necho broken >&2\nexit 1\n")
+        failing.chmod(failing.stat().st_mode | stat.S_IEXEC)
+        try:
+            ProdigalConverter(str(failing)).convert_sequences_in_memory(['ACGT'], ['g0'])
+        except RuntimeError as e:
+            assert 'broken' in str(e)
+        else:
+            raise AssertionError("failing Prodigal did not raise")
+    return True
+
+
+def main():
+    """Main test function."""
+    print("Sharded Prodigal Conversion Tests")
+    print("=" * 50)
+
+    if os.name != 'posix':
+        print("Skipped: the Prodigal stand-in needs a POSIX shell")
+        return 0
+
+    tests = [
+        ("Shard bounds", test_shard_bounds),
+        ("Order across concurrent shards", test_sharded_conversion_keeps_order),
+        ("File conversion and failures", test_file_conversion_and_failure),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+            print(f"{test_name}: PASSED")
+        except AssertionError as e:
+            print(f"{test_name}: FAILED {e}")
+
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Tests for the CPU resource planner: cgroup quota detection and the split of
+cores between featurization and the inference backends.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add the repository root to the path to import DeepCovVar modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.absolute()))
+
+from deepcovvar.utils.resources import cgroup_cpu_quota, plan_resources
+
+KERAS_PHASES = ['keras'] * 4
+ALL_PHASES = KERAS_PHASES + ['pytorch_transformer']
+
+
+def _write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+def test_cgroup_quota():
+    """cgroup v2 cpu.max (own cgroup first) and v1 cfs files are read; 'max' and -1 are unlimited."""
+    with tempfile.TemporaryDirectory() as tmp:
+        root, proc = Path(tmp) / 'cgroup', Path(tmp) / 'proc_cgroup'
+        _write(proc, "0::/\n")
+        assert cgroup_cpu_quota(root, proc) is None
+
+        _write(root / 'cpu.max', "max 100000\n")
+        assert cgroup_cpu_quota(root, proc) is None
+        _write(root / 'cpu.max', "250000 100000\n")
+        assert cgroup_cpu_quota(root, proc) == 2.5
+
+        _write(proc, "0::/app.slice/job\n")
+        _write(root / 'app.slice' / 'job' / 'cpu.max', "100000 100000\n")
+        assert cgroup_cpu_quota(root, proc) == 1.0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root, proc = Path(tmp) / 'cgroup', Path(tmp) / 'proc_cgroup'
+        _write(proc, "4:cpu,cpuacct:/docker/abc\n")
+        _write(root / 'cpu' / 'cpu.cfs_period_us', "100000\n")
+        _write(root / 'cpu' / 'cpu.cfs_quota_us', "-1\n")
+        assert cgroup_cpu_quota(root, proc) is None
+        _write(root / 'cpu' / 'cpu.cfs_quota_us', "400000\n")
+        assert cgroup_cpu_quota(root, proc) == 4.0
+    return True
+
+
+def test_plan_by_phase():
+    """Featurization workers only for Keras phases; every backend gets all cores otherwise."""
+    plan = plan_resources(ALL_PHASES, cores=8)
+    assert plan.feature_workers == 8
+    assert (plan.tf_intra_threads, plan.tf_inter_threads, plan.torch_threads) == (8, 1, 8)
+
+    plan = plan_resources(['pytorch_transformer'], cores=8)
+    assert plan.feature_workers == 1 and plan.torch_threads == 8
+    assert 'featurization' not in plan.describe() and 'TensorFlow' not in plan.describe()
+
+    plan = plan_resources(KERAS_PHASES, cores=8, fused=True)
+    assert plan.tf_inter_threads == 4
+    plan = plan_resources(KERAS_PHASES, cores=1, fused=True)
+    assert (plan.feature_workers, plan.tf_intra_threads, plan.tf_inter_threads) == (1, 1, 1)
+    return True
+
+
+def test_plan_streaming_and_overrides():
+    """Streaming splits cores between featurization and inference; explicit values win."""
+    plan = plan_resources(ALL_PHASES, cores=8, overlap=True)
+    assert plan.feature_workers == 4
+    assert plan.tf_intra_threads == 4 and plan.torch_threads == 4
+
+    assert plan.prodigal_workers == 1
+
+    plan = plan_resources(ALL_PHASES, cores=8, overlap=True, workers=2, torch_threads=3,
+                          prodigal_workers=8)
+    assert plan.feature_workers == 2 and plan.prodigal_workers == 8
+    assert plan.tf_intra_threads == 6 and plan.torch_threads == 3
+
+    plan = plan_resources(ALL_PHASES, cores=8, backend='onnx', onnx_threads=5)
+    assert plan.onnx_threads == 5
+    assert 'onnxruntime 5 threads' in plan.describe() and 'TensorFlow' not in plan.describe()
+    return True
+
+
+def main():
+    """Main test function."""
+    print("Resource Planner Tests")
+    print("=" * 50)
+
+    tests = [
+        ("cgroup quota", test_cgroup_quota),
+        ("Plan by phase", test_plan_by_phase),
+        ("Streaming and overrides", test_plan_streaming_and_overrides),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+            print(f"{test_name}: PASSED")
+        except AssertionError as e:
+            print(f"{test_name}: FAILED {e}")
+
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Tests for columnar result assembly: numeric confidence and probability
+columns, formatted as percentages only when written.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add the repository root to the path to import DeepCovVar modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.absolute()))
+
+from deepcovvar.covid_classifier import COVIDClassifier
+from deepcovvar.utils.deepcovvar_utils import format_percentages
+
+CLASSES = ['Alpha', 'Beta', 'Gamma']
+
+
+def _legacy_rows(classes, seq_ids, predicted_classes, confidence_scores, class_probabilities):
+    """Rows as predict() used to build them, one f-string at a time."""
+    rows = []
+    for i, (seq_id, pred_class, confidence) in enumerate(zip(seq_ids, predicted_classes, confidence_scores)):
+        row = {'Sequence_ID': seq_id,
+               'Predicted_Class': classes[pred_class] if pred_class < len(classes) else 'Unknown',
+               'Confidence': f"{confidence:.2%}"}
+        for j, class_name in enumerate(classes):
+            row[f'{class_name}_Probability'] = (f"{class_probabilities[i][j]:.2%}"
+                                                if j < len(class_probabilities[i]) else "0.00%")
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def test_columnar_frame_matches_row_by_row():
+    """Formatted columnar results equal the old per-row strings, binary and multi-class."""
+    rng = np.random.default_rng(0)
+    for width in (1, 3, 4):
+        outputs = rng.random((500, width)).astype(np.float32)
+        if width > 1:
+            outputs /= outputs.sum(axis=1, keepdims=True)
+        outputs[7] = np.nan
+        config = {'classes': CLASSES[:2] if width == 1 else CLASSES}
+        classifier = COVIDClassifier.__new__(COVIDClassifier)
+        arrays = classifier._assign_classes(outputs, config, None)
+        seq_ids = [f"seq{i}" for i in range(len(outputs))]
+
+        results = COVIDClassifier._results_frame(config['classes'], seq_ids, *arrays)
+        assert results['Confidence'].dtype.kind == 'f'
+        expected = _legacy_rows(config['classes'], seq_ids, *arrays)
+        assert format_percentages(results).astype(str).equals(expected.astype(str))
+    return True
+
+
+def test_write_results_formats_at_write_time():
+    """write_results writes percentages by default and fractions with percentages=False."""
+    results = COVIDClassifier._results_frame(
+        CLASSES[:2], ['a', 'b'], np.array([0, 1]), np.array([0.9725, 0.5], dtype=np.float32),
+        np.array([[0.9725, 0.0275], [0.5, 0.5]], dtype=np.float32))
+    classifier = COVIDClassifier.__new__(COVIDClassifier)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "results.csv"
+        classifier.percentages = True
+        classifier.write_results(results, path)
+        assert pd.read_csv(path)['Confidence'].tolist() == ['97.25%', '50.00%']
+        classifier.percentages = False
+        classifier.write_results(results, path)
+        assert np.allclose(pd.read_csv(path)['Confidence'], [0.9725, 0.5])
+    return True
+
+
+def test_placeholders_are_kept():
+    """Cascade placeholders survive formatting next to numeric confidences."""
+    merged = pd.DataFrame({'Sequence_ID': ['a', 'b'],
+                           'Phase_1_Confidence': pd.Series([0.5, 'Not evaluated'], dtype=object)})
+    formatted = format_percentages(merged)
+    assert formatted['Phase_1_Confidence'].tolist() == ['50.00%', 'Not evaluated']
+    assert merged['Phase_1_Confidence'].tolist() == [0.5, 'Not evaluated']
+    return True
+
+
+def main():
+    """Main test function."""
+    print("Result Formatting Tests")
+    print("=" * 50)
+
+    tests = [
+        ("Columnar parity", test_columnar_frame_matches_row_by_row),
+        ("Write-time formatting", test_write_results_formats_at_write_time),
+        ("Cascade placeholders", test_placeholders_are_kept),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+            print(f"{test_name}: PASSED")
+        except AssertionError as e:
+            print(f"{test_name}: FAILED {e}")
+
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
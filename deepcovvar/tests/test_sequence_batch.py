@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Tests for SequenceBatch, the integer-encoded batch that detection, CKSAAP
+featurization and ESM-2 tokenization share without re-encoding the sequences.
+"""
+
+import re
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add the repository root to the path to import DeepCovVar modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.absolute()))
+
+from deepcovvar.utils import FEATURE, SequenceBatch
+from deepcovvar.utils.deepcovvar_utils import deduplicate_sequences
+from deepcovvar.utils.sequence_converter import SequenceTypeDetector
+
+MODELS_DIR = Path(__file__).parent.parent / "models"
+SEQUENCES = ["MKTAYIAKQR", "", "acgtnACGT", "MK*-XBJ*", "PEPTIDEPEPTIDE"]
+
+
+def test_layout_and_slicing():
+    """One uint8 array plus offsets; slices share the residues, take copies them."""
+    batch = SequenceBatch.from_strings(SEQUENCES, [f"s{i}" for i in range(len(SEQUENCES))])
+    assert batch.data.dtype == np.uint8 and len(batch.data) == sum(map(len, SEQUENCES))
+    assert batch.offsets.tolist() == [0, 10, 10, 19, 27, 41]
+    assert list(batch) == SEQUENCES and batch[3] == SEQUENCES[3] and batch[-1] == SEQUENCES[-1]
+    assert SequenceBatch.from_strings(batch) is batch
+
+    view = batch[2:4]
+    assert np.shares_memory(view.data, batch.data) and view.offsets[0] == 0
+    assert list(view) == SEQUENCES[2:4] and view.ids == ["s2", "s3"]
+    assert list(batch[::2]) == SEQUENCES[::2] and len(batch[3:1]) == 0
+
+    taken = batch.take([4, 0, 1])
+    assert list(taken) == [SEQUENCES[4], SEQUENCES[0], ""] and taken.ids == ["s4", "s0", "s1"]
+    assert batch.owner().tolist() == np.repeat(np.arange(5), batch.lengths).tolist()
+    try:
+        SequenceBatch.from_strings(SEQUENCES, ["only one id"])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("mismatched IDs were accepted")
+    return True
+
+
+def test_stages_share_the_batch():
+    """Cleaning, prefixes, CKSAAP, detection and deduplication agree with the string paths."""
+    batch = SequenceBatch.from_strings(SEQUENCES)
+    assert list(batch.cleaned()) == [re.sub('[^ARNDCQEGHILKMFPSTWYV]', '', seq) for seq in SEQUENCES]
+    assert batch.residue_mask().sum() == len(batch.cleaned().data)
+    assert list(batch.prefixes(4)) == [seq[:4] for seq in SEQUENCES]
+
+    extractor = FEATURE()
+    assert np.array_equal(extractor.CKSAAP_batch(batch, gap=5, clean=True, chunk_size=2),
+                          extractor.CKSAAP_batch(SEQUENCES, gap=5, clean=True))
+
+    detector = SequenceTypeDetector()
+    expected = [detector.is_nucleotide(seq) for seq in SEQUENCES]
+    assert detector.is_nucleotide_batch(batch).tolist() == expected
+    assert detector.is_nucleotide_batch(SequenceBatch.from_strings(['ACGT' * 3 + 'MKLV' * 9]),
+                                        sample_length=12).tolist() == [True]
+
+    unique, first_index, inverse = deduplicate_sequences(SequenceBatch.from_strings(SEQUENCES * 2))
+    assert isinstance(unique, SequenceBatch) and list(unique) == SEQUENCES
+    assert first_index.tolist() == list(range(5)) and inverse.tolist() == list(range(5)) * 2
+    return True
+
+
+def test_token_ids():
+    """Residues map to ESM-2 token IDs with <cls>/<eos>, padding and truncation."""
+    vocab = (MODELS_DIR / "vocab.txt").read_text().split()
+    table = np.full(256, vocab.index('<unk>'), dtype=np.int64)
+    for token_id, token in enumerate(vocab):
+        if len(token) == 1:
+            table[ord(token)] = token_id
+
+    codes, mask = SequenceBatch.from_strings(["MKT", "M", ""]).padded(table, prefix=0, suffix=2, pad=1)
+    assert codes.tolist() == [[0, 20, 15, 11, 2], [0, 20, 2, 1, 1], [0, 2, 1, 1, 1]]
+    assert mask.tolist() == [[1, 1, 1, 1, 1], [1, 1, 1, 0, 0], [1, 1, 0, 0, 0]]
+    codes, _ = SequenceBatch.from_strings(["MKTAYIA"]).padded(table, max_length=4, prefix=0, suffix=2)
+    assert codes.tolist() == [[0, 20, 15, 2]]
+
+    try:
+        from transformers import AutoTokenizer
+        tokenizer = AutoTokenizer.from_pretrained(str(MODELS_DIR))
+    except Exception:
+        print("  (transformers not available; tokenizer comparison skipped)")
+        return True
+
+    from deepcovvar.covid_classifier import COVIDClassifier
+    classifier = COVIDClassifier.__new__(COVIDClassifier)
+    classifier.tokenizer = tokenizer
+    sequences = ["MKT*", "MK**T", "mkTJ", "A" * 600, "", "MK T", "MKTAYIAKQR"]
+    for batch in (sequences[:5], sequences):
+        input_ids, attention_mask = classifier.tokenize_sequences(
+            SequenceBatch.from_strings(batch), return_tensors='np')
+        expected = tokenizer(batch, padding=True, truncation=True, max_length=512, return_tensors='np')
+        assert np.array_equal(input_ids, expected['input_ids'])
+        assert np.array_equal(attention_mask, expected['attention_mask'])
+    return True
+
+
+def main():
+    """Main test function."""
+    print("Sequence Batch Tests")
+    print("=" * 50)
+
+    tests = [
+        ("Layout and slicing", test_layout_and_slicing),
+        ("Stages share the batch", test_stages_share_the_batch),
+        ("Token IDs", test_token_ids),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+            print(f"{test_name}: PASSED")
+        except AssertionError as e:
+            print(f"{test_name}: FAILED {e}")
+
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
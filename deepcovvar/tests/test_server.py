@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Round-trip tests for the warm inference daemon.
+
+A stub classifier stands in for COVIDClassifier so the JSON-lines protocol,
+threshold mapping and error reporting are exercised without loading models.
+"""
+
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+# Add the repository root to the path to import DeepCovVar modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.absolute()))
+
+from deepcovvar.server import (create_server, create_token, daemon_available, daemon_info,
+                               load_token, option_mismatches, send_request)
+
+
+class StubClassifier:
+    """Answers predict() with the thresholds it was given."""
+
+    models_config = {1: {'classes': ['Virus', 'Non-virus']}}
+    loaded_models = {1: object()}
+
+    def _prepare_chunk(self, records, auto_convert=True):
+        return records, [seq.upper() for _, seq in records], [seq_id for seq_id, _ in records]
+
+    def predict(self, phase, input_file, custom_thresholds=None, sequences=None,
+                seq_ids=None, prompt_thresholds=True):
+        assert not prompt_thresholds
+        threshold = (custom_thresholds or {}).get('Virus', 0.5)
+        return pd.DataFrame({
+            'Sequence_ID': seq_ids,
+            'Length': [len(seq) for seq in sequences],
+            'Threshold': [threshold] * len(sequences),
+        })
+
+
+def serve(socket_path):
+    server = create_server(StubClassifier(), socket_path=socket_path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def test_unix_socket_round_trip():
+    """Requests over a Unix socket reach the classifier and errors come back as RuntimeError."""
+    with tempfile.TemporaryDirectory() as tmp:
+        socket_path = str(Path(tmp) / 'serve.sock')
+        assert not daemon_available(socket_path)
+        server = serve(socket_path)
+        try:
+            assert daemon_available(socket_path)
+            assert send_request({'command': 'ping'}, socket_path)['loaded_phases'] == [1]
+
+            response = send_request({'command': 'predict', 'phase': 1,
+                                     'fasta': '>a\nmkt\n>b\nMKTAYIA\n'}, socket_path)
+            assert [row['Sequence_ID'] for row in response['results']] == ['a', 'b']
+            assert [row['Length'] for row in response['results']] == [3, 7]
+            assert response['results'][0]['Threshold'] == 0.5
+
+            response = send_request({'command': 'predict', 'phase': 1, 'sequences': ['MKT'],
+                                     'thresholds': [80, 20]}, socket_path)
+            assert response['results'][0]['Sequence_ID'] == 'seq_1'
+            assert response['results'][0]['Threshold'] == 0.8
+
+            try:
+                send_request({'command': 'bogus'}, socket_path)
+                assert False, "unknown command should fail"
+            except RuntimeError as e:
+                assert 'Unknown command' in str(e)
+        finally:
+            server.shutdown()
+            server.server_close()
+    return True
+
+
+def test_options_and_phase_thresholds():
+    """Ping reports the daemon's options; mismatched requests are rejected, matching ones served."""
+    with tempfile.TemporaryDirectory() as tmp:
+        socket_path = str(Path(tmp) / 'serve.sock')
+        options = {'backend': 'native', 'converter': 'auto'}
+        server = create_server(StubClassifier(), socket_path=socket_path, options=options)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            info = daemon_info(socket_path)
+            assert info['options'] == options
+            assert info['phases']['1']['classes'] == ['Virus', 'Non-virus']
+            assert option_mismatches({'backend': 'onnx', 'converter': 'auto'}, info['options']) == \
+                ["backend='onnx' (daemon: 'native')"]
+
+            try:
+                send_request({'command': 'predict', 'phase': 1, 'sequences': ['MKT'],
+                              'options': {'backend': 'onnx', 'converter': 'auto'}}, socket_path)
+                assert False, "mismatched options should fail"
+            except RuntimeError as e:
+                assert "backend='onnx'" in str(e)
+
+            response = send_request({'command': 'predict', 'phase': 1, 'sequences': ['MKT'],
+                                     'options': options, 'thresholds': [80, 20],
+                                     'phase_thresholds': {'1': {'Virus': 0.3, 'Non-virus': 0.7}}},
+                                    socket_path)
+            assert response['results'][0]['Threshold'] == 0.3
+        finally:
+            server.shutdown()
+            server.server_close()
+    return True
+
+
+def test_tcp_requires_token():
+    """A TCP daemon needs a token and refuses requests without the right one."""
+    try:
+        create_server(StubClassifier(), port=0)
+        assert False, "TCP without a token should fail"
+    except ValueError:
+        pass
+
+    with tempfile.TemporaryDirectory() as tmp:
+        token_file = str(Path(tmp) / 'serve.token')
+        token = create_token(token_file)
+        assert (os.stat(token_file).st_mode & 0o777) == 0o600
+        assert load_token(token_file) == token
+
+        server = create_server(StubClassifier(), port=0, token=token)
+        port = server.server_address[1]
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            request = {'command': 'predict', 'phase': 1, 'sequences': ['MKT']}
+            for wrong in ('', 'not-the-token'):
+                try:
+                    send_request(request, port=port, token=wrong or None)
+                    assert False, "request without the token should fail"
+                except RuntimeError as e:
+                    assert 'token' in str(e)
+            assert not daemon_available(port=port)
+            response = send_request(request, port=port, token=token)
+            assert response['results'][0]['Sequence_ID'] == 'seq_1'
+        finally:
+            server.shutdown()
+            server.server_close()
+    return True
+
+
+def main():
+    """Main test function."""
+    print("Inference Daemon Tests")
+    print("=" * 50)
+
+    tests = [
+        ("Unix socket round trip", test_unix_socket_round_trip),
+        ("Options and phase thresholds", test_options_and_phase_thresholds),
+        ("TCP requires token", test_tcp_requires_token),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+            print(f"{test_name}: PASSED")
+        except AssertionError as e:
+            print(f"{test_name}: FAILED {e}")
+
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Tests for the threaded producer/consumer pipeline used by streaming runs.
+
+Checks ordering, that stages really overlap, error propagation, and that
+closing the consumer early does not leave stage threads blocked.
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add the repository root to the path to import DeepCovVar modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.absolute()))
+
+from deepcovvar.utils.deepcovvar_utils import staged_pipeline
+
+
+def test_pipeline_preserves_order():
+    """Every item passes through every stage, in source order."""
+    results = list(staged_pipeline(range(50), [lambda x: x + 1, lambda x: x * 2], maxsize=1))
+    assert results == [(x + 1) * 2 for x in range(50)]
+    assert list(staged_pipeline([], [lambda x: x])) == []
+    return True
+
+
+def test_pipeline_overlaps_stages():
+    """Two 50 ms stages over 6 items take about 7 steps, not 12."""
+    def slow(x):
+        time.sleep(0.05)
+        return x
+
+    start = time.time()
+    assert list(staged_pipeline(range(6), [slow, slow])) == list(range(6))
+    assert time.time() - start < 0.5
+    return True
+
+
+def test_pipeline_propagates_errors():
+    """Exceptions from a stage or from the source reach the consumer."""
+    def fail_on_three(x):
+        if x == 3:
+            raise ValueError("bad item")
+        return x
+
+    seen = []
+    try:
+        for item in staged_pipeline(range(10), [fail_on_three]):
+            seen.append(item)
+        assert False, "stage error should propagate"
+    except ValueError as e:
+        assert str(e) == "bad item"
+    assert seen == [0, 1, 2]
+
+    def broken_source():
+        yield 1
+        raise IOError("read failed")
+
+    try:
+        list(staged_pipeline(broken_source(), [lambda x: x]))
+        assert False, "source error should propagate"
+    except IOError as e:
+        assert str(e) == "read failed"
+    return True
+
+
+def test_pipeline_early_close_releases_threads():
+    """Abandoning the consumer stops the stage threads."""
+    # Compare thread objects, not counts: threads of earlier tests may still be exiting
+    before = set(threading.enumerate())
+    pipeline = staged_pipeline(iter(range(1000)), [lambda x: x, lambda x: x], maxsize=1)
+    assert next(pipeline) == 0
+    started = set(threading.enumerate()) - before
+    assert started
+    pipeline.close()
+
+    deadline = time.time() + 2.0
+    while any(thread.is_alive() for thread in started) and time.time() < deadline:
+        time.sleep(0.05)
+    assert not any(thread.is_alive() for thread in started)
+    return True
+
+
+def main():
+    """Main test function."""
+    print("Staged Pipeline Tests")
+    print("=" * 50)
+
+    tests = [
+        ("Order", test_pipeline_preserves_order),
+        ("Overlap", test_pipeline_overlaps_stages),
+        ("Error propagation", test_pipeline_propagates_errors),
+        ("Early close", test_pipeline_early_close_releases_threads),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+            print(f"{test_name}: PASSED")
+        except AssertionError as e:
+            print(f"{test_name}: FAILED {e}")
+
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Tests for the length-bucketed, token-budget batch planner used by phase 5.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add the repository root to the path to import DeepCovVar modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.absolute()))
+
+from deepcovvar.utils.deepcovvar_utils import plan_token_batches
+
+
+def test_batches_cover_every_sequence_once():
+    """Every input index appears in exactly one batch."""
+    rng = np.random.default_rng(0)
+    lengths = rng.integers(20, 1300, size=200)
+    batches, _ = plan_token_batches(lengths, max_tokens=4096)
+
+    covered = np.concatenate(batches)
+    assert sorted(covered.tolist()) == list(range(len(lengths)))
+    return True
+
+
+def test_batches_respect_token_budget():
+    """Padded size stays under budget, except single over-long sequences."""
+    lengths = [10, 600, 30, 510, 45, 2000, 12, 300]
+    batches, _ = plan_token_batches(lengths, max_tokens=1024)
+
+    for batch in batches:
+        width = min(max(lengths[i] for i in batch) + 2, 512)
+        assert len(batch) == 1 or len(batch) * width <= 1024
+    return True
+
+
+def test_sorting_reduces_padding():
+    """Mixed short ORFs and long proteins pad far less once length-sorted."""
+    lengths = [50, 1273] * 16
+    _, padding_ratio = plan_token_batches(lengths, max_tokens=8 * 512)
+
+    # Fixed batches of 8 in input order pad every short ORF to 512 tokens
+    token_lengths = np.minimum(np.array(lengths) + 2, 512)
+    fixed_ratio = 1.0 - token_lengths.sum() / (len(lengths) * 512)
+    assert padding_ratio < fixed_ratio
+    assert padding_ratio < 0.05
+    return True
+
+
+def main():
+    """Main test function."""
+    print("Token Batching Tests")
+    print("=" * 50)
+
+    tests = [
+        ("Coverage", test_batches_cover_every_sequence_once),
+        ("Token budget", test_batches_respect_token_budget),
+        ("Padding reduction", test_sorting_reduces_padding),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+            print(f"{test_name}: PASSED")
+        except AssertionError as e:
+            print(f"{test_name}: FAILED {e}")
+
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
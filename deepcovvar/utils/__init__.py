@@ -6,16 +6,24 @@ This package contains utility modules for the DeepCovVar project:
 - feature_data: Feature data handling
 - deepcovvar_utils: Utility functions (cleaned up)
 - sequence_converter: Sequence type detection and conversion
+- prediction_cache: Persistent cache of model outputs keyed by sequence hash
+- onnx_backend: ONNX export of the phase models and onnxruntime inference
+- resources: CPU core budget detection and thread/worker planning
+- sequence_batch: Integer-encoded sequence batches shared by every pipeline stage
 """
 
 from .features import FEATURE
 from .feature_data import *
 from .sequence_converter import SequenceTypeDetector, SequenceProcessor
+from .prediction_cache import PredictionCache
+from .sequence_batch import SequenceBatch
 
 __all__ = [
     'FEATURE',
     'SequenceTypeDetector',
-    'SequenceProcessor'
+    'SequenceProcessor',
+    'PredictionCache',
+    'SequenceBatch'
 ]
 
 
@@ -1,10 +1,243 @@
 #!/usr/bin/python
 # Script for pre-processing data
 # Author: Naveen Duhan
+import queue
+import threading
+
 import numpy as np
+import pandas as pd
 from .features import *
+from .sequence_batch import SequenceBatch
 import re
 
 # Note: The preprocess and preprocessdf functions were removed as they referenced
 # unused feature methods and were never called in the actual codebase.
 # Feature extraction is handled directly by the FEATURE class in the classifier.
+
+
+def plan_token_batches(lengths, max_tokens, max_length=512, special_tokens=2):
+    """
+    Group sequences into length-sorted batches under a padded-token budget.
+
+    Sequences are sorted by tokenized length and packed greedily so that
+    ``batch_size * longest_in_batch`` never exceeds ``max_tokens`` (a single
+    sequence longer than the budget still gets a batch of its own).
+
+    Args:
+        lengths: Residue count of each sequence
+        max_tokens: Maximum padded tokens per batch
+        max_length: Tokenizer truncation length
+        special_tokens: Tokens added per sequence by the tokenizer (CLS/EOS)
+
+    Returns:
+        Tuple of (batches, padding_ratio) where batches is a list of index arrays
+        into the original order and padding_ratio is the fraction of padded
+        positions that are padding.
+    """
+    token_lengths = np.minimum(np.asarray(lengths, dtype=np.int64) + special_tokens, max_length)
+    order = np.argsort(token_lengths, kind='stable')
+
+    batches = []
+    start = 0
+    padded = 0
+    while start < len(order):
+        end = start + 1
+        # Sorted ascending, so the last member sets the padded width
+        while end < len(order) and (end - start + 1) * token_lengths[order[end]] <= max_tokens:
+            end += 1
+        batches.append(order[start:end])
+        padded += (end - start) * int(token_lengths[order[end - 1]])
+        start = end
+
+    padding_ratio = 1.0 - token_lengths.sum() / padded if padded else 0.0
+    return batches, float(padding_ratio)
+
+
+def deduplicate_sequences(sequences):
+    """
+    Collapse identical sequences while remembering where each one came from.
+
+    Args:
+        sequences: SequenceBatch or list of sequence strings
+
+    Returns:
+        Tuple of (unique_sequences, first_index, inverse) where unique_sequences
+        keeps first-occurrence order, first_index[k] is the position of the first
+        copy of unique_sequences[k] and unique_sequences[inverse[i]] == sequences[i].
+    """
+    positions = {}
+    first_index = []
+    inverse = np.empty(len(sequences), dtype=np.int64)
+    for i, seq in enumerate(sequences):
+        k = positions.get(seq)
+        if k is None:
+            k = positions[seq] = len(first_index)
+            first_index.append(i)
+        inverse[i] = k
+    if isinstance(sequences, SequenceBatch):
+        unique_sequences = sequences.take(first_index)
+    else:
+        unique_sequences = [sequences[i] for i in first_index]
+    return unique_sequences, np.asarray(first_index, dtype=np.int64), inverse
+
+
+def is_percentage_column(column):
+    """Whether a results column holds a confidence or class probability."""
+    column = str(column).lower()
+    return column == 'confidence' or column.endswith(('_confidence', '_probability'))
+
+
+def percent_strings(values):
+    """
+    Format fractions as percentage strings, exactly like f"{value:.2%}".
+
+    Entries that are not numbers (e.g. cascade placeholders) are kept as they are.
+
+    Args:
+        values: Series of fractions between 0 and 1
+
+    Returns:
+        Series of strings such as '97.25%'
+    """
+    numeric = pd.to_numeric(values, errors='coerce')
+    present = numeric.notna().to_numpy()
+    if present.all():
+        return pd.Series(np.char.mod('%.2f%%', numeric.to_numpy(np.float64) * 100),
+                         index=values.index, name=values.name)
+    formatted = values.astype(object).copy()
+    formatted[present] = np.char.mod('%.2f%%', numeric[present].to_numpy(np.float64) * 100)
+    return formatted
+
+
+def format_percentages(results_df):
+    """
+    Copy of a results frame with its confidence and probability columns as percentages.
+
+    Results keep these columns numeric (fractions); this is applied only when
+    writing CSVs for people to read.
+    """
+    formatted = results_df.copy(deep=False)
+    for column in results_df.columns:
+        if is_percentage_column(column) and len(results_df):
+            formatted[column] = percent_strings(results_df[column])
+    return formatted
+
+
+def phase_result_rows(records, prediction_result, phase):
+    """
+    Join a batched prediction back onto the input records, one row per record.
+
+    Args:
+        records: List of (sequence_id, sequence) tuples as read from the input
+        prediction_result: DataFrame returned by COVIDClassifier.predict
+        phase: Phase number
+
+    Returns:
+        List of dicts with sequence_id, sequence, phase, prediction and confidence
+        (a fraction between 0 and 1)
+    """
+    predictions = {}
+    for seq_id, prediction, confidence in zip(prediction_result['Sequence_ID'],
+                                              prediction_result['Predicted_Class'],
+                                              prediction_result['Confidence']):
+        predictions.setdefault(seq_id, (prediction, confidence))
+
+    rows = []
+    for seq_id, seq in records:
+        prediction, confidence = predictions.get(seq_id, ('Unknown', 0.0))
+        rows.append({
+            'sequence_id': seq_id,
+            'sequence': seq,
+            'phase': phase,
+            'prediction': prediction,
+            'confidence': confidence
+        })
+    return rows
+
+
+class _StageFailure:
+    """Exception raised by the source or a stage, forwarded down the pipeline."""
+
+    def __init__(self, error):
+        self.error = error
+
+
+_DONE = object()
+
+
+def staged_pipeline(source, stages, maxsize=2):
+    """
+    Run items through a chain of stages, each in its own thread, joined by bounded queues.
+
+    While the consumer handles item k, the last stage can already work on item k+1,
+    the stage before it on item k+2, and so on. The bounded queues keep at most
+    maxsize items waiting between any two stages.
+
+    Args:
+        source: Iterable of inputs for the first stage, consumed in its own thread
+        stages: Sequence of callables; each maps one item to the next stage's input
+        maxsize: Capacity of each queue between stages
+
+    Yields:
+        Outputs of the last stage, in source order. An exception raised by the
+        source or a stage is re-raised here.
+    """
+    queues = [queue.Queue(maxsize=maxsize) for _ in range(len(stages) + 1)]
+    stop = threading.Event()
+
+    # Both helpers give up once the consumer has gone away instead of blocking forever
+    def put(q, item):
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def get(q):
+        while not stop.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def produce():
+        try:
+            for item in source:
+                if not put(queues[0], item):
+                    return
+        except Exception as e:
+            put(queues[0], _StageFailure(e))
+            return
+        put(queues[0], _DONE)
+
+    def run_stage(func, inbox, outbox):
+        while True:
+            item = get(inbox)
+            if item is not _DONE and not isinstance(item, _StageFailure):
+                try:
+                    item = func(item)
+                except Exception as e:
+                    item = _StageFailure(e)
+            if not put(outbox, item) or item is _DONE or isinstance(item, _StageFailure):
+                return
+
+    threads = [threading.Thread(target=produce, daemon=True)]
+    for i, func in enumerate(stages):
+        threads.append(threading.Thread(target=run_stage, args=(func, queues[i], queues[i + 1]),
+                                        daemon=True))
+    for thread in threads:
+        thread.start()
+
+    try:
+        while True:
+            item = queues[-1].get()
+            if item is _DONE:
+                return
+            if isinstance(item, _StageFailure):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
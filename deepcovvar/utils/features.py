@@ -5,7 +5,34 @@ Title: Script for protein feature generation
 Author: Naveen Duhan
 """
 
+from multiprocessing import shared_memory
+
+import numpy as np
+
 from .feature_data import *
+from .sequence_batch import SequenceBatch
+
+
+def _aa_lookup(order='alphabetically'):
+    """256-entry byte -> residue index table; 20 marks characters outside the alphabet."""
+    table = np.full(256, 20, dtype=np.uint8)
+    for index, aa in enumerate(myAAorder[order]):
+        table[ord(aa)] = index
+    return table
+
+
+def _cksaap_shard(shm_name, shape, start, sequences, gap, order, clean):
+    """Process-pool worker: fill rows [start, start + len(sequences)) of a shared feature matrix."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        features = np.ndarray(shape, dtype=np.float32, buffer=shm.buf)
+        FEATURE().CKSAAP_batch(sequences, gap=gap, order=order, clean=clean,
+                               out=features[start:start + len(sequences)])
+        del features
+    finally:
+        shm.close()
+    return len(sequences)
+
 
 class FEATURE:
 
@@ -40,6 +67,112 @@ class FEATURE:
                 encodings.append(count)
         return encodings
 
+    def CKSAAP_batch(self, sequences, gap=5, order='alphabetically', clean=False, chunk_size=2048,
+                     out=None):
+        """
+        Vectorized CKSAAP over a batch of sequences.
+
+        Residues are integer-encoded once and every k-spaced pair is counted with a
+        single bincount over ``seq * P + g * 400 + a * 20 + b`` indices, where P is
+        the number of features per sequence. A SequenceBatch is used as is, without
+        re-encoding its residues.
+
+        Args:
+            sequences: SequenceBatch or iterable of sequence strings
+            gap: Maximum gap between paired residues
+            order: Amino acid ordering preset (see ``myAAorder``)
+            clean: Drop characters outside the 20 standard residues before counting
+            chunk_size: Number of sequences counted per bincount call
+            out: Optional preallocated float32 array of shape (N, 400 * (gap + 1))
+                to fill instead of allocating a new one
+
+        Returns:
+            float32 array of shape (N, 400 * (gap + 1)). Rows for sequences shorter
+            than gap + 2 are all zeros, matching what ``extract_features`` stores
+            when ``CKSAAP`` rejects them.
+        """
+        if gap < 0:
+            raise ValueError('the gap should be equal or greater than zero')
+
+        sequences = SequenceBatch.from_strings(sequences)
+        if out is None:
+            features = np.zeros((len(sequences), 400 * (gap + 1)), dtype=np.float32)
+        else:
+            features = out
+        table = _aa_lookup(order)
+        for start in range(0, len(sequences), chunk_size):
+            chunk = sequences[start:start + chunk_size]
+            features[start:start + len(chunk)] = self._cksaap_counts(chunk, gap, table, clean)
+        return features
+
+    def CKSAAP_parallel(self, sequences, executor, n_shards, gap=5, order='alphabetically', clean=False):
+        """
+        CKSAAP_batch sharded across a process pool.
+
+        Each worker writes its rows straight into one shared-memory float32 matrix,
+        so only the encoded residues of each shard are pickled, never the features.
+
+        Args:
+            sequences: SequenceBatch or list of sequence strings
+            executor: concurrent.futures.ProcessPoolExecutor to run the shards on
+            n_shards: Number of contiguous slices to split the sequences into
+            gap: Maximum gap between paired residues
+            order: Amino acid ordering preset (see ``myAAorder``)
+            clean: Drop characters outside the 20 standard residues before counting
+
+        Returns:
+            float32 array of shape (N, 400 * (gap + 1)), identical to CKSAAP_batch
+        """
+        sequences = SequenceBatch.from_strings(sequences)
+        shape = (len(sequences), 400 * (gap + 1))
+        if not sequences:
+            return np.zeros(shape, dtype=np.float32)
+
+        shm = shared_memory.SharedMemory(create=True, size=shape[0] * shape[1] * 4)
+        try:
+            bounds = np.linspace(0, len(sequences), max(1, n_shards) + 1).astype(int)
+            futures = [
+                executor.submit(_cksaap_shard, shm.name, shape, start, sequences[start:stop],
+                                gap, order, clean)
+                for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start
+            ]
+            for future in futures:
+                future.result()
+            # One memcpy out of the segment so it can be released immediately
+            features = np.ndarray(shape, dtype=np.float32, buffer=shm.buf).copy()
+        finally:
+            shm.close()
+            shm.unlink()
+        return features
+
+    @staticmethod
+    def _cksaap_counts(batch, gap, table, clean):
+        n_seqs = len(batch)
+        n_features = 400 * (gap + 1)
+
+        if clean:
+            batch = batch.compress(table[batch.data] < 20)
+        codes = table[batch.data].astype(np.int64)
+        lengths = batch.lengths
+        owner = batch.owner()
+
+        index = []
+        for g in range(gap + 1):
+            shift = g + 1
+            if codes.size <= shift:
+                break
+            first, second = codes[:-shift], codes[shift:]
+            valid = (owner[:-shift] == owner[shift:]) & (first < 20) & (second < 20)
+            index.append(owner[:-shift][valid] * n_features + g * 400 + first[valid] * 20 + second[valid])
+
+        if index:
+            counts = np.bincount(np.concatenate(index), minlength=n_seqs * n_features)
+        else:
+            counts = np.zeros(n_seqs * n_features, dtype=np.int64)
+        counts = counts.reshape(n_seqs, n_features).astype(np.float32)
+        counts[lengths < gap + 2] = 0.0
+        return counts
+
     def hybrid(self, seq, method1, method2):
         """Hybrid features combining two methods"""
         features1 = method1(seq)
@@ -0,0 +1,153 @@
+"""
+ONNX Runtime Backend for DeepCovVar
+
+This module converts the native models to ONNX and runs them with onnxruntime,
+so inference needs neither TensorFlow nor torch:
+1. Keras phases are exported with Keras' own ONNX exporter (Keras 3) or tf2onnx
+2. The phase 5 ESM-2 classifier is traced with torch.onnx, with dynamic batch and length axes
+3. Sessions are created with explicit intra/inter-op thread counts and graph optimization level
+
+onnxruntime is only needed at inference time; exporting also needs tf2onnx/onnx.
+"""
+
+import inspect
+import logging
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Graph optimization levels accepted by create_session
+OPTIMIZATION_LEVELS = ('disable', 'basic', 'extended', 'all')
+
+
+def export_keras_model(model, path: Path) -> Path:
+    """
+    Write a loaded Keras model to an ONNX file.
+
+    Args:
+        model: Loaded tf.keras model
+        path: Destination .onnx file
+
+    Returns:
+        path
+    """
+    import tensorflow as tf
+
+    path = Path(path)
+    input_shape = tuple(model.input_shape)
+    # Keras only exports models that have been called at least once
+    model(np.zeros((1,) + input_shape[1:], dtype=np.float32))
+    try:
+        model.export(str(path), format='onnx', verbose=False)
+    except (TypeError, ValueError):
+        # Keras 2 has no export() format argument (TypeError) and Keras 3 releases
+        # before ONNX support reject format='onnx' (ValueError); convert with tf2onnx
+        import tf2onnx
+        signature = (tf.TensorSpec((None,) + input_shape[1:], tf.float32, name='features'),)
+        tf2onnx.convert.from_keras(model, input_signature=signature, output_path=str(path))
+    return path
+
+
+def export_transformer_model(model, tokenizer, path: Path) -> Path:
+    """
+    Trace a sequence-classification transformer to an ONNX file.
+
+    The graph takes int64 `input_ids` and `attention_mask` of any batch size and
+    length and returns `logits`.
+
+    Args:
+        model: Loaded transformers model in eval mode
+        tokenizer: Matching tokenizer, used to build the example inputs
+        path: Destination .onnx file
+
+    Returns:
+        path
+    """
+    import torch
+
+    path = Path(path)
+    example = tokenizer(["MKTAYIAKQRQISFVKSHFSRQ", "MFVFLVLLPLV"], padding=True, return_tensors='pt')
+    kwargs = {
+        'input_names': ['input_ids', 'attention_mask'],
+        'output_names': ['logits'],
+        'dynamic_axes': {
+            'input_ids': {0: 'batch', 1: 'length'},
+            'attention_mask': {0: 'batch', 1: 'length'},
+            'logits': {0: 'batch'}
+        },
+        'opset_version': 17
+    }
+    # Newer torch releases default to the dynamo exporter; dynamic_axes belongs to the tracer
+    if 'dynamo' in inspect.signature(torch.onnx.export).parameters:
+        kwargs['dynamo'] = False
+    with torch.no_grad():
+        torch.onnx.export(model, (example['input_ids'], example['attention_mask']), str(path), **kwargs)
+    return path
+
+
+def create_session(path: Path, intra_op_threads: int = 0, inter_op_threads: int = 1,
+                   optimization: str = 'all'):
+    """
+    Open an ONNX model for CPU inference.
+
+    Args:
+        path: .onnx file
+        intra_op_threads: Threads used inside one operator (0 lets onnxruntime choose)
+        inter_op_threads: Threads used to run independent operators in parallel
+        optimization: Graph optimization level, one of OPTIMIZATION_LEVELS
+
+    Returns:
+        onnxruntime.InferenceSession
+    """
+    import onnxruntime as ort
+
+    if optimization not in OPTIMIZATION_LEVELS:
+        raise ValueError(f"Unknown graph optimization level: {optimization} "
+                         f"(expected one of {', '.join(OPTIMIZATION_LEVELS)})")
+    options = ort.SessionOptions()
+    options.intra_op_num_threads = intra_op_threads
+    options.inter_op_num_threads = inter_op_threads
+    options.execution_mode = (ort.ExecutionMode.ORT_PARALLEL if inter_op_threads > 1
+                              else ort.ExecutionMode.ORT_SEQUENTIAL)
+    options.graph_optimization_level = {
+        'disable': ort.GraphOptimizationLevel.ORT_DISABLE_ALL,
+        'basic': ort.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+        'extended': ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+        'all': ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    }[optimization]
+    return ort.InferenceSession(str(path), sess_options=options, providers=['CPUExecutionProvider'])
+
+
+class OnnxModel:
+    """onnxruntime session with the single-input predict() interface of a Keras model."""
+
+    def __init__(self, session, batch_rows: int = 1024):
+        self.session = session
+        self.batch_rows = batch_rows
+        self.input_names = [node.name for node in session.get_inputs()]
+        # Rank of the first input; 4 for models that take (batch, 1, features, 1)
+        self.input_shape = tuple(session.get_inputs()[0].shape)
+
+    def predict(self, features: np.ndarray, verbose: int = 0) -> np.ndarray:
+        """First output of the model for a float32 feature matrix, run in row slices."""
+        features = np.asarray(features, dtype=np.float32)
+        outputs = [self.session.run(None, {self.input_names[0]: features[start:start + self.batch_rows]})[0]
+                   for start in range(0, len(features), self.batch_rows)]
+        return np.concatenate(outputs) if outputs else np.zeros((0, 1), dtype=np.float32)
+
+    def logits(self, input_ids: np.ndarray, attention_mask: np.ndarray) -> np.ndarray:
+        """Logits of a transformer graph for one tokenized batch."""
+        return self.session.run(['logits'], {
+            'input_ids': np.asarray(input_ids, dtype=np.int64),
+            'attention_mask': np.asarray(attention_mask, dtype=np.int64)
+        })[0]
+
+
+def softmax(logits: np.ndarray) -> np.ndarray:
+    """Row-wise softmax in float32."""
+    shifted = logits - logits.max(axis=1, keepdims=True)
+    exp = np.exp(shifted, dtype=np.float32)
+    return exp / exp.sum(axis=1, keepdims=True)
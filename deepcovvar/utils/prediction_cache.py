@@ -0,0 +1,244 @@
+"""
+Persistent Prediction Cache for DeepCovVar
+
+This module stores raw model outputs on disk so that sequences already scored
+by the same model file are not featurized or run through the model again:
+1. Entries are keyed by phase, model variant (e.g. the int8 phase 5 model) and sha256 of the sequence
+2. Each phase and variant records the digest of its model files; a changed digest drops
+   that variant's entries, so switching variants keeps both sets
+3. The cache is bounded by entry count and evicts least recently used rows; rows are
+   tracked with a running count rather than counted on every insert
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# SQLite caps the number of bound parameters per statement
+_QUERY_CHUNK = 500
+
+# Bumped when the tables change; older caches are dropped and rebuilt
+_SCHEMA_VERSION = 1
+
+# Rows are counted exactly at most once per this many inserts, or when the running
+# estimate passes max_entries; other processes' inserts show up at the next count
+_RECOUNT_INTERVAL = 10_000
+
+
+def file_digest(paths: Iterable[Path], block_size: int = 1 << 20) -> str:
+    """SHA-256 over the contents of one or more files, in order."""
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(Path(path).name.encode())
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(block_size), b''):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+class PredictionCache:
+    """SQLite-backed store of raw class probability vectors."""
+
+    def __init__(self, path: str, max_entries: int = 1_000_000):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path: SQLite database file
+            max_entries: Maximum number of cached predictions before LRU eviction
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._model_digests = {}
+
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != _SCHEMA_VERSION:
+            self.conn.executescript("""
+                DROP TABLE IF EXISTS models;
+                DROP TABLE IF EXISTS predictions;
+            """)
+            self.conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS models (
+                phase INTEGER NOT NULL,
+                variant TEXT NOT NULL,
+                digest TEXT NOT NULL,
+                PRIMARY KEY (phase, variant)
+            );
+            CREATE TABLE IF NOT EXISTS predictions (
+                phase INTEGER NOT NULL,
+                variant TEXT NOT NULL,
+                seq_hash TEXT NOT NULL,
+                probs BLOB NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (phase, variant, seq_hash)
+            );
+            CREATE INDEX IF NOT EXISTS predictions_last_used ON predictions (last_used);
+            CREATE TABLE IF NOT EXISTS file_digests (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                digest TEXT NOT NULL
+            );
+        """)
+        self.conn.commit()
+        self._count_entries()
+
+    def _count_entries(self) -> int:
+        """Reset the running row estimate from an exact count."""
+        self._entries = self.conn.execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+        self._inserts_since_count = 0
+        return self._entries
+
+    def files_digest(self, paths: Sequence[Path]) -> str:
+        """
+        Digest of model files, hashing only files whose size or mtime changed.
+
+        Per-file digests are stored in the database, so other processes sharing the
+        cache reuse them too. A single file gets the same digest as file_digest().
+        """
+        digests = []
+        with self._lock:
+            for path in paths:
+                stat = Path(path).stat()
+                row = self.conn.execute(
+                    "SELECT digest FROM file_digests WHERE path = ? AND size = ? AND mtime_ns = ?",
+                    (str(path), stat.st_size, stat.st_mtime_ns)
+                ).fetchone()
+                if row is None:
+                    row = (file_digest([path]),)
+                    with self.conn:
+                        self.conn.execute(
+                            "INSERT OR REPLACE INTO file_digests (path, size, mtime_ns, digest) "
+                            "VALUES (?, ?, ?, ?)",
+                            (str(path), stat.st_size, stat.st_mtime_ns, row[0])
+                        )
+                digests.append(row[0])
+        if len(digests) == 1:
+            return digests[0]
+        return hashlib.sha256(':'.join(digests).encode()).hexdigest()
+
+    def _sync_model(self, phase: int, variant: str, digest: str) -> None:
+        """Drop a model variant's entries when its model files changed."""
+        if self._model_digests.get((phase, variant)) == digest:
+            return
+        row = self.conn.execute("SELECT digest FROM models WHERE phase = ? AND variant = ?",
+                                (phase, variant)).fetchone()
+        if row is None or row[0] != digest:
+            if row is not None:
+                logger.info(f"Model for phase {phase} changed; invalidating cached predictions")
+            with self.conn:
+                self.conn.execute("DELETE FROM predictions WHERE phase = ? AND variant = ?",
+                                  (phase, variant))
+                self.conn.execute("INSERT OR REPLACE INTO models (phase, variant, digest) VALUES (?, ?, ?)",
+                                  (phase, variant, digest))
+        self._model_digests[(phase, variant)] = digest
+
+    def get_many(self, phase: int, digest: str, keys: List[str], variant: str = '') -> Dict[str, np.ndarray]:
+        """
+        Look up cached outputs.
+
+        Args:
+            phase: Phase number
+            digest: Digest of the phase's current model files
+            keys: Sequence hashes
+            variant: Model variant of the phase (e.g. 'int8-dynamic'); each is cached separately
+
+        Returns:
+            Dict mapping each cached key to its float32 output vector
+        """
+        with self._lock:
+            return self._get_many(phase, variant, digest, keys)
+
+    def _get_many(self, phase: int, variant: str, digest: str, keys: List[str]) -> Dict[str, np.ndarray]:
+        self._sync_model(phase, variant, digest)
+        unique_keys = list(dict.fromkeys(keys))
+        found = {}
+        for start in range(0, len(unique_keys), _QUERY_CHUNK):
+            chunk = unique_keys[start:start + _QUERY_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT seq_hash, probs FROM predictions "
+                f"WHERE phase = ? AND variant = ? AND seq_hash IN ({placeholders})",
+                [phase, variant] + chunk
+            ).fetchall()
+            for seq_hash, probs in rows:
+                found[seq_hash] = np.frombuffer(probs, dtype=np.float32)
+
+        if found:
+            now = time.time()
+            with self.conn:
+                self.conn.executemany(
+                    "UPDATE predictions SET last_used = ? WHERE phase = ? AND variant = ? AND seq_hash = ?",
+                    [(now, phase, variant, key) for key in found]
+                )
+        self.hits += sum(1 for key in keys if key in found)
+        self.misses += sum(1 for key in keys if key not in found)
+        return found
+
+    def put_many(self, phase: int, digest: str, items: Dict[str, np.ndarray], variant: str = '') -> None:
+        """Store output vectors for a phase and model variant, then evict down to max_entries."""
+        if not items:
+            return
+        with self._lock:
+            self._put_many(phase, variant, digest, items)
+
+    def _put_many(self, phase: int, variant: str, digest: str, items: Dict[str, np.ndarray]) -> None:
+        self._sync_model(phase, variant, digest)
+        now = time.time()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO predictions (phase, variant, seq_hash, probs, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(phase, variant, key, np.asarray(row, dtype=np.float32).tobytes(), now)
+                 for key, row in items.items()]
+            )
+        # Replaced rows are counted too, so the estimate only errs on the high side
+        self._entries += len(items)
+        self._inserts_since_count += len(items)
+        self._evict()
+
+    def _evict(self) -> None:
+        if self._entries <= self.max_entries and self._inserts_since_count < _RECOUNT_INTERVAL:
+            return
+        excess = self._count_entries() - self.max_entries
+        if excess > 0:
+            with self.conn:
+                self.conn.execute(
+                    "DELETE FROM predictions WHERE rowid IN "
+                    "(SELECT rowid FROM predictions ORDER BY last_used LIMIT ?)",
+                    (excess,)
+                )
+            self._entries = self.max_entries
+            logger.info(f"Evicted {excess} cached predictions")
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters for this session and the current number of entries."""
+        with self._lock:
+            entries = self.conn.execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+        return {'hits': self.hits, 'misses': self.misses, 'entries': entries}
+
+    def clear(self) -> None:
+        """Remove every cached prediction."""
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM predictions")
+            self.conn.execute("DELETE FROM models")
+            self._model_digests = {}
+            self._entries = 0
+
+    def close(self) -> None:
+        self.conn.close()
@@ -0,0 +1,167 @@
+"""
+CPU Resource Planning for DeepCovVar
+
+This module decides how many cores each part of a run may use:
+1. The core budget is the CPU affinity mask, capped by the cgroup CPU quota of containers
+2. CKSAAP featurization workers are only planned when a Keras phase runs
+3. TensorFlow intra/inter-op pools, torch and onnxruntime threads get the cores left for inference
+4. Nucleotide input is translated by up to one Prodigal process per core
+
+Phases run one after another, so each inference backend may use every inference core;
+only streaming runs, which featurize the next chunk while the current one is scored,
+split the budget between featurization and inference.
+"""
+
+import logging
+import os
+from pathlib import Path
+from typing import Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+CGROUP_ROOT = Path('/sys/fs/cgroup')
+
+
+def _read(path: Path) -> Optional[str]:
+    try:
+        return path.read_text().strip()
+    except OSError:
+        return None
+
+
+def cgroup_cpu_quota(root: Path = CGROUP_ROOT, proc_cgroup: Path = Path('/proc/self/cgroup')) -> Optional[float]:
+    """
+    CPU quota of this process's cgroup in cores, or None when unlimited.
+
+    Reads cgroup v2 `cpu.max` (at the process's own cgroup, then the mount root)
+    and falls back to cgroup v1 `cpu.cfs_quota_us` / `cpu.cfs_period_us`.
+    """
+    root = Path(root)
+    candidates = [root]
+    membership = _read(proc_cgroup) or ''
+    for line in membership.splitlines():
+        # cgroup v2 entries look like "0::/system.slice/app.service"
+        if line.startswith('0::') and line[3:] not in ('', '/'):
+            candidates.insert(0, root / line[3:].lstrip('/'))
+
+    for directory in candidates:
+        cpu_max = _read(directory / 'cpu.max')
+        if cpu_max:
+            quota, _, period = cpu_max.partition(' ')
+            if quota == 'max':
+                return None
+            return int(quota) / int(period or 100000)
+
+    for directory in (root / 'cpu', root / 'cpu,cpuacct'):
+        quota, period = _read(directory / 'cpu.cfs_quota_us'), _read(directory / 'cpu.cfs_period_us')
+        if quota and period:
+            return None if int(quota) <= 0 else int(quota) / int(period)
+    return None
+
+
+def available_cores(root: Path = CGROUP_ROOT) -> int:
+    """Cores this process may run on: the affinity mask, capped by the cgroup quota."""
+    try:
+        cores = len(os.sched_getaffinity(0))
+    except AttributeError:
+        # sched_getaffinity is Linux-only
+        cores = os.cpu_count() or 1
+    try:
+        quota = cgroup_cpu_quota(root)
+    except (OSError, ValueError) as e:
+        logger.debug(f"Could not read cgroup CPU quota: {e}")
+        quota = None
+    if quota is not None:
+        # Round down: a fractional core would only be throttled
+        cores = min(cores, max(1, int(quota)))
+    return max(1, cores)
+
+
+class ResourcePlan:
+    """Thread and process counts for one run."""
+
+    def __init__(self, cores: int, feature_workers: int, tf_intra_threads: int,
+                 tf_inter_threads: int, torch_threads: int, onnx_threads: int,
+                 phase_types: Iterable[str] = (), backend: str = 'native',
+                 prodigal_workers: int = 1):
+        self.phase_types = sorted(set(phase_types))
+        self.backend = backend
+        self.cores = cores
+        self.feature_workers = feature_workers
+        self.tf_intra_threads = tf_intra_threads
+        self.tf_inter_threads = tf_inter_threads
+        self.torch_threads = torch_threads
+        self.onnx_threads = onnx_threads
+        self.prodigal_workers = prodigal_workers
+
+    def describe(self) -> str:
+        """One-line summary of the parts of the plan that the planned phases use."""
+        parts = [f"{self.cores} cores"]
+        if 'keras' in self.phase_types:
+            parts.append(f"{self.feature_workers} featurization workers")
+        if self.backend == 'onnx':
+            parts.append(f"onnxruntime {self.onnx_threads} threads")
+        else:
+            if 'keras' in self.phase_types:
+                parts.append(f"TensorFlow {self.tf_intra_threads} intra-op / "
+                             f"{self.tf_inter_threads} inter-op threads")
+            if {'pytorch', 'pytorch_transformer'} & set(self.phase_types):
+                parts.append(f"torch {self.torch_threads} threads")
+        return ', '.join(parts)
+
+    def __repr__(self):
+        fields = ', '.join(f"{name}={value}" for name, value in vars(self).items())
+        return f"ResourcePlan({fields})"
+
+
+def plan_resources(phase_types: Iterable[str], cores: Optional[int] = None, overlap: bool = False,
+                   fused: bool = False, backend: str = 'native', workers: Optional[int] = None,
+                   tf_threads: Optional[int] = None, tf_inter_threads: Optional[int] = None,
+                   torch_threads: Optional[int] = None, onnx_threads: Optional[int] = None,
+                   prodigal_workers: Optional[int] = None) -> ResourcePlan:
+    """
+    Split the core budget between featurization and the inference backends.
+
+    Args:
+        phase_types: Model types of the phases being run ('keras', 'pytorch_transformer', ...)
+        cores: Core budget (default: available_cores())
+        overlap: Featurization runs concurrently with inference (streaming runs)
+        fused: Phases 1-4 run as one multi-branch Keras graph
+        backend: 'native' (TensorFlow/torch) or 'onnx' (onnxruntime)
+        workers, tf_threads, tf_inter_threads, torch_threads, onnx_threads, prodigal_workers:
+            Explicit values that override the planned ones
+
+    Returns:
+        ResourcePlan
+    """
+    phase_types = list(phase_types)
+    cores = max(1, cores or available_cores())
+    keras_phases = phase_types.count('keras')
+
+    if workers is None:
+        if not keras_phases:
+            # Only the Keras phases use CKSAAP features
+            workers = 1
+        elif overlap:
+            workers = max(1, cores // 2)
+        else:
+            workers = cores
+    workers = max(1, workers)
+    inference_cores = max(1, cores - workers) if overlap and keras_phases else cores
+
+    if tf_inter_threads is None:
+        # The fused graph has one independent branch per phase
+        tf_inter_threads = min(keras_phases, max(1, inference_cores // 2)) if fused and keras_phases else 1
+
+    return ResourcePlan(
+        cores=cores,
+        feature_workers=workers,
+        tf_intra_threads=max(1, tf_threads or inference_cores),
+        tf_inter_threads=max(1, tf_inter_threads),
+        torch_threads=max(1, torch_threads or inference_cores),
+        onnx_threads=max(1, onnx_threads or inference_cores),
+        phase_types=phase_types,
+        backend=backend,
+        # Sharding changes Prodigal's single-mode training set, so it is opt-in
+        prodigal_workers=max(1, prodigal_workers or 1)
+    )
@@ -0,0 +1,176 @@
+"""
+Integer-encoded sequence batches shared by every pipeline stage.
+
+A SequenceBatch stores the residues of all sequences of a batch in one contiguous
+uint8 array (one byte per residue) with an int64 offsets array marking where each
+sequence starts, plus the sequence IDs. It is built once when the input is read
+and then used directly by type detection, CKSAAP featurization and ESM-2 token-ID
+mapping, which all work on the bytes through 256-entry lookup tables instead of
+re-joining and re-encoding the strings.
+
+A SequenceBatch is also a read-only sequence of strings: len(), iteration and
+integer indexing decode residues on demand, so code written for lists of
+sequences keeps working. Characters outside Latin-1 are stored as '?'.
+"""
+
+from collections.abc import Sequence as _SequenceABC
+from typing import Iterable, List, Optional, Sequence
+
+import numpy as np
+
+STANDARD_RESIDUES = 'ARNDCQEGHILKMFPSTWYV'
+
+
+class SequenceBatch(_SequenceABC):
+    """Sequences as one uint8 residue array, offsets and IDs."""
+
+    def __init__(self, data: np.ndarray, offsets: np.ndarray, ids: Optional[Sequence[str]] = None):
+        """
+        Args:
+            data: uint8 array holding the residues of every sequence back to back
+            offsets: int64 array of len(sequences) + 1; sequence i is
+                data[offsets[i]:offsets[i + 1]] and offsets[0] == 0
+            ids: Optional sequence IDs, one per sequence
+        """
+        self.data = data
+        self.offsets = offsets
+        self.ids = list(ids) if ids is not None else None
+        if self.ids is not None and len(self.ids) != len(self):
+            raise ValueError(f"{len(self.ids)} IDs given for {len(self)} sequences")
+
+    @classmethod
+    def from_strings(cls, sequences: Iterable[str], ids: Optional[Sequence[str]] = None) -> 'SequenceBatch':
+        """
+        Encode sequence strings into a batch; a SequenceBatch is returned as is.
+
+        Args:
+            sequences: Sequence strings (or an existing SequenceBatch)
+            ids: Optional sequence IDs
+
+        Returns:
+            SequenceBatch
+        """
+        if isinstance(sequences, cls):
+            return sequences
+        sequences = [str(seq) for seq in sequences]
+        offsets = np.zeros(len(sequences) + 1, dtype=np.int64)
+        np.cumsum(np.fromiter(map(len, sequences), dtype=np.int64, count=len(sequences)),
+                  out=offsets[1:])
+        # latin-1 keeps one byte per character, so byte offsets equal string offsets
+        data = np.frombuffer(''.join(sequences).encode('latin-1', 'replace'), dtype=np.uint8)
+        return cls(data, offsets, ids)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        """A string for an integer index; a batch sharing this one's residues for a slice."""
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return self.take(np.arange(start, stop, step))
+            stop = max(start, stop)
+            begin = self.offsets[start]
+            return SequenceBatch(self.data[begin:self.offsets[stop]],
+                                 self.offsets[start:stop + 1] - begin,
+                                 self.ids[start:stop] if self.ids is not None else None)
+        return self.row(index).tobytes().decode('latin-1')
+
+    def __iter__(self):
+        # One decode for the whole batch; sequences are then string slices
+        text = self.data.tobytes().decode('latin-1')
+        for begin, end in zip(self.offsets[:-1].tolist(), self.offsets[1:].tolist()):
+            yield text[begin:end]
+
+    def __repr__(self) -> str:
+        return f"SequenceBatch({len(self)} sequences, {len(self.data)} residues)"
+
+    @property
+    def lengths(self) -> np.ndarray:
+        """int64 length of every sequence."""
+        return np.diff(self.offsets)
+
+    def row(self, index: int) -> np.ndarray:
+        """uint8 view of the residues of one sequence."""
+        index = range(len(self))[index]
+        return self.data[self.offsets[index]:self.offsets[index + 1]]
+
+    def owner(self) -> np.ndarray:
+        """int64 index of the sequence each residue belongs to."""
+        return np.repeat(np.arange(len(self), dtype=np.int64), self.lengths)
+
+    def take(self, indices) -> 'SequenceBatch':
+        """New batch of the sequences at the given indices, in that order."""
+        indices = np.asarray(indices, dtype=np.int64).reshape(-1)
+        indices = np.where(indices < 0, indices + len(self), indices)
+        ids = [self.ids[i] for i in indices.tolist()] if self.ids is not None else None
+        return self._gather(self.offsets[indices], self.lengths[indices], ids)
+
+    def _gather(self, starts: np.ndarray, lengths: np.ndarray, ids) -> 'SequenceBatch':
+        """New batch whose sequence k is data[starts[k]:starts[k] + lengths[k]]."""
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        source = np.repeat(starts - offsets[:-1], lengths) + np.arange(offsets[-1], dtype=np.int64)
+        return SequenceBatch(self.data[source], offsets, ids)
+
+    def compress(self, keep: np.ndarray) -> 'SequenceBatch':
+        """New batch keeping only the residues where keep (one bool per residue) is True."""
+        lengths = np.bincount(self.owner()[keep], minlength=len(self))
+        offsets = np.zeros(len(self) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        return SequenceBatch(self.data[keep], offsets, self.ids)
+
+    def residue_mask(self, alphabet: str = STANDARD_RESIDUES) -> np.ndarray:
+        """Boolean mask over all residues, True for characters in alphabet."""
+        table = np.zeros(256, dtype=bool)
+        table[np.frombuffer(alphabet.encode('latin-1'), dtype=np.uint8)] = True
+        return table[self.data]
+
+    def cleaned(self, alphabet: str = STANDARD_RESIDUES) -> 'SequenceBatch':
+        """New batch with every character outside alphabet dropped."""
+        return self.compress(self.residue_mask(alphabet))
+
+    def prefixes(self, length: int) -> 'SequenceBatch':
+        """New batch holding at most the first length residues of each sequence."""
+        return self._gather(self.offsets[:-1], np.minimum(self.lengths, length), self.ids)
+
+    def padded(self, table: np.ndarray, max_length: Optional[int] = None,
+               prefix: Optional[int] = None, suffix: Optional[int] = None, pad: int = 0):
+        """
+        Map residues through a lookup table into a right-padded code matrix.
+
+        Args:
+            table: 256-entry array mapping each byte to its code (e.g. a token ID)
+            max_length: Maximum row width including prefix and suffix; longer
+                sequences are truncated at the end
+            prefix: Optional code put before every sequence
+            suffix: Optional code put after every (truncated) sequence
+            pad: Code filling the rest of each row
+
+        Returns:
+            Tuple of (codes, mask): arrays of shape (len(self), width) where width is
+            the longest row, mask being 1 on every non-padding position
+        """
+        extra = (prefix is not None) + (suffix is not None)
+        lengths = self.lengths
+        if max_length is not None:
+            lengths = np.minimum(lengths, max(0, max_length - extra))
+        width = int(lengths.max(initial=0)) + extra
+        codes = np.full((len(self), width), pad, dtype=table.dtype)
+
+        first = int(prefix is not None)
+        if prefix is not None:
+            codes[:, 0] = prefix
+        rows = np.repeat(np.arange(len(self), dtype=np.int64), lengths)
+        columns = np.arange(int(lengths.sum()), dtype=np.int64) - \
+            np.repeat(np.cumsum(lengths) - lengths, lengths)
+        codes[rows, columns + first] = table[self.data[np.repeat(self.offsets[:-1], lengths) + columns]]
+        if suffix is not None:
+            codes[np.arange(len(self)), lengths + first] = suffix
+
+        mask = (np.arange(width) < (lengths + extra)[:, None]).astype(codes.dtype)
+        return codes, mask
+
+    def to_list(self) -> List[str]:
+        """Decoded sequence strings."""
+        return list(self)
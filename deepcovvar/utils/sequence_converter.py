@@ -3,41 +3,86 @@ Sequence Type Detection and Conversion Module for DeepCovVar
 
 This module provides functionality to:
 1. Detect whether input sequences are nucleotide or protein
-2. Convert nucleotide sequences to protein sequences using Prodigal
-3. Integrate seamlessly with the existing COVID classifier
+2. Convert nucleotide sequences to protein sequences using Prodigal, sharded across
+   concurrent processes fed through pipes
+3. Translate nucleotide sequences in process with a vectorized six-frame ORF finder,
+   used when Prodigal is not installed
+4. Integrate seamlessly with the existing COVID classifier
 """
 
+import bisect
+import io
 import os
 import subprocess
-import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Tuple, List, Optional
+from typing import Iterator, Tuple, List, Optional, Sequence
 import logging
 
+import numpy as np
 from Bio import SeqIO
 from Bio.Seq import Seq
 from Bio.SeqRecord import SeqRecord
 
+from .sequence_batch import SequenceBatch
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# Smallest shard handed to one Prodigal process: Prodigal asks for at least 100 kb
+# to train on in single mode, and a SARS-CoV-2 genome is about 30 kb
+MIN_SHARD_BASES = 100_000
+
+# Converters SequenceProcessor can use; 'auto' prefers Prodigal and falls back to 'orf'
+CONVERTERS = ('auto', 'prodigal', 'orf')
+
+# Bases are numbered in TCAG order so that a codon's index 16*b1 + 4*b2 + b3 is its
+# position in the standard codon table; complementing a base is b ^ 2. Other bytes map
+# to 4 and make the codon unknown (index 64)
+_BASE_CODES = np.full(256, 4, dtype=np.uint8)
+for _code, _bases in enumerate(('TtUu', 'Cc', 'Aa', 'Gg')):
+    _BASE_CODES[np.frombuffer(_bases.encode('ascii'), dtype=np.uint8)] = _code
+_UNKNOWN_CODON = 64
+# Translation table 11 (bacterial, archaeal and plant plastid), Prodigal's default
+_CODON_TABLE = np.frombuffer(b'FFLLSSSSYY**CC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGGX',
+                             dtype=np.uint8)
+_STOP_CODONS = _CODON_TABLE == ord('*')
+# Start codons of table 11: ATG is preferred over GTG and TTG (0 = not a start)
+_START_RANK = np.zeros(65, dtype=np.uint8)
+for _codon, _rank in (('ATG', 1), ('GTG', 2), ('TTG', 2)):
+    _START_RANK[sum(4 ** (2 - k) * 'TCAG'.index(base) for k, base in enumerate(_codon))] = _rank
+
+# Bit flags of the byte lookup table used by SequenceTypeDetector.is_nucleotide_batch
+_NT_FLAG = 1
+_AA_FLAG = 2
+
+
 class SequenceTypeDetector:
     """Detects whether sequences are nucleotide or protein based on composition."""
     
-    def __init__(self, threshold: float = 0.9):
+    def __init__(self, threshold: float = 0.9, sample_length: Optional[int] = None):
         """
         Initialize the detector.
         
         Args:
             threshold: Minimum fraction of nucleotide bases to classify as nucleotide
+            sample_length: Only look at the first sample_length characters of each
+                sequence in is_nucleotide_batch (None: whole sequences)
         """
         self.threshold = threshold
+        self.sample_length = sample_length
         self.nt_bases = ['A', 'T', 'G', 'C', 'U', 'N']
         # Amino acid characters excluding those that overlap with DNA bases (A, T, G, C)
         # Only include unique amino acid characters: R, N, D, Q, E, H, I, L, K, M, F, P, S, W, Y, V
         self.aa_chars = 'RNDQEHILKMFPSTWYV'
+        # Byte -> flags; lowercase letters count like their uppercase form, as after str.upper()
+        self._lookup = np.zeros(256, dtype=np.uint8)
+        for chars, flag in ((''.join(self.nt_bases), _NT_FLAG), (self.aa_chars, _AA_FLAG)):
+            for char in chars:
+                self._lookup[ord(char)] |= flag
+                self._lookup[ord(char.lower())] |= flag
     
     def is_nucleotide(self, seq: str) -> bool:
         """
@@ -67,6 +112,55 @@ class SequenceTypeDetector:
             
         return nt_ratio >= self.threshold
     
+    def is_nucleotide_batch(self, sequences: Sequence[str],
+                            sample_length: Optional[int] = None) -> np.ndarray:
+        """
+        Apply is_nucleotide to many sequences in one pass.
+        
+        The residue bytes of the batch are mapped through a 256-entry lookup table
+        and the nucleotide and amino acid counts of each sequence are summed with
+        np.add.reduceat; the decision rule is the same as is_nucleotide. A
+        SequenceBatch is used as is; strings are encoded into one first.
+        
+        Args:
+            sequences: SequenceBatch or sequence strings
+            sample_length: Only count the first sample_length characters of each
+                sequence, for very long genomes (default: the detector's sample_length)
+            
+        Returns:
+            Boolean array, True where a sequence is likely nucleotide
+        """
+        sample_length = sample_length or self.sample_length
+        if isinstance(sequences, SequenceBatch):
+            batch = sequences.prefixes(sample_length) if sample_length else sequences
+            ascii_only = not (batch.data > 127).any()
+            sequences = batch
+        else:
+            sequences = [str(seq) for seq in sequences]
+            if sample_length:
+                sequences = [seq[:sample_length] for seq in sequences]
+            ascii_only = all(seq.isascii() for seq in sequences)
+        if not ascii_only:
+            # str.upper() can change the length of non-ASCII text; keep its exact rule
+            return np.array([self.is_nucleotide(seq) for seq in sequences], dtype=bool)
+        batch = SequenceBatch.from_strings(sequences)
+        
+        lengths = batch.lengths
+        result = np.zeros(len(batch), dtype=bool)
+        nonempty = lengths > 0
+        if not nonempty.any():
+            return result
+        
+        # Empty sequences are left out so that the segment starts strictly increase
+        starts = batch.offsets[:-1][nonempty]
+        flags = self._lookup[batch.data]
+        nt_count = np.add.reduceat(flags & _NT_FLAG, starts, dtype=np.int64)
+        aa_count = np.add.reduceat((flags & _AA_FLAG) >> 1, starts, dtype=np.int64)
+        
+        length = lengths[nonempty]
+        result[nonempty] = (aa_count / length <= 0.7) & (nt_count / length >= self.threshold)
+        return result
+    
     def check_fasta_type(self, fasta_file: str) -> List[Tuple[str, bool]]:
         """
         Check the type of each sequence in a FASTA file.
@@ -77,29 +171,32 @@ class SequenceTypeDetector:
         Returns:
             List of tuples (sequence_id, is_nucleotide)
         """
-        results = []
         try:
-            for record in SeqIO.parse(fasta_file, "fasta"):
-                is_nt = self.is_nucleotide(str(record.seq))
-                results.append((record.id, is_nt))
-                logger.info(f"{record.id}: {'Nucleotide' if is_nt else 'Protein'}")
+            records = [(record.id, str(record.seq)) for record in SeqIO.parse(fasta_file, "fasta")]
         except Exception as e:
             logger.error(f"Error reading FASTA file: {e}")
             raise
-            
+        
+        is_nt = self.is_nucleotide_batch([seq for _, seq in records])
+        results = [(seq_id, bool(nt)) for (seq_id, _), nt in zip(records, is_nt)]
+        for seq_id, nt in results:
+            logger.info(f"{seq_id}: {'Nucleotide' if nt else 'Protein'}")
         return results
 
 
 class ProdigalConverter:
     """Converts nucleotide sequences to protein sequences using Prodigal."""
     
-    def __init__(self, prodigal_path: Optional[str] = None):
+    def __init__(self, prodigal_path: Optional[str] = None, workers: Optional[int] = None):
         """
         Initialize the converter.
         
         Args:
             prodigal_path: Path to Prodigal executable. If None, will try to find it in PATH.
+            workers: Maximum number of concurrent Prodigal processes (default: 1). In
+                single mode each process trains on its own shard, so sharding is opt-in.
         """
+        self.workers = max(1, workers or 1)
         self.prodigal_path = prodigal_path or self._find_prodigal()
         if not self.prodigal_path:
             raise RuntimeError(
@@ -126,6 +223,89 @@ class ProdigalConverter:
         except subprocess.CalledProcessError:
             return "Unknown version"
     
+    def _prodigal_command(self, mode: str) -> List[str]:
+        # Nucleotides arrive on stdin and translations leave on stdout; the gene
+        # coordinate report Prodigal writes by default is discarded
+        return [self.prodigal_path, '-a', '/dev/stdout', '-o', os.devnull, '-p', mode, '-q']
+    
+    def _run_shard(self, fasta_text: str, mode: str) -> str:
+        """Run one Prodigal process over FASTA text and return its protein FASTA output."""
+        try:
+            result = subprocess.run(self._prodigal_command(mode), input=fasta_text,
+                                    capture_output=True, text=True, check=True)
+        except subprocess.CalledProcessError as e:
+            logger.error(f"Prodigal failed: {e}")
+            logger.error(f"Prodigal stderr: {e.stderr}")
+            raise RuntimeError(f"Prodigal conversion failed: {e.stderr}")
+        return result.stdout
+    
+    @staticmethod
+    def shard_bounds(lengths: Sequence[int], shards: int,
+                     min_bases: int = MIN_SHARD_BASES) -> List[Tuple[int, int]]:
+        """
+        Split records into contiguous (start, stop) ranges with similar base counts.
+        
+        Each shard gets at least min_bases bases, so small inputs stay in one shard.
+        """
+        if len(lengths) == 0:
+            return []
+        cumulative = np.cumsum(lengths, dtype=np.int64)
+        shards = max(1, min(shards, len(lengths), int(cumulative[-1]) // max(1, min_bases)))
+        targets = cumulative[-1] * np.arange(1, shards) / shards
+        cuts = np.searchsorted(cumulative, targets, side='left') + 1
+        bounds = np.unique(np.concatenate(([0], cuts, [len(lengths)])))
+        return [(int(start), int(stop)) for start, stop in zip(bounds[:-1], bounds[1:])]
+    
+    def iter_convert_shards(self, 
+                            sequences: List[str], 
+                            seq_ids: List[str],
+                            mode: str = 'single',
+                            workers: Optional[int] = None) -> Iterator[Tuple[Tuple[int, int], str]]:
+        """
+        Translate records with concurrent Prodigal processes, one per shard.
+        
+        Records are fed to each process through stdin and proteins are read back
+        from its stdout, so nothing touches the disk. In 'single' mode Prodigal
+        trains on each shard on its own, so gene calls can differ slightly from a
+        single process over the whole input; workers=1, the default, reproduces
+        that exactly.
+        
+        Args:
+            sequences: List of nucleotide sequences
+            seq_ids: List of sequence IDs
+            mode: Prodigal mode
+            workers: Number of concurrent Prodigal processes (default: self.workers)
+            
+        Yields:
+            ((start, stop), protein_fasta) per shard in input order, as soon as that
+            shard and every shard before it have finished
+        """
+        if isinstance(sequences, SequenceBatch):
+            lengths = sequences.lengths
+        else:
+            lengths = [len(seq) for seq in sequences]
+        bounds = self.shard_bounds(lengths, workers or self.workers)
+        if len(bounds) > 1:
+            logger.info(f"Running {len(bounds)} Prodigal processes over {len(sequences)} sequences")
+        executor = ThreadPoolExecutor(max_workers=max(1, len(bounds)))
+        futures = []
+        try:
+            futures = [
+                executor.submit(self._run_shard,
+                                ''.join(f">{seq_id}\n{seq}\n" for seq_id, seq in
+                                        zip(seq_ids[start:stop], sequences[start:stop])),
+                                mode)
+                for start, stop in bounds
+            ]
+            for shard, future in zip(bounds, futures):
+                yield shard, future.result()
+        finally:
+            # Shards not yet started are dropped when the consumer stops early
+            # (shutdown's cancel_futures needs Python 3.9)
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=True)
+    
     def convert_nucleotide_to_protein(self, 
                                     input_file: str, 
                                     output_file: str,
@@ -144,27 +324,33 @@ class ProdigalConverter:
         if not os.path.exists(input_file):
             raise FileNotFoundError(f"Input file not found: {input_file}")
         
-        # Prepare Prodigal command
-        # Note: Older versions of Prodigal (like 2.6.3) don't support -f fasta for protein output
-        # The -a option automatically outputs in FASTA format for protein sequences
-        cmd = [
-            self.prodigal_path,
-            '-i', input_file,
-            '-a', output_file,
-            '-p', mode,
-            '-q'  # Quiet mode
-        ]
-        
-        logger.info(f"Running Prodigal: {' '.join(cmd)}")
+        records = [(record.id, str(record.seq)) for record in SeqIO.parse(input_file, "fasta")]
+        logger.info(f"Running Prodigal ({mode} mode) on {input_file}")
+        with open(output_file, 'w') as handle:
+            for _, proteins in self.iter_convert_shards([seq for _, seq in records],
+                                                        [seq_id for seq_id, _ in records], mode):
+                handle.write(proteins)
+        logger.info("Prodigal conversion completed successfully")
+        return output_file
+    
+    def iter_convert_sequences(self, 
+                               sequences: List[str], 
+                               seq_ids: List[str],
+                               mode: str = 'single') -> Iterator[Tuple[Tuple[int, int], List[str], List[str]]]:
+        """
+        Convert nucleotide sequences shard by shard, in input order.
         
-        try:
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            logger.info("Prodigal conversion completed successfully")
-            return output_file
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Prodigal failed: {e}")
-            logger.error(f"Prodigal stderr: {e.stderr}")
-            raise RuntimeError(f"Prodigal conversion failed: {e.stderr}")
+        Yields:
+            ((start, stop), protein_sequences, protein_seq_ids) where start:stop are the
+            input records the proteins were translated from
+        """
+        for shard, proteins in self.iter_convert_shards(sequences, seq_ids, mode):
+            protein_sequences = []
+            protein_seq_ids = []
+            for record in SeqIO.parse(io.StringIO(proteins), "fasta"):
+                protein_sequences.append(str(record.seq))
+                protein_seq_ids.append(record.id)
+            yield shard, protein_sequences, protein_seq_ids
     
     def convert_sequences_in_memory(self, 
                                   sequences: List[str], 
@@ -181,48 +367,229 @@ class ProdigalConverter:
         Returns:
             Tuple of (protein_sequences, protein_seq_ids)
         """
-        # Create temporary input file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.fasta', delete=False) as temp_in:
-            for seq_id, seq in zip(seq_ids, sequences):
-                temp_in.write(f">{seq_id}\n{seq}\n")
-            temp_in_path = temp_in.name
+        protein_sequences = []
+        protein_seq_ids = []
+        for _, shard_sequences, shard_seq_ids in self.iter_convert_sequences(sequences, seq_ids, mode):
+            protein_sequences.extend(shard_sequences)
+            protein_seq_ids.extend(shard_seq_ids)
+        return protein_sequences, protein_seq_ids
+
+
+class OrfTranslator:
+    """
+    Translates nucleotide sequences in process with a vectorized six-frame ORF finder.
+    
+    A drop-in replacement for ProdigalConverter that needs no external program. Bases
+    are integer-encoded once; codons of both strands are looked up in one pass, each
+    of the six frames is cut into open reading frames at its stop codons, and ORFs
+    shorter than min_length codons are dropped. Overlapping candidates are resolved
+    longest first, allowing up to max_overlap shared bases as Prodigal does.
+    
+    Within an ORF the first ATG is used as the start, else the first GTG or TTG
+    (table 11). The stretch before a strand's first stop runs off its 5' end and is
+    kept as a partial gene, as are ORFs that run off its 3' end. Proteins are written
+    like Prodigal's: the start codon reads as M and complete genes end with '*'.
+    """
+    
+    def __init__(self, min_length: int = 30, max_overlap: int = 60):
+        """
+        Initialize the translator.
+        
+        Args:
+            min_length: Shortest ORF kept, in codons (Prodigal's minimum gene is 90 bp)
+            max_overlap: Most bases a kept ORF may share with a longer one (Prodigal: 60)
+        """
+        self.min_length = min_length
+        self.max_overlap = max_overlap
+    
+    @staticmethod
+    def _codons(bases: np.ndarray) -> np.ndarray:
+        """Codon index at every position of integer-encoded strands (last axis)."""
+        first, second, third = bases[..., :-2], bases[..., 1:-1], bases[..., 2:]
+        codons = first.astype(np.int16) * 16 + second * 4 + third
+        known = (first < 4) & (second < 4) & (third < 4)
+        return np.where(known, codons, _UNKNOWN_CODON)
+    
+    def _frame_orfs(self, codons: np.ndarray) -> List[Tuple[int, int, bool, bool]]:
+        """(first codon, end codon, has start, has stop) of every long enough ORF in one frame."""
+        stops = np.flatnonzero(_STOP_CODONS[codons])
+        # Segment k runs from just after stop k-1 up to stop k; the last one to the frame end
+        segment_starts = np.concatenate(([0], stops + 1))
+        segment_ends = np.concatenate((stops, [len(codons)]))
         
-        # Create temporary output file
-        temp_out_path = temp_in_path.replace('.fasta', '_proteins.fasta')
+        ranks = _START_RANK[codons]
+        starts = np.flatnonzero(ranks)
+        # Preferred start of each segment: ATG before GTG/TTG, then the most upstream
+        order = np.lexsort((starts, ranks[starts], np.searchsorted(stops, starts)))
+        segments, first = np.unique(np.searchsorted(stops, starts[order]), return_index=True)
+        begins = np.full(len(segment_starts), -1, dtype=np.int64)
+        begins[segments] = starts[order][first]
+        # The first segment runs off the 5' edge of the strand: a partial gene from the edge
+        begins[0] = 0
+        has_start = begins >= 0
+        has_start[0] = False
         
-        try:
-            # Convert using Prodigal
-            self.convert_nucleotide_to_protein(temp_in_path, temp_out_path, mode)
-            
-            # Read converted proteins
-            protein_sequences = []
-            protein_seq_ids = []
-            
-            for record in SeqIO.parse(temp_out_path, "fasta"):
-                protein_sequences.append(str(record.seq))
-                protein_seq_ids.append(record.id)
-                
-            return protein_sequences, protein_seq_ids
+        keep = (begins >= 0) & (segment_ends - begins >= self.min_length)
+        closed = np.arange(len(segment_starts)) < len(stops)
+        return [(int(begins[k]), int(segment_ends[k]), bool(has_start[k]), bool(closed[k]))
+                for k in np.flatnonzero(keep)]
+    
+    def find_orfs(self, sequence) -> List[Tuple[int, int, int, str, str]]:
+        """
+        Gene calls of one nucleotide sequence.
+        
+        Args:
+            sequence: Nucleotide string, or its uint8 bytes (e.g. SequenceBatch.row)
             
-        finally:
-            # Clean up temporary files
-            for temp_file in [temp_in_path, temp_out_path]:
-                if os.path.exists(temp_file):
-                    os.unlink(temp_file)
+        Returns:
+            List of (left, right, strand, protein, partial) in genome order, with 1-based
+            inclusive coordinates and Prodigal's partial flags ('00' = complete)
+        """
+        if isinstance(sequence, np.ndarray):
+            raw = sequence
+        else:
+            raw = np.frombuffer(sequence.encode('ascii', errors='replace'), dtype=np.uint8)
+        length = len(raw)
+        if length < 3:
+            return []
+        forward = _BASE_CODES[raw]
+        reverse = forward[::-1]
+        # Complement known bases; unknown ones stay 4
+        reverse = np.where(reverse < 4, reverse ^ 2, reverse)
+        codons = self._codons(np.stack((forward, reverse)))
+        
+        candidates = []
+        for row, strand in enumerate((1, -1)):
+            for frame in range(3):
+                frame_codons = codons[row, frame::3]
+                for begin, end, has_start, closed in self._frame_orfs(frame_codons):
+                    protein = _CODON_TABLE[frame_codons[begin:end]].tobytes().decode('ascii')
+                    if has_start:
+                        protein = 'M' + protein[1:]
+                    if closed:
+                        protein += '*'
+                    first = frame + 3 * begin
+                    last = frame + 3 * end + (3 if closed else 0)
+                    # Prodigal flags partial genes by genome side: left edge first
+                    open_5, open_3 = str(int(not has_start)), str(int(not closed))
+                    if strand == 1:
+                        candidates.append((first + 1, last, strand, protein, open_5 + open_3))
+                    else:
+                        candidates.append((length - last + 1, length - first, strand, protein,
+                                           open_3 + open_5))
+        
+        # Longest first, an ORF is kept unless it shares max_overlap bases with a kept
+        # one. Kept ORFs are indexed by left end; one overlapping [left, right] that much
+        # starts at most the longest kept length before left + max_overlap
+        kept, lefts, rights = [], [], []
+        longest = 0
+        for orf in sorted(candidates, key=lambda orf: orf[1] - orf[0], reverse=True):
+            left, right = orf[0], orf[1]
+            lo = bisect.bisect_left(lefts, left + self.max_overlap - longest)
+            hi = bisect.bisect_right(lefts, right - self.max_overlap)
+            if all(min(right, rights[i]) - max(left, lefts[i]) < self.max_overlap
+                   for i in range(lo, hi)):
+                position = bisect.bisect_right(lefts, left)
+                lefts.insert(position, left)
+                rights.insert(position, right)
+                kept.append(orf)
+                longest = max(longest, right - left)
+        return sorted(kept)
+    
+    def iter_convert_sequences(self, 
+                               sequences: List[str], 
+                               seq_ids: List[str],
+                               mode: str = 'single') -> Iterator[Tuple[Tuple[int, int], List[str], List[str]]]:
+        """
+        Translate sequences in one shard; same interface as ProdigalConverter.
+        
+        Proteins are named like Prodigal's, <sequence id>_<n> in genome order.
+        mode is accepted for compatibility; every sequence is searched on its own.
+        """
+        genomes = sequences
+        if isinstance(sequences, SequenceBatch):
+            # Scan the encoded bases in place instead of re-encoding each genome
+            genomes = map(sequences.row, range(len(sequences)))
+        protein_sequences = []
+        protein_seq_ids = []
+        for seq_id, sequence in zip(seq_ids, genomes):
+            for number, (_, _, _, protein, _) in enumerate(self.find_orfs(sequence), start=1):
+                protein_sequences.append(protein)
+                protein_seq_ids.append(f"{seq_id}_{number}")
+        yield (0, len(sequences)), protein_sequences, protein_seq_ids
+    
+    def convert_sequences_in_memory(self, 
+                                  sequences: List[str], 
+                                  seq_ids: List[str],
+                                  mode: str = 'single') -> Tuple[List[str], List[str]]:
+        """
+        Convert nucleotide sequences to protein sequences in memory.
+        
+        Returns:
+            Tuple of (protein_sequences, protein_seq_ids)
+        """
+        _, protein_sequences, protein_seq_ids = next(
+            self.iter_convert_sequences(sequences, seq_ids, mode))
+        return protein_sequences, protein_seq_ids
+    
+    def convert_nucleotide_to_protein(self, 
+                                    input_file: str, 
+                                    output_file: str,
+                                    mode: str = 'single') -> str:
+        """
+        Convert a nucleotide FASTA file to a protein FASTA file with Prodigal-style headers.
+        
+        Returns:
+            Path to the output protein file
+        """
+        if not os.path.exists(input_file):
+            raise FileNotFoundError(f"Input file not found: {input_file}")
+        
+        with open(output_file, 'w') as handle:
+            for index, record in enumerate(SeqIO.parse(input_file, "fasta"), start=1):
+                for number, (left, right, strand, protein, partial) in \
+                        enumerate(self.find_orfs(str(record.seq)), start=1):
+                    handle.write(f">{record.id}_{number} # {left} # {right} # {strand} # "
+                                 f"ID={index}_{number};partial={partial}\n")
+                    for offset in range(0, len(protein), 60):
+                        handle.write(protein[offset:offset + 60] + "\n")
+        logger.info(f"ORF translation completed: {output_file}")
+        return output_file
+
+
+def create_converter(converter: str = 'auto', prodigal_path: Optional[str] = None):
+    """
+    Build the nucleotide-to-protein converter named by `converter` (see CONVERTERS).
+    
+    'auto' uses Prodigal when it can be found and the built-in ORF translator otherwise.
+    """
+    if converter not in CONVERTERS:
+        raise ValueError(f"Unknown converter '{converter}'; choose from {', '.join(CONVERTERS)}")
+    if converter == 'orf':
+        return OrfTranslator()
+    try:
+        return ProdigalConverter(prodigal_path)
+    except RuntimeError:
+        if converter == 'prodigal':
+            raise
+        logger.warning("Prodigal not found; translating nucleotide input with the built-in "
+                       "six-frame ORF finder")
+        return OrfTranslator()
 
 
 class SequenceProcessor:
     """Main interface for sequence processing that integrates with DeepCovVar."""
     
-    def __init__(self, prodigal_path: Optional[str] = None):
+    def __init__(self, prodigal_path: Optional[str] = None, converter: str = 'auto'):
         """
         Initialize the sequence processor.
         
         Args:
             prodigal_path: Path to Prodigal executable
+            converter: 'auto', 'prodigal' or 'orf' (see create_converter)
         """
         self.detector = SequenceTypeDetector()
-        self.converter = ProdigalConverter(prodigal_path)
+        self.converter = create_converter(converter, prodigal_path)
     
     def process_sequences(self, 
                          input_file: str, 
@@ -269,22 +636,21 @@ class SequenceProcessor:
     
     def process_sequences_in_memory(self, 
                                   sequences: List[str], 
-                                  seq_ids: List[str]) -> Tuple[List[str], List[str], bool]:
+                                  seq_ids: List[str],
+                                  force_conversion: bool = False) -> Tuple[List[str], List[str], bool]:
         """
         Process sequences in memory: detect type and convert if necessary.
         
         Args:
             sequences: List of sequences
             seq_ids: List of sequence IDs
+            force_conversion: Force conversion even if sequences appear to be protein
             
         Returns:
             Tuple of (processed_sequences, processed_seq_ids, was_converted)
         """
         # Check if any sequences are nucleotide
-        sequence_types = [(seq_id, self.detector.is_nucleotide(seq)) 
-                         for seq_id, seq in zip(seq_ids, sequences)]
-        
-        any_nucleotide = any(is_nt for _, is_nt in sequence_types)
+        any_nucleotide = force_conversion or self.detector.is_nucleotide_batch(sequences).any()
         
         if not any_nucleotide:
             logger.info("All sequences appear to be protein. No conversion needed.")
@@ -301,6 +667,27 @@ class SequenceProcessor:
         except Exception as e:
             logger.error(f"Conversion failed: {e}")
             raise
+    
+    def iter_process_sequences(self, 
+                               sequences: List[str], 
+                               seq_ids: List[str],
+                               force_conversion: bool = False) -> Iterator[Tuple[Tuple[int, int], List[str], List[str], bool]]:
+        """
+        Like process_sequences_in_memory, but hands out converted proteins shard by shard.
+        
+        Yields:
+            ((start, stop), processed_sequences, processed_seq_ids, was_converted) where
+            start:stop are the input records the processed sequences came from
+        """
+        if not force_conversion and not self.detector.is_nucleotide_batch(sequences).any():
+            logger.info("All sequences appear to be protein. No conversion needed.")
+            yield (0, len(sequences)), sequences, seq_ids, False
+            return
+        
+        logger.info("Converting nucleotide sequences to protein...")
+        for shard, protein_sequences, protein_seq_ids in \
+                self.converter.iter_convert_sequences(sequences, seq_ids):
+            yield shard, protein_sequences, protein_seq_ids, True
 
 
 def main():
@@ -315,6 +702,8 @@ def main():
     parser.add_argument('input_file', help='Input FASTA file')
     parser.add_argument('--output', '-o', help='Output file for converted sequences')
     parser.add_argument('--prodigal-path', help='Path to Prodigal executable')
+    parser.add_argument('--converter', choices=CONVERTERS, default='auto',
+                       help='Prodigal, the built-in ORF translator, or auto (Prodigal when installed)')
     parser.add_argument('--check-only', action='store_true', 
                        help='Only check sequence types, do not convert')
     parser.add_argument('--force', action='store_true',
@@ -323,7 +712,7 @@ def main():
     args = parser.parse_args()
     
     try:
-        processor = SequenceProcessor(args.prodigal_path)
+        processor = SequenceProcessor(args.prodigal_path, args.converter)
         
         if args.check_only:
             # Just check sequence types
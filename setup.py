@@ -95,6 +95,11 @@ EXTRAS_REQUIRE = {
     'viz': [
         'plotly>=5.16.1',
         'dash>=2.13.0'
+    ],
+    'onnx': [
+        'onnxruntime>=1.16.0',
+        'onnx>=1.14.0',
+        'tf2onnx>=1.15.0'
     ]
 }
 
@@ -145,6 +150,8 @@ setuptools.setup(
             "models/*.h5",
             "models/*.json",
             "models/*.txt",
+            "models/esm2_phase5/*",  # written by `deepcovvar export-model`
+            "models/onnx/*",  # written by `deepcovvar export-onnx`
         ],
     },
     